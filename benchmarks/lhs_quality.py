@@ -0,0 +1,74 @@
+"""
+Latin hypercube design quality
+Compares the minimum pairwise distance of designs from `sample_latin_hypercube`
+against maximin optimized designs, along with the time taken to build them.
+
+To Run:
+python lhs_quality.py --n_samples 10 50 100 --n_dims 2 5 10 --budgets 0.1 1.0
+"""
+import time
+import argparse
+
+import numpy as np
+
+from hyperspace.samplers.latin_hypercube_sampler import sample_latin_hypercube
+from hyperspace.samplers.latin_hypercube_sampler import maximin_unit_samples
+
+
+def min_distance(samples):
+    """Smallest pairwise distance of a design in the unit cube."""
+    diff = samples[:, None, :] - samples[None, :, :]
+    dist = np.sqrt((diff**2).sum(axis=2))
+    np.fill_diagonal(dist, np.inf)
+    return dist.min()
+
+
+def time_design(sampler, repeats):
+    """Mean construction time and minimum distance over `repeats` seeds."""
+    times, distances = [], []
+    for seed in range(repeats):
+        start = time.perf_counter()
+        samples = sampler(seed)
+        times.append(time.perf_counter() - start)
+        distances.append(min_distance(samples))
+    return np.mean(times), np.mean(distances)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark latin hypercube designs.')
+    parser.add_argument('--n_samples', type=int, nargs='+',
+                        default=[10, 50, 100])
+    parser.add_argument('--n_dims', type=int, nargs='+', default=[2, 5, 10])
+    parser.add_argument('--budgets', type=float, nargs='+', default=[0.1, 1.0])
+    parser.add_argument('--max_iter', type=int, default=10000)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    row = '{:9d} {:5d} {:>12} {:12.6f} {:12.6f}'
+    print('{:>9} {:>5} {:>12} {:>12} {:>12}'.format(
+        'samples', 'dims', 'design', 'seconds', 'min dist'))
+    for n_samples in args.n_samples:
+        for n_dims in args.n_dims:
+            low, high = np.zeros(n_dims), np.ones(n_dims)
+
+            def lhs(seed):
+                return sample_latin_hypercube(low, high, n_samples, rng=seed)
+
+            seconds, distance = time_design(lhs, args.repeats)
+            print(row.format(n_samples, n_dims, 'lhs', seconds, distance))
+
+            for budget in args.budgets:
+                def maximin(seed):
+                    return maximin_unit_samples(n_samples, n_dims, rng=seed,
+                                                max_iter=args.max_iter,
+                                                time_budget=budget)
+
+                seconds, distance = time_design(maximin, args.repeats)
+                design = 'maximin {}s'.format(budget)
+                print(row.format(n_samples, n_dims, design, seconds,
+                                 distance))
+
+
+if __name__ == '__main__':
+    main()
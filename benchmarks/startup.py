@@ -0,0 +1,72 @@
+"""
+Hyperdrive startup cost
+Compares building every hyperspace with `create_hyperspace` against building
+a single rank's hyperspace with `create_subspace`.
+
+To Run:
+python startup.py --max_dims 16 --ranks 1 64 1024
+
+* Note: eager construction is exponential in the number of dimensions, so it is
+only timed up to `--max_eager_dims`.
+"""
+import time
+import argparse
+
+from hyperspace.space.mapping_space import create_hyperspace
+from hyperspace.space.mapping_space import create_subspace
+
+
+def make_hyperparameters(n_dims):
+    """Mix of integer and real hyperparameters."""
+    hparams = []
+    for dim in range(n_dims):
+        if dim % 2:
+            hparams.append((10.0**-3, 10.0**0))
+        else:
+            hparams.append((2, 100))
+    return hparams
+
+
+def time_eager(hyperparameters, rank):
+    """Every rank builds all hyperspaces and keeps its own."""
+    start = time.perf_counter()
+    hyperspace = create_hyperspace(hyperparameters)
+    hyperspace[rank]
+    return time.perf_counter() - start
+
+
+def time_lazy(hyperparameters, ranks):
+    """Every rank builds only its own hyperspace."""
+    start = time.perf_counter()
+    for rank in ranks:
+        create_subspace(hyperparameters, rank)
+    return (time.perf_counter() - start) / len(ranks)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark hyperdrive startup.')
+    parser.add_argument('--min_dims', type=int, default=2)
+    parser.add_argument('--max_dims', type=int, default=16)
+    parser.add_argument('--max_eager_dims', type=int, default=12)
+    parser.add_argument('--ranks', type=int, nargs='+', default=[1, 64, 1024])
+    args = parser.parse_args()
+
+    print('{:>5} {:>7} {:>16} {:>16}'.format('dims', 'ranks', 'eager s/rank',
+                                             'lazy s/rank'))
+    for n_dims in range(args.min_dims, args.max_dims + 1):
+        hparams = make_hyperparameters(n_dims)
+        for n_ranks in args.ranks:
+            n_ranks = min(n_ranks, 2**n_dims)
+            ranks = range(n_ranks)
+            lazy = time_lazy(hparams, ranks)
+            if n_dims <= args.max_eager_dims:
+                eager = '{:16.6f}'.format(time_eager(hparams, n_ranks - 1))
+            else:
+                eager = '{:>16}'.format('skipped')
+            print('{:5d} {:7d} {} {:16.6f}'.format(n_dims, n_ranks, eager,
+                                                   lazy))
+
+
+if __name__ == '__main__':
+    main()
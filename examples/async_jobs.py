@@ -0,0 +1,55 @@
+"""
+Asynchronous objective
+Overlaps many I/O-bound evaluations with surrogate fitting using HyperDriver.
+
+Each evaluation stands in for a job submitted to a batch scheduler: it sleeps
+while the "job" runs, then returns its metric. Up to `--n_concurrent` jobs are
+in flight at once.
+
+To Run:
+python async_jobs.py --n_concurrent 8
+"""
+import asyncio
+import argparse
+
+import numpy as np
+
+from hyperspace.drivers.hyperdriver import HyperDriver
+
+
+async def objective(params):
+    """
+    Submit a job and wait for its result.
+
+    Parameters
+    ----------
+    * params [list, len(params)=n_hyperparameters]
+        Settings of each hyperparameter for a given optimization iteration.
+    """
+    x, y = params
+    # Stand-in for the scheduler's queue and run time.
+    await asyncio.sleep(np.random.uniform(0.1, 0.5))
+    return (x - 0.3)**2 + (y - 2)**2
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Setup experiment.')
+    parser.add_argument('--n_calls', type=int, default=40,
+                        help='Number of jobs to run.')
+    parser.add_argument('--n_concurrent', type=int, default=8,
+                        help='Number of jobs in flight at once.')
+    args = parser.parse_args()
+
+    hparams = [(-1.0, 1.0),  # x
+               (0, 5)]       # y
+
+    driver = HyperDriver(hparams, model="GP", random_state=0)
+    result = asyncio.run(
+        driver.run(objective, n_calls=args.n_calls,
+                   n_concurrent=args.n_concurrent)
+    )
+    print(f'Best value {result.fun} at {result.x}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Gradient Boosting Regressor with Hyperband
+The number of boosting stages is the resource: most configurations are only
+trained with a few stages before being stopped.
+
+To Run:
+mpirun -n 4 python hyperband_gbm.py --results_dir results/hyperband
+
+* Note: we use 4 processes in this example (hence -n 4 above) since we have
+2**2 combinations of hyperparameter subspaces.
+"""
+import argparse
+import numpy as np
+
+from sklearn.datasets import load_boston
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.model_selection import cross_val_score
+
+from hyperspace.drivers.hyperband import hyperband
+
+
+boston = load_boston()
+X, y = boston.data, boston.target
+
+
+def objective(params, resource):
+    """
+    Objective function to be minimized.
+
+    Parameters
+    ----------
+    * params [list, len(params)=n_hyperparameters]
+        Settings of each hyperparameter for a given optimization iteration.
+
+    * resource [int]
+        Number of boosting stages to train with.
+    """
+    max_depth, learning_rate = params
+
+    reg = GradientBoostingRegressor(n_estimators=resource,
+                                    max_depth=max_depth,
+                                    learning_rate=learning_rate,
+                                    random_state=0)
+
+    return -np.mean(cross_val_score(reg, X, y, cv=5, n_jobs=-1,
+                    scoring="neg_mean_absolute_error"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Setup experiment.')
+    parser.add_argument('--results_dir', type=str, default='./results',
+                        help='Path to results directory.')
+    args = parser.parse_args()
+
+    hparams = [(2, 10),              # max_depth
+               (10.0**-2, 10.0**0)]  # learning_rate
+
+    hyperband(objective=objective,
+              hyperparameters=hparams,
+              results_path=args.results_dir,
+              max_resource=81,
+              eta=3,
+              verbose=True,
+              random_state=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,190 @@
 import os
 import json
+import time
+import queue
+import atexit
+import pickle
 import numbers
+import threading
 
 from skopt.utils import dump
+from scipy.optimize import OptimizeResult
+
+from hyperspace.utils.utils import _LOG_SUFFIX
+from hyperspace.utils.utils import JSON_LINES_SUFFIX
+from hyperspace.utils.utils import create_result
+from hyperspace.utils.utils import _kept_models
+
+
+def _snapshot(res):
+    """
+    Copy the parts of a result that the optimizer keeps appending to.
+
+    Parameters
+    ----------
+    * `res` [`OptimizeResult`, scipy object]:
+        The optimization as a OptimizeResult object.
+    """
+    snapshot = OptimizeResult(res)
+    for field in ('x_iters', 'func_vals', 'models'):
+        if isinstance(res.get(field), list):
+            snapshot[field] = list(res[field])
+
+    return snapshot
+
+
+def _atomic_write(savefile, write, snapshot):
+    """
+    Write to a temporary file next to `savefile`, then rename it over
+    `savefile`.
+
+    A crash mid-write leaves the previous checkpoint intact.
+
+    Parameters
+    ----------
+    * `savefile` [str]:
+        Path of the checkpoint.
+
+    * `write` [callable]:
+        Called as `write(snapshot, path)`.
+
+    * `snapshot` [`OptimizeResult`, scipy object]:
+        Result to write.
+    """
+    tmpfile = savefile + '.tmp'
+    write(snapshot, tmpfile)
+    os.replace(tmpfile, savefile)
+
+
+class _CheckpointWriter(object):
+    """
+    Throttle checkpoints, and optionally write them from a background thread.
+
+    Snapshots are taken in the optimization loop and put on a queue.
+    The writer thread only writes the newest snapshot on the queue.
+
+    Parameters
+    ----------
+    * `savefile` [str]:
+        Path of the checkpoint.
+
+    * `write` [callable]:
+        Called as `write(snapshot, path)`.
+
+    * `background` [bool, default=False]:
+        Whether to write from a background thread.
+
+    * `every` [int or None, default=1]:
+        Write every `every` iterations.
+
+    * `interval` [float or None, default=None]:
+        Write once `interval` seconds have passed since the last write.
+    """
+    def __init__(self, savefile, write, background=False, every=1,
+                 interval=None):
+        self.savefile = savefile
+        self.write = write
+        self.every = every
+        self.interval = interval
+        self._n_calls = 0
+        self._last_write = time.monotonic()
+        self._unsaved = None
+        self._error = None
+        self._closed = False
+        self._queue = queue.Queue()
+        self._thread = None
+        if background:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        # Flush the last snapshot, even if the optimization crashes.
+        atexit.register(self.close)
+
+    def submit(self, res):
+        """
+        Write a snapshot of `res` if a write is due.
+
+        Parameters
+        ----------
+        * `res` [`OptimizeResult`, scipy object]:
+            The optimization as a OptimizeResult object.
+        """
+        self._raise_error()
+        self._n_calls += 1
+
+        due = bool(self.every) and self._n_calls % self.every == 0
+        if self.interval is not None:
+            due = due or time.monotonic() - self._last_write >= self.interval
+
+        if not due:
+            self._unsaved = res
+            return
+
+        self._unsaved = None
+        self._last_write = time.monotonic()
+        self._put(_snapshot(res))
+
+    def close(self):
+        """
+        Write any throttled snapshot and wait for the writer thread.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        # Do not keep closed writers, and their snapshots, alive until exit.
+        atexit.unregister(self.close)
+
+        if self._unsaved is not None:
+            self._put(_snapshot(self._unsaved))
+            self._unsaved = None
+
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+
+        self._raise_error()
+
+    def _put(self, snapshot):
+        if self._thread is None:
+            _atomic_write(self.savefile, self.write, snapshot)
+        else:
+            self._queue.put(snapshot)
+
+    def _run(self):
+        stop = False
+        while not stop:
+            snapshot = self._queue.get()
+            # Older snapshots are superseded by newer ones.
+            while snapshot is not None:
+                try:
+                    newer = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if newer is None:
+                    stop = True
+                    break
+                snapshot = newer
+
+            if snapshot is None:
+                break
+
+            try:
+                _atomic_write(self.savefile, self.write, snapshot)
+            except Exception as error:
+                self._error = error
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
 
 
 class CheckpointSaver(object):
     """
     Save current state after each iteration with `skopt.dump`.
 
+    Checkpoints are written to a temporary file and renamed over the previous
+    one. Call `close` once the optimization is done to flush the last one.
+
     Example usage:
         import skopt
         checkpoint_callback = skopt.callbacks.CheckpointSaver("./result.pkl")
@@ -19,14 +195,34 @@ class CheckpointSaver(object):
     * `checkpoint_path`:
         location where checkpoint will be saved to;
 
+    * `background` [bool, default=False]:
+        whether to write checkpoints from a background thread;
+
+    * `every` [int or None, default=1]:
+        save every `every` iterations;
+
+    * `interval` [float or None, default=None]:
+        save once `interval` seconds have passed since the last save;
+
+    * `keep_models` [str or int, default="all"]:
+        surrogate models saved with each checkpoint: "all", "none",
+        or the last N;
+
     * `dump_options`:
         options to pass on to `skopt.dump`, like `compress=9`
     """
-    def __init__(self, checkpoint_path, filename, **dump_options):
+    def __init__(self, checkpoint_path, filename, background=False, every=1,
+                 interval=None, keep_models="all", **dump_options):
+        # Fail early on an invalid policy.
+        _kept_models([], keep_models)
         self.checkpoint_path = checkpoint_path
         self.filename = filename
         self.savefile = os.path.join(self.checkpoint_path, self.filename)
+        self.keep_models = keep_models
         self.dump_options = dump_options
+        self._writer = _CheckpointWriter(self.savefile, self._write,
+                                         background=background, every=every,
+                                         interval=interval)
 
     def __call__(self, res):
         """
@@ -35,13 +231,117 @@ class CheckpointSaver(object):
         * `res` [`OptimizeResult`, scipy object]:
             The optimization as a OptimizeResult object.
         """
-        dump(res, self.savefile, **self.dump_options)
+        self._writer.submit(res)
+
+    def close(self):
+        """
+        Flush the last checkpoint.
+        """
+        self._writer.close()
+
+    def _write(self, res, path):
+        if res.get('models') is not None:
+            res['models'] = _kept_models(res['models'], self.keep_models)
+        dump(res, path, **self.dump_options)
+
+
+class LogCheckpointSaver(object):
+    """
+    Append each new evaluation to a log, compacting it every so often.
+
+    Only the new (x, y) records are written after each iteration, so the
+    cost of a checkpoint does not grow with the number of iterations.
+    Every `compact_every` records the evaluations are written to a snapshot
+    with `skopt.dump` and the log is truncated. `_load_checkpoint` replays
+    the log on top of the snapshot.
+
+    Example usage:
+        checkpoint_callback = LogCheckpointSaver("./checkpoints",
+                                                 "hyperspace00")
+        skopt.gp_minimize(obj_fun, dims, callback=[checkpoint_callback])
+
+    Parameters
+    ----------
+    * `checkpoint_path`:
+        location where checkpoint will be saved to;
+
+    * `filename`:
+        name of the snapshot. The log is saved next to it with a ".log" suffix.
+
+    * `compact_every` [int, default=100]:
+        number of logged records between compactions.
+    """
+    def __init__(self, checkpoint_path, filename, compact_every=100):
+        self.checkpoint_path = checkpoint_path
+        self.filename = filename
+        self.savefile = os.path.join(self.checkpoint_path, self.filename)
+        self.logfile = self.savefile + _LOG_SUFFIX
+        self.compact_every = compact_every
+        self.n_logged = 0
+        self._n_since_compaction = 0
+
+    def __call__(self, res):
+        """
+        Parameters
+        ----------
+        * `res` [`OptimizeResult`, scipy object]:
+            The optimization as a OptimizeResult object.
+        """
+        n_evaluations = len(res.x_iters)
+        if self.n_logged == 0:
+            # Start afresh: a log left by a previous run would be replayed
+            # on top of this run's snapshot. Initial or resumed points go
+            # straight to the snapshot.
+            self.n_logged = n_evaluations
+            self.compact(res)
+            return
+
+        with open(self.logfile, 'ab') as log:
+            for index in range(self.n_logged, n_evaluations):
+                record = (index, list(res.x_iters[index]),
+                          float(res.func_vals[index]))
+                pickle.dump(record, log)
+
+        self._n_since_compaction += n_evaluations - self.n_logged
+        self.n_logged = n_evaluations
+
+        if self._n_since_compaction >= self.compact_every:
+            self.compact(res)
+
+    def close(self):
+        """
+        Nothing to flush: records are appended as they arrive.
+        """
+
+    def compact(self, res):
+        """
+        Write every evaluation to the snapshot and truncate the log.
+
+        Parameters
+        ----------
+        * `res` [`OptimizeResult`, scipy object]:
+            The optimization as a OptimizeResult object.
+        """
+        snapshot = create_result(res.x_iters, res.func_vals, space=res.space)
+        tmpfile = self.savefile + '.tmp'
+        dump(snapshot, tmpfile)
+        os.replace(tmpfile, self.savefile)
+        # Records are indexed, so a crash before truncating only leaves
+        # records that are skipped on replay.
+        open(self.logfile, 'wb').close()
+        self._n_since_compaction = 0
 
 
 class JsonCheckpointSaver(object):
     """
     Save current state after each iteration with JSON format.
 
+    Checkpoints are written to a temporary file and renamed over the previous
+    one. Call `close` once the optimization is done to flush the last one.
+
+    In JSON lines mode, one `{"x": ..., "y": ...}` record is appended per new
+    evaluation instead, so the cost of a checkpoint stays constant.
+
     Example usage:
         import skopt
         checkpoint_callback = skopt.callbacks.CheckpointSaver("./result.pkl")
@@ -54,11 +354,36 @@ class JsonCheckpointSaver(object):
 
     * `filename` : str
         Name of the file to save.
+        - In JSON lines mode ".jsonl" is appended, unless already present.
+
+    * `lines` : bool, default=False
+        Whether to append JSON lines records. `background`, `every` and
+        `interval` do not apply, since appends are cheap.
+
+    * `background` : bool, default=False
+        Whether to write checkpoints from a background thread.
+
+    * `every` : int or None, default=1
+        Save every `every` iterations.
+
+    * `interval` : float or None, default=None
+        Save once `interval` seconds have passed since the last save.
     """
-    def __init__(self, checkpoint_path, filename):
+    def __init__(self, checkpoint_path, filename, background=False, every=1,
+                 interval=None, lines=False):
+        if lines and not filename.endswith(JSON_LINES_SUFFIX):
+            filename += JSON_LINES_SUFFIX
         self.checkpoint_path = checkpoint_path
         self.filename = filename
         self.savefile = os.path.join(self.checkpoint_path, self.filename)
+        self.lines = lines
+        self.n_logged = 0
+        if lines:
+            self._writer = None
+        else:
+            self._writer = _CheckpointWriter(self.savefile, self._write,
+                                             background=background,
+                                             every=every, interval=interval)
 
     def _convert_fields(self, result_field):
         """
@@ -90,11 +415,42 @@ class JsonCheckpointSaver(object):
         * `res` [`OptimizeResult`, scipy object]:
             The optimization as a OptimizeResult object.
         """
+        if self.lines:
+            self._append(res)
+        else:
+            self._writer.submit(res)
+
+    def close(self):
+        """
+        Flush the last checkpoint.
+        """
+        if self._writer is not None:
+            self._writer.close()
+
+    def _append(self, res):
+        """
+        Append a record for each evaluation since the last call.
+        """
+        # The first call starts the file afresh, including initial or resumed
+        # points.
+        mode = 'a' if self.n_logged else 'w'
+        n_evaluations = len(res.x_iters)
+        with open(self.savefile, mode) as outfile:
+            for index in range(self.n_logged, n_evaluations):
+                record = {
+                    'x': self._convert_fields(res.x_iters[index]),
+                    'y': float(res.func_vals[index])
+                }
+                outfile.write(json.dumps(record) + '\n')
+
+        self.n_logged = n_evaluations
+
+    def _write(self, res, path):
         data = {}
         data['fun'] = float(res.fun)
         data['x'] = self._convert_fields(res.x)
         data['func_vals'] = self._convert_fields(res.func_vals.tolist())
         data['x_iters'] = [self._convert_fields(x) for x in res.x_iters]
 
-        with open(self.savefile, 'w') as outfile:
+        with open(path, 'w') as outfile:
             json.dump(data, outfile)
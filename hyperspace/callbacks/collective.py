@@ -0,0 +1,254 @@
+import os
+import warnings
+
+import numpy as np
+from mpi4py import MPI
+
+from hyperspace.utils.utils import create_result
+from hyperspace.utils.utils import _encode_points
+from hyperspace.utils.utils import _decode_points
+from hyperspace.utils.utils import _COLLECTIVE_SUFFIX
+
+
+# Capacity and number of dimensions, stored as float64 at the start of the
+# file.
+_HEADER_SIZE = 2
+_ITEMSIZE = np.dtype(np.float64).itemsize
+
+
+def _slot_offset(rank, capacity, n_dims):
+    """
+    Byte offset of a rank's slot.
+
+    Each slot holds a row count followed by `capacity` rows of [x..., y].
+    """
+    slot_size = 1 + capacity * (n_dims + 1)
+    return _ITEMSIZE * (_HEADER_SIZE + rank * slot_size)
+
+
+class MPICheckpointSaver(object):
+    """
+    Save every rank's evaluations to a single shared file with MPI collective
+    I/O.
+
+    Each rank owns a fixed size slot in the file. Every `every` iterations
+    only the new rows and then the row count are written, with
+    `Write_at_all`. Rows are float64, with categorical values stored as their
+    index in `space`.
+
+    The file is written next to the checkpoint and renamed over it once the
+    first write is done, so a previous checkpoint stays intact until then.
+
+    Every rank must call the saver the same number of times for the collective
+    writes to match up, up to `n_calls` times. Later calls write independently.
+    `close` is collective, writes what is left and has to be called by every
+    rank.
+
+    Example usage:
+        checkpoint_callback = MPICheckpointSaver(
+            "./checkpoints", Space(hyperparameters), capacity=60, n_calls=50)
+        ... call `checkpoint_callback(res)` after each iteration ...
+        checkpoint_callback.close()
+
+    Parameters
+    ----------
+    * `checkpoint_path`:
+        location where checkpoint will be saved to;
+
+    * `space` [skopt.space.Space]:
+        undivided search space, used to encode points;
+
+    * `capacity` [int]:
+        number of evaluations each slot can hold. The largest over all ranks
+        is used;
+
+    * `n_calls` [int]:
+        number of calls made to the saver by every rank;
+
+    * `every` [int, default=1]:
+        write every `every` calls;
+
+    * `filename` [str, default="hyperspace.ckpt"]:
+        name of the shared file;
+
+    * `comm` [MPI communicator, default=MPI.COMM_WORLD]
+    """
+    def __init__(self, checkpoint_path, space, capacity, n_calls, every=1,
+                 filename='hyperspace' + _COLLECTIVE_SUFFIX, comm=None):
+        if every < 1:
+            raise ValueError('Checkpoints must be written every >= 1 calls. '
+                             f'Got {every}')
+
+        self.comm = comm if comm is not None else MPI.COMM_WORLD
+        self.checkpoint_path = checkpoint_path
+        self.filename = filename
+        self.savefile = os.path.join(self.checkpoint_path, self.filename)
+        self.space = space
+        self.n_dims = space.n_dims
+        self.capacity = self.comm.allreduce(capacity, op=MPI.MAX)
+        self.n_calls = n_calls
+        self.every = every
+        self.n_saved = 0
+        self._n_calls = 0
+        self._n_rounds = 0
+        # Collective writes, the last one from `close`.
+        self._n_writes = n_calls // every + 1
+        self._unsaved = None
+        self._warned = False
+
+        rank = self.comm.Get_rank()
+        self._offset = _slot_offset(rank, self.capacity, self.n_dims)
+
+        # Set_size fills the new file with zeros, so every count starts at 0.
+        self._tmpfile = self.savefile + '.tmp'
+        if rank == 0 and os.path.exists(self._tmpfile):
+            os.remove(self._tmpfile)
+        self.comm.Barrier()
+        amode = MPI.MODE_WRONLY | MPI.MODE_CREATE
+        self._file = MPI.File.Open(self.comm, self._tmpfile, amode)
+        self._file.Set_size(_slot_offset(self.comm.Get_size(), self.capacity,
+                                         self.n_dims))
+
+        if rank == 0:
+            header = np.array([self.capacity, self.n_dims], dtype=np.float64)
+            self._file.Write_at(0, header)
+
+    def __call__(self, res):
+        """
+        Parameters
+        ----------
+        * `res` [`OptimizeResult`, scipy object]:
+            The optimization as a OptimizeResult object.
+        """
+        self._n_calls += 1
+        self._unsaved = res
+        if self._n_calls % self.every == 0:
+            self._flush()
+
+    def close(self):
+        """
+        Write what is left, take part in the remaining collective writes and
+        close the file.
+        """
+        while self._n_rounds < self._n_writes:
+            self._flush()
+        if self._unsaved is not None:
+            # Called more than `n_calls` times.
+            self._flush()
+        self._file.Close()
+
+    def _flush(self):
+        """
+        Write the evaluations of the last call that were not saved yet.
+        """
+        res, self._unsaved = self._unsaved, None
+        n_evaluations = self.n_saved
+        if res is not None:
+            n_evaluations = min(len(res.x_iters), self.capacity)
+            if len(res.x_iters) > self.capacity and not self._warned:
+                warnings.warn(f'Checkpoint slots hold {self.capacity} '
+                              'evaluations, later evaluations are not saved.')
+                self._warned = True
+
+        rows = np.empty((n_evaluations - self.n_saved, self.n_dims + 1))
+        if len(rows):
+            new = slice(self.n_saved, n_evaluations)
+            rows[:, :-1] = _encode_points(res.x_iters[new], self.space)
+            rows[:, -1] = res.func_vals[new]
+
+        self._write(rows, n_evaluations)
+
+    def _write(self, rows, n_evaluations):
+        """
+        Write rows after the ones already saved, then update the row count.
+        """
+        row_offset = self._offset + _ITEMSIZE * (
+            1 + self.n_saved * (self.n_dims + 1))
+        count = np.array([n_evaluations], dtype=np.float64)
+        rows = np.ascontiguousarray(rows)
+
+        # Rows go first, so a crash never counts rows that were not written.
+        if self._n_rounds < self._n_writes:
+            self._file.Write_at_all(row_offset, rows)
+            self._file.Write_at_all(self._offset, count)
+        else:
+            self._file.Write_at(row_offset, rows)
+            self._file.Write_at(self._offset, count)
+
+        if self._n_rounds == 0:
+            self._publish()
+
+        self._n_rounds += 1
+        self.n_saved = n_evaluations
+
+    def _publish(self):
+        """
+        Rename the file over the previous checkpoint, once every rank wrote.
+        """
+        self._file.Sync()
+        if self.comm.Get_rank() == 0:
+            os.replace(self._tmpfile, self.savefile)
+        # The file is renamed before anyone reads the checkpoint.
+        self.comm.Barrier()
+
+
+def load_mpi_checkpoint(checkpoint_path, space,
+                        filename='hyperspace' + _COLLECTIVE_SUFFIX, comm=None):
+    """
+    Read this rank's slot from a checkpoint written by `MPICheckpointSaver`.
+
+    Collective: every rank has to call it.
+
+    Parameters
+    ----------
+    * `checkpoint_path` [str]
+        Path to the previously saved checkpoint.
+
+    * `space` [skopt.space.Space]
+        Undivided search space the checkpoint was encoded with.
+
+    * `filename` [str, default="hyperspace.ckpt"]
+        Name of the shared file.
+
+    * `comm` [MPI communicator, default=MPI.COMM_WORLD]
+
+    Returns
+    -------
+    * `checkpoint` [`OptimizeResult`, scipy object, or None]
+        None if the file or this rank's slot is missing or empty.
+    """
+    comm = comm if comm is not None else MPI.COMM_WORLD
+    savefile = os.path.join(checkpoint_path, filename)
+    if not os.path.exists(savefile):
+        return None
+
+    rank = comm.Get_rank()
+    fh = MPI.File.Open(comm, savefile, MPI.MODE_RDONLY)
+    try:
+        header = np.empty(_HEADER_SIZE)
+        fh.Read_at_all(0, header)
+        capacity, n_dims = int(header[0]), int(header[1])
+        if n_dims != space.n_dims:
+            raise ValueError(f'Checkpoint has {n_dims} dimensions, the search '
+                             f'space has {space.n_dims}.')
+
+        offset = _slot_offset(rank, capacity, n_dims)
+        count = np.zeros(1)
+        if offset < fh.Get_size():
+            fh.Read_at_all(offset, count)
+        else:
+            # The previous run had fewer ranks. Still take part in the
+            # collective read.
+            fh.Read_at_all(0, np.empty(0))
+        n_evaluations = int(count[0])
+
+        rows = np.empty((n_evaluations, n_dims + 1))
+        fh.Read_at_all(offset + _ITEMSIZE, rows)
+    finally:
+        fh.Close()
+
+    if n_evaluations == 0:
+        return None
+
+    x_iters = _decode_points(rows[:, :-1], space)
+    return create_result(x_iters, rows[:, -1])
@@ -0,0 +1,209 @@
+import numpy as np
+from mpi4py import MPI
+
+
+# Message tags
+_PEERS = 1
+_HISTORY = 2
+
+
+class SuccessiveHalving(object):
+    """
+    Stop the worst hyperspaces every `every` iterations, and move their ranks
+    to the best.
+
+    At each round, ranks compare the incumbents of the hyperspaces they are
+    optimizing. The worst `fraction` of hyperspaces is stopped: the callback
+    returns True on their ranks, and sets `reassigned` to the index of one of
+    the surviving hyperspaces along with every observation made in it. Those
+    ranks should go on optimizing that hyperspace for their `remaining`
+    iterations.
+    Ranks working on the same hyperspace tell each other their observations,
+    which are kept in `received` until the rank is reassigned.
+
+    Only incumbents are gathered by every rank. Observations are sent point
+    to point, to the other ranks on the same hyperspace, and from the lowest
+    rank on a surviving hyperspace to the ranks reassigned to it.
+
+    Every rank must take part in the same number of rounds, so `finish`
+    has to be called once the optimization stops, even when it stops early.
+
+    Example usage:
+        halving = SuccessiveHalving(driver.optimizer, rank, 50, every=10)
+        result = driver.minimize(objective, 50, [halving])
+        while halving.reassigned is not None:
+            index, x0, y0 = halving.reassigned
+            driver = HyperDriver(hyperparameters, index)
+            halving.follow(driver.optimizer)
+            result = driver.minimize(objective, halving.remaining, [halving],
+                                     x0=x0, y0=y0)
+        halving.finish()
+
+    Parameters
+    ----------
+    * `optimizer` [skopt.Optimizer]:
+        Optimizer for this rank's hyperspace.
+
+    * `index` [int]:
+        Index of this rank's hyperspace.
+
+    * `n_calls` [int]:
+        Number of optimization iterations run by every rank.
+
+    * `every` [int, default=10]:
+        Number of iterations between rounds.
+
+    * `fraction` [float, default=0.5]:
+        Fraction of the hyperspaces still searched that is stopped each round.
+        At least one hyperspace is always kept.
+
+    * `comm` [MPI communicator, default=MPI.COMM_WORLD]
+    """
+    def __init__(self, optimizer, index, n_calls, every=10, fraction=0.5,
+                 comm=None):
+        if every < 1:
+            raise ValueError('Rounds must happen every >= 1 iterations. '
+                             f'Got {every}')
+        if not 0 <= fraction < 1:
+            raise ValueError(f'fraction must be in [0, 1). Got {fraction}')
+
+        self.optimizer = optimizer
+        self.index = index
+        self.n_calls = n_calls
+        self.every = every
+        self.fraction = fraction
+        self.n_rounds = n_calls // every
+        self.comm = comm if comm is not None else MPI.COMM_WORLD
+        self.reassigned = None
+        self.received = []
+        self.stopped = []
+        self._round = 0
+        self._n_calls = 0
+        self._following = False
+
+    @property
+    def remaining(self):
+        """Iterations left in this rank's budget."""
+        return max(self.n_calls - self._n_calls, 0)
+
+    def __call__(self, res):
+        """
+        Parameters
+        ----------
+        * `res` [`OptimizeResult`, scipy object]:
+            The optimization as a OptimizeResult object.
+        """
+        if self._following:
+            # Telling the reassigned observations is not an iteration.
+            self._following = False
+            return
+
+        self._n_calls += 1
+        if self._n_calls % self.every == 0 and self._round < self.n_rounds:
+            return self._compare(res)
+
+    def follow(self, optimizer):
+        """
+        Switch to the optimizer of the hyperspace this rank was reassigned to.
+
+        The next call, once the optimizer is told the observations in
+        `reassigned`, does not count as an iteration.
+        """
+        self.optimizer = optimizer
+        self.reassigned = None
+        self.received = []
+        self._following = True
+
+    def finish(self):
+        """
+        Take part in the remaining rounds.
+        """
+        while self._round < self.n_rounds:
+            self._compare(None)
+
+    def _compare(self, res):
+        """
+        Rank hyperspaces by incumbent and stop the worst of them.
+        """
+        state = None
+        if res is not None:
+            state = (self.index, res.fun)
+        states = self.comm.allgather(state)
+        self._round += 1
+
+        incumbents = {}
+        for other in states:
+            if other is not None:
+                index, fun = other[0], other[1]
+                incumbents[index] = min(incumbents.get(index, np.inf), fun)
+
+        ranked = sorted(incumbents, key=incumbents.get)
+        n_stop = min(int(len(ranked) * self.fraction), len(ranked) - 1)
+        survivors = ranked[:len(ranked) - n_stop]
+        stopped = set(ranked[len(ranked) - n_stop:])
+        self.stopped.append(sorted(stopped))
+
+        if res is None:
+            return False
+
+        # Spread freed ranks over the survivors, best first.
+        rank = self.comm.Get_rank()
+        freed = [r for r, other in enumerate(states)
+                 if other is not None and other[0] in stopped]
+        targets = {r: survivors[i % len(survivors)]
+                   for i, r in enumerate(freed)}
+
+        if self.index not in stopped:
+            self._tell_peers(states)
+            self._send_history(states, targets)
+            return False
+
+        target = targets[rank]
+        source = min(r for r, other in enumerate(states)
+                     if other is not None and other[0] == target)
+        x0, y0 = self.comm.recv(source=source, tag=_HISTORY)
+
+        self.index = target
+        self.reassigned = (target, x0, y0)
+        return True
+
+    def _tell_peers(self, states):
+        """
+        Tell the optimizer what other ranks observed in the same hyperspace.
+        """
+        rank = self.comm.Get_rank()
+        peers = [r for r, other in enumerate(states)
+                 if other is not None and r != rank
+                 and other[0] == self.index]
+        own = (self.optimizer.Xi, self.optimizer.yi)
+        requests = [self.comm.isend(own, dest=peer, tag=_PEERS)
+                    for peer in peers]
+
+        x, y = [], []
+        for peer in peers:
+            peer_x, peer_y = self.comm.recv(source=peer, tag=_PEERS)
+            for point, value in zip(peer_x, peer_y):
+                if point not in self.optimizer.Xi and point not in x:
+                    x.append(point)
+                    y.append(value)
+        MPI.Request.Waitall(requests)
+
+        if x:
+            self.optimizer.tell(x, y)
+            self.received.extend(zip(x, y))
+
+    def _send_history(self, states, targets):
+        """
+        Send every observation in this hyperspace to the ranks reassigned to
+        it, if this is the lowest rank searching it.
+        """
+        rank = self.comm.Get_rank()
+        source = min(r for r, other in enumerate(states)
+                     if other is not None and other[0] == self.index)
+        if rank != source:
+            return
+
+        history = (list(self.optimizer.Xi), list(self.optimizer.yi))
+        for freed, target in targets.items():
+            if target == self.index:
+                self.comm.send(history, dest=freed, tag=_HISTORY)
@@ -0,0 +1,84 @@
+import numpy as np
+
+
+class AdaptiveRefinement(object):
+    """
+    Stop the optimization every `every` iterations if the incumbent improved.
+
+    Used to refine a hyperspace adaptively: when the incumbent keeps
+    improving, the surrogate is worth trusting around it, so the hyperspace is
+    split around the incumbent (see `refine_space`) and the optimization goes
+    on within the tighter bounds. Hyperspaces that stopped improving are left
+    as they are.
+
+    Example usage:
+        refinement = AdaptiveRefinement(every=10)
+        result = driver.minimize(objective, 50, [refinement])
+        while refinement.refine:
+            space = refine_space(driver.space, result.x,
+                                 depth=refinement.depth)
+            refinement.follow()
+            ... continue optimizing within `space` for
+                `refinement.remaining` iterations ...
+
+    Parameters
+    ----------
+    * `n_calls` [int]:
+        Number of optimization iterations.
+
+    * `every` [int, default=10]:
+        Number of iterations between checks.
+
+    * `min_improvement` [float, default=0.0]:
+        Smallest decrease of the incumbent counted as an improvement.
+
+    * `max_depth` [int, default=None]:
+        Maximum number of refinements. By default, refine as long as the
+        incumbent improves.
+    """
+    def __init__(self, n_calls, every=10, min_improvement=0.0, max_depth=None):
+        if every < 1:
+            raise ValueError('Refinement checks must happen every >= 1 '
+                             f'iterations. Got {every}')
+
+        self.n_calls = n_calls
+        self.every = every
+        self.min_improvement = min_improvement
+        self.max_depth = max_depth
+        self.depth = 0
+        self.refine = False
+        self._best = np.inf
+        self._n_calls = 0
+
+    @property
+    def remaining(self):
+        """Iterations left in the budget."""
+        return max(self.n_calls - self._n_calls, 0)
+
+    def __call__(self, res):
+        """
+        Parameters
+        ----------
+        * `res` [`OptimizeResult`, scipy object]:
+            The optimization as a OptimizeResult object.
+        """
+        self._n_calls += 1
+        if self._n_calls % self.every or self.remaining == 0:
+            return False
+
+        improved = res.fun < self._best - self.min_improvement
+        # The first check only sets the baseline.
+        first = np.isinf(self._best)
+        self._best = min(self._best, res.fun)
+        deeper = self.max_depth is None or self.depth < self.max_depth
+        if improved and not first and deeper:
+            self.refine = True
+            return True
+        return False
+
+    def follow(self):
+        """
+        Record that the hyperspace was refined.
+        """
+        self.depth += 1
+        self.refine = False
@@ -0,0 +1,153 @@
+import numpy as np
+from mpi4py import MPI
+
+from hyperspace.utils.utils import _encode_points
+from hyperspace.utils.utils import _decode_points
+
+
+class ObservationSharer(object):
+    """
+    Share observations between ranks every `every` iterations.
+
+    Each rank posts the number of observations made since the previous round
+    with a non-blocking `Iallgather`, and the observations themselves with a
+    non-blocking `Iallgatherv` at the next round, once the counts are in.
+    Ranks keep optimizing while both exchanges are in flight, so a rank only
+    waits for ranks more than a round behind. Two rounds after they are made,
+    it tells its optimizer every observation from the other ranks that falls
+    inside its own hyperspace. Those `(x, y)` observations are kept in
+    `received`, so that they are not counted as this rank's own evaluations.
+
+    Every rank must take part in the same number of rounds, so `finish`
+    has to be called once the optimization stops, even when it stops early.
+
+    Example usage:
+        sharer = ObservationSharer(optimizer, Space(hyperparameters), 50)
+        ... call `sharer(res)` after each `optimizer.tell` ...
+        sharer.finish()
+
+    Parameters
+    ----------
+    * `optimizer` [skopt.Optimizer]:
+        Optimizer for this rank's hyperspace. Receives the shared observations.
+
+    * `space` [skopt.space.Space]:
+        Undivided search space, used to encode points for MPI.
+
+    * `n_calls` [int]:
+        Number of optimization iterations run by every rank.
+
+    * `every` [int, default=10]:
+        Number of iterations between exchanges.
+
+    * `comm` [MPI communicator, default=MPI.COMM_WORLD]
+    """
+    def __init__(self, optimizer, space, n_calls, every=10, comm=None):
+        if every < 1:
+            raise ValueError('Observations must be shared every >= 1 '
+                             f'iterations. Got {every}')
+
+        self.optimizer = optimizer
+        self.space = space
+        self.every = every
+        self.n_rounds = n_calls // every
+        self.comm = comm if comm is not None else MPI.COMM_WORLD
+        self.received = []
+        self._round = 0
+        self._n_calls = 0
+        self._n_seen = 0
+        self._request = None
+        self._sendbuf = None
+        self._recvbuf = None
+        self._counts = None
+        self._count_request = None
+        self._count = None
+        self._pending_counts = None
+        self._pending = None
+
+    def __call__(self, res):
+        """
+        Parameters
+        ----------
+        * `res` [`OptimizeResult`, scipy object]:
+            The optimization as a OptimizeResult object.
+        """
+        self._n_calls += 1
+        if self._n_calls % self.every == 0 and self._round < self.n_rounds:
+            self._exchange()
+
+    def finish(self):
+        """
+        Take part in the remaining rounds and wait for the last exchange.
+        """
+        while self._round < self.n_rounds:
+            self._exchange(tell=False)
+
+        # The last round's observations are never posted, on any rank.
+        for request in (self._count_request, self._request):
+            if request is not None:
+                request.Wait()
+        self._count_request = None
+        self._request = None
+
+    def _exchange(self, tell=True):
+        """
+        Receive the observations posted last round, post the ones counted
+        last round and count this round's.
+        """
+        # Only share this rank's own evaluations, never what it received.
+        outgoing = list(zip(self.optimizer.Xi[self._n_seen:],
+                            self.optimizer.yi[self._n_seen:]))
+
+        if self._request is not None:
+            self._request.Wait()
+            if tell:
+                self._tell_received()
+
+        self._n_seen = len(self.optimizer.Xi)
+
+        # Rows are [x..., y]. Batches can add more than `every` rows per round.
+        n_cols = self.space.n_dims + 1
+        if self._count_request is not None:
+            # Posted a round ago, so only ranks that far behind are waited on.
+            self._count_request.Wait()
+            self._sendbuf = self._pending
+            self._counts = self._pending_counts
+            self._recvbuf = np.empty((self._counts.sum(), n_cols))
+            self._request = self.comm.Iallgatherv(
+                self._sendbuf, [self._recvbuf, self._counts * n_cols])
+
+        self._pending = np.empty((len(outgoing), n_cols))
+        if outgoing:
+            points = [x for x, _ in outgoing]
+            self._pending[:, :-1] = _encode_points(points, self.space)
+            self._pending[:, -1] = [y for _, y in outgoing]
+
+        self._count = np.array([len(outgoing)], dtype=np.int64)
+        self._pending_counts = np.empty(self.comm.Get_size(), dtype=np.int64)
+        self._count_request = self.comm.Iallgather(self._count,
+                                                   self._pending_counts)
+        self._round += 1
+
+    def _tell_received(self):
+        """
+        Tell the optimizer the received observations in its hyperspace.
+        """
+        rank = self.comm.Get_rank()
+        start = self._counts[:rank].sum()
+        own = np.arange(start, start + self._counts[rank])
+        rows = np.delete(self._recvbuf, own, axis=0)
+        if len(rows) == 0:
+            return
+
+        points = _decode_points(rows[:, :-1], self.space)
+        x, y = [], []
+        space, told = self.optimizer.space, self.optimizer.Xi
+        for point, value in zip(points, rows[:, -1]):
+            if point in space and point not in told:
+                x.append(point)
+                y.append(float(value))
+
+        if x:
+            self.optimizer.tell(x, y)
+            self.received.extend(zip(x, y))
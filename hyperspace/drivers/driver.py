@@ -1,24 +1,84 @@
 import os
+import asyncio
+import warnings
+import collections
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from mpi4py import MPI
 
-from skopt import gp_minimize
-from skopt import gbrt_minimize
-from skopt import forest_minimize
-from skopt import dummy_minimize
 from skopt.callbacks import DeadlineStopper
+from skopt.callbacks import VerboseCallback
+from skopt.space import Space
 from skopt import dump
+from scipy.optimize import OptimizeResult
 
-from hyperspace.space.mapping_space import create_hyperspace
-from hyperspace.space.mapping_space import create_hyperbounds
+from hyperspace.space.mapping_space import count_hyperspaces
+from hyperspace.space.mapping_space import create_subspace
+from hyperspace.space.mapping_space import route_points
+from hyperspace.space.mapping_space import refine_space
+from hyperspace.space.mapping_space import split_hyperparameters
+from hyperspace.space.sensitivity import choose_splits
+from hyperspace.space.sensitivity import dimension_importances
+from hyperspace.utils.utils import manifest_entry
+from hyperspace.utils.utils import savefile_name
+from hyperspace.utils.utils import write_manifest
 from hyperspace.utils.utils import _load_checkpoint
+from hyperspace.utils.utils import _load_checkpoint_file
+from hyperspace.utils.cache import SharedEvaluationCache
+from hyperspace.utils.cache import PersistentMemo
 from hyperspace.callbacks.checkpoints import CheckpointSaver
+from hyperspace.callbacks.checkpoints import LogCheckpointSaver
+from hyperspace.callbacks.collective import MPICheckpointSaver
+from hyperspace.callbacks.collective import load_mpi_checkpoint
+from hyperspace.callbacks.sharing import ObservationSharer
+from hyperspace.callbacks.halving import SuccessiveHalving
+from hyperspace.callbacks.refinement import AdaptiveRefinement
+from hyperspace.drivers.hyperdriver import HyperDriver
+from hyperspace.drivers.group import GroupExecutor
+from hyperspace.drivers.group import serve_evaluations
 from hyperspace.samplers.latin_hypercube_sampler import lhs_start
+from hyperspace.samplers.latin_hypercube_sampler import maximin_lhs_start
+from hyperspace.samplers.quasi_random_sampler import sobol_start
+from hyperspace.samplers.quasi_random_sampler import halton_start
 
 
-def hyperdrive(objective, hyperparameters, results_path, model="GP", n_iterations=50, verbose=False,
-               checkpoints_path=None, deadline=None, sampler=None, n_samples=None, random_state=0):
+# Message tags for the dynamic scheduler.
+_TAG_READY = 1
+_TAG_WORK = 2
+
+# Initial designs, called as `start(hyperbounds, n_samples, rng=rng)`.
+_SAMPLERS = {"lhs": lhs_start, "maximin": maximin_lhs_start,
+             "sobol": sobol_start, "halton": halton_start}
+
+# Options of `hyperdrive` that travel together. See `_SpaceSearch`.
+_Design = collections.namedtuple(
+    '_Design', ['sampler', 'n_samples', 'layout', 'pilot'])
+_Evaluation = collections.namedtuple(
+    '_Evaluation', ['batch_size', 'batch_strategy', 'executor'])
+_Caching = collections.namedtuple(
+    '_Caching',
+    ['dedup_path', 'tolerance', 'timeout', 'cache_path', 'cache_size'])
+_Checkpointing = collections.namedtuple(
+    '_Checkpointing', ['path', 'checkpointer', 'every', 'interval'])
+_Cooperation = collections.namedtuple(
+    '_Cooperation', ['share_every', 'halving_every', 'halving_fraction',
+                     'refine_every', 'refine_depth'])
+
+
+def hyperdrive(objective, hyperparameters, results_path, model="GP",
+               n_iterations=50, verbose=False, checkpoints_path=None,
+               deadline=None, sampler=None, n_samples=None, random_state=0,
+               scheduler="static", share_every=None, batch_size=1,
+               batch_strategy="cl_min", executor="thread",
+               checkpointer="dump", checkpoint_every=1,
+               checkpoint_interval=None, keep_models="all", compress=0,
+               design="local", dedup_path=None, dedup_tolerance=1e-8,
+               dedup_timeout=3600.0, cache_path=None, cache_size=None,
+               halving_every=None, halving_fraction=0.5, refine_every=None,
+               refine_depth=None, n_splits=2, pilot_samples=None,
+               split_dims=None, ranks_per_space=1):
     """
-    Distributed optimization - one optimization per node.
+    Distributed optimization - one optimization per hyperspace.
 
     Parameters
     ----------
@@ -28,8 +88,35 @@ def hyperdrive(objective, hyperparameters, results_path, model="GP", n_iteration
 
     * `hyperparameters` [list, shape=(n_hyperparameters,)]:
 
+    * `n_splits` [int or list of int, default=2]:
+        Number of ways every hyperparameter, or each of them, is split.
+        - There are n_hyperspaces = prod(n_splits) hyperspaces,
+          2**n_hyperparameters by default. E.g. n_splits=[4, 4, 3, 2] gives
+          96 hyperspaces.
+        - A hyperparameter with 1 split is searched whole in every hyperspace.
+        - See `split_hyperparameters`.
+
+    * `pilot_samples` [int, default=None]
+        Number of points in a pilot stage, run before the hyperspaces are
+        built.
+        - The points form a latin hypercube over the undivided search space and
+          are evaluated in parallel by every rank.
+        - Each hyperspace starts from the pilot points it contains, unless it
+          has a `sampler` or a checkpoint.
+        - Every pilot evaluation is saved by the single hyperspace owning it,
+          against whose `n_iterations` it counts, as with design="global".
+
+    * `split_dims` [int, default=None]
+        Number of hyperparameters split `n_splits` ways, chosen by the pilot
+        stage.
+        - Hyperparameters are ranked by random forest importance on the pilot
+          evaluations; the others are not split. See `dimension_importances`.
+        - Requires `pilot_samples` and an integer `n_splits`.
+
     * `results_path` [string]
         Path to save optimization results
+        - A manifest summarizing every result is saved alongside them.
+          See `load_results` and `load_manifest`.
 
     * `checkpoint_path` [string]
         Path to previously saved results. Used to resume optimization.
@@ -58,119 +145,1103 @@ def hyperdrive(objective, hyperparameters, results_path, model="GP", n_iteration
         Random sampling scheme for optimizer's initial runs.
         Options:
         - "lhs": latin hypercube sampling
+        - "maximin": latin hypercube optimized to spread points apart, for
+          expensive objectives
+        - "sobol": scrambled Sobol sequence, up to 21 hyperparameters
+        - "halton": scrambled Halton sequence
+        - Each hyperspace is scrambled independently, see `random_state`.
 
     * `n_samples` [int, default=None]
         Number of random samples to be drawn from the `sampler`.
         - Required if you would like to use `sampler`.
-        - Must be <= the number of elements in the smallest hyperparameter bound's set.
+
+    * `dedup_path` [str, default=None]
+        Directory, shared by every rank, caching objective values.
+        - When set, a configuration proposed by several hyperspaces is
+          evaluated once. See `SharedEvaluationCache`.
+        - Cache hits are reported in the result's `dedup_hits`.
+        - Requires a function objective, not a coroutine, and a thread
+          executor.
+
+    * `dedup_tolerance` [float, default=1e-8]
+        Real values within a relative `dedup_tolerance` of each other are the
+        same configuration.
+
+    * `dedup_timeout` [float, default=3600.0]
+        Seconds after which a configuration claimed in `dedup_path`, but
+        without a value yet, is evaluated again.
+        - Claims of ranks that died on the same host are dropped at once.
+        - If None, wait for as long as the claimant may be alive.
+
+    * `cache_path` [str, default=None]
+        Path to a sqlite file remembering objective values across runs.
+        - When set, configurations evaluated by a previous run are not
+          evaluated again. See `PersistentMemo`.
+        - Use a path on local disk, with `{rank}` in it if ranks share a file
+          system, e.g. "/tmp/memo{rank}.sqlite".
+        - Reals are compared with `dedup_tolerance`.
+        - Hits and misses are reported in the result's `cache_hits` and
+          `cache_misses`.
+        - Requires a function objective, not a coroutine, and a thread
+          executor.
+
+    * `cache_size` [int, default=None]
+        Number of values kept in `cache_path`. The least recently used are
+        evicted first.
+
+    * `halving_every` [int, default=None]
+        Number of iterations between successive halving rounds.
+        - When set, the incumbents of every hyperspace are compared each round
+          and the worst `halving_fraction` of them are stopped. Their ranks
+          join the best hyperspaces for the rest of their budget, sharing
+          observations with the ranks already there. See `SuccessiveHalving`.
+        - Results of the joined hyperspaces are saved as "hyperspaceNN_rankR".
+          Like every result, they only hold the rank's own evaluations.
+        - With `checkpoints_path`, they are checkpointed under the same name,
+          and resumed from there if the rank joins the same hyperspace after a
+          restart.
+        - Requires scheduler="static", and cannot be combined with
+          `share_every` or checkpointer="mpi".
+
+    * `halving_fraction` [float, default=0.5]
+        Fraction of the hyperspaces still searched that is stopped each round.
+
+    * `refine_every` [int, default=None]
+        Number of iterations between checks for adaptive refinement.
+        - When set, a hyperspace whose incumbent improved since the last check
+          is split in two around the incumbent, one dimension at a time as in
+          a k-d tree, and the optimization goes on within the half containing
+          it. See `refine_space`.
+        - The result keeps every evaluation. Its `space` is the final refined
+          hyperspace and `refinements` the number of splits.
+        - Cannot be combined with `checkpoints_path`, `share_every` or
+          `halving_every`.
+
+    * `refine_depth` [int, default=None]
+        Maximum number of refinements of each hyperspace.
+
+    * `design` [str, default="local"]
+        How the `sampler`'s initial design is laid out.
+        Options:
+        - "local": each hyperspace draws `n_samples` points within its own
+          bounds.
+        - "global": `n_samples * n_hyperspaces` points are drawn once over the
+          whole search space. Each point is evaluated by one hyperspace
+          containing it, and its result is given to every hyperspace
+          containing it, so overlapping regions are not sampled several
+          times. Only the rank that evaluated a point saves it in its result,
+          and counts it in its `n_iterations`. Requires scheduler="static" and
+          a rank per hyperspace.
 
     * `random_state` [int, default=0]
         Random state for reproducibility.
+        - The `sampler` of hyperspace N is seeded with `random_state + N`.
+
+    * `scheduler` [str, default="static"]
+        How hyperspaces are assigned to MPI ranks.
+        Options:
+        - "static": rank N optimizes hyperspace N. Ranks beyond the last
+          hyperspace sit idle.
+        - "dynamic": rank 0 hands out hyperspaces to the remaining ranks as
+          they finish, so any number of ranks can work through all
+          hyperspaces.
+
+    * `ranks_per_space` [int, default=1]
+        Number of MPI ranks working on each hyperspace.
+        - Ranks are split into groups of `ranks_per_space` consecutive ranks,
+          and group N optimizes hyperspace N. Groups beyond the last
+          hyperspace sit idle.
+        - The first rank of a group runs the optimizer and sends the points
+          of each batch to the other ranks to evaluate, see `GroupExecutor`.
+        - `batch_size` is raised to `ranks_per_space - 1` if smaller.
+        - Requires scheduler="static" and MPI.THREAD_MULTIPLE, and cannot be
+          combined with collective features such as `share_every` or
+          `halving_every`.
+
+    * `share_every` [int, default=None]
+        Share observations between ranks every `share_every` iterations.
+        - Each rank adds the observations of other ranks that fall within its
+          own hyperspace to its surrogate model, for free.
+        - Exchanges are non-blocking and overlap with the optimization.
+        - Received observations are not saved in the rank's result, only their
+          number, in `n_received`.
+        - Requires scheduler="static".
+
+    * `batch_size` [int, default=1]
+        Number of points proposed per iteration and evaluated concurrently.
+        - Results are told to the optimizer as they arrive.
+        - `n_iterations` still counts objective evaluations.
+
+    * `batch_strategy` [str, default="cl_min"]
+        Constant liar strategy used to propose a batch of points.
+        Options: "cl_min", "cl_mean", "cl_max".
+
+    * `executor` [str or concurrent.futures.Executor, default="thread"]
+        Where batches are evaluated.
+        Options:
+        - "thread": a thread pool, suited to objectives that release the GIL.
+        - "process": a process pool. The objective must be picklable.
+        - an existing `Executor` instance.
+        - Coroutine objectives are awaited instead, with up to `batch_size`
+          evaluations in flight.
+
+    * `checkpointer` [str, default="dump"]
+        How checkpoints are written when `checkpoints_path` is given.
+        Options:
+        - "dump": the whole result is dumped from a background thread.
+        - "log": only new evaluations are appended to a log, which is
+          periodically compacted. Checkpoint cost does not grow with
+          iterations.
+        - "mpi": every rank writes its new evaluations to a fixed size slot in
+          a single shared file with MPI collective I/O. Requires
+          scheduler="static".
+
+    * `checkpoint_every` [int, default=1]
+        With checkpointer="dump" or "mpi", checkpoint every
+        `checkpoint_every` iterations.
+
+    * `checkpoint_interval` [float, default=None]
+        With checkpointer="dump", checkpoint once `checkpoint_interval` seconds
+        have passed since the last checkpoint.
+        - The last checkpoint is always written once the optimization is done.
+
+    * `keep_models` [str or int, default="all"]
+        Fitted surrogate models kept in memory, checkpoints and results.
+        Options:
+        - "all": keep every model.
+        - "none": keep no model.
+        - int N: keep the last N models.
+        - The bytes saved per iteration are reported in the result's
+          `model_bytes_saved`.
+
+    * `compress` [int, default=0]
+        Compression level, from 0 to 9, of checkpoints and results saved
+        with `skopt.dump`.
     """
     comm = MPI.COMM_WORLD
     rank = comm.Get_rank()
     size = comm.Get_size()
 
+    if split_dims is not None and not (pilot_samples
+                                       and isinstance(n_splits, int)):
+        raise ValueError('split_dims requires pilot_samples and an integer '
+                         'n_splits')
+
+    pilot = None
+    if pilot_samples:
+        pilot = _pilot_stage(objective, hyperparameters, pilot_samples,
+                             random_state)
+
+    if split_dims is not None:
+        importances = None
+        if rank == 0:
+            x_iters, func_vals = zip(*pilot)
+            importances = dimension_importances(
+                x_iters, func_vals, Space(hyperparameters),
+                random_state=random_state)
+            if verbose:
+                print(f'Hyperparameter importances: {importances}')
+        importances = comm.bcast(importances, root=0)
+        n_splits = choose_splits(importances, split_dims, n_splits)
+
+    if n_splits != 2:
+        hyperparameters = split_hyperparameters(hyperparameters, n_splits)
+
+    if pilot:
+        # Each evaluation belongs to a single hyperspace, as in a global
+        # design.
+        owners = None
+        if rank == 0:
+            owners = route_points(hyperparameters, [x for x, _ in pilot],
+                                  random_state)
+        owners = comm.bcast(owners, root=0)
+        pilot = [(x, y, owner) for (x, y), owner in zip(pilot, owners)]
+
     if checkpoints_path and sampler:
         raise ValueError('Cannot use both a restart from a previous run and ' \
                          'use latin hypercube sampling for initial search points!')
 
-    # Setup savefile
-    if rank < 10:
-        # Ensure results are sorted by rank
-        filename = 'hyperspace' + str(0) + str(rank)
-    else:
-        filename = 'hyperspace' + str(rank)
+    if sampler and sampler not in _SAMPLERS:
+        raise ValueError("Invalid sampler {}. Read the documentation for "
+                         "supported samplers.".format(sampler))
 
-    savefile = os.path.join(results_path, filename)
-
-    # Create hyperspaces, and either sampling bounds or checkpoints
-    hyperspace = create_hyperspace(hyperparameters)
-    space = hyperspace[rank]
-
-    # Latin hypercube sampling
     if sampler and not n_samples:
         raise ValueError(f'Sampler requires n_samples > 0. Got {n_samples}')
-    elif sampler and n_samples:
-        hyperbounds = create_hyperbounds(hyperparameters)
-        bounds = hyperbounds[rank]
-        # Get initial points in domain via latin hypercube sampling
-        init_points = lhs_start(bounds, n_samples)
-        init_response = None
-        n_rand = 10 - len(init_points)
+
+    if model not in ("GP", "RF", "GBRT", "RAND"):
+        raise ValueError("Invalid model {}. Read the documentation for "
+                         "supported models.".format(model))
+
+    if share_every and scheduler != "static":
+        raise ValueError('Sharing observations requires scheduler="static", '
+                         f'got scheduler="{scheduler}"')
+
+    if checkpointer not in ("dump", "log", "mpi"):
+        raise ValueError("Invalid checkpointer {}. Read the documentation for "
+                         "supported checkpointers.".format(checkpointer))
+
+    if checkpointer == "mpi" and scheduler != "static":
+        raise ValueError('The "mpi" checkpointer requires scheduler="static", '
+                         f'got scheduler="{scheduler}"')
+
+    if (dedup_path or cache_path) and asyncio.iscoroutinefunction(objective):
+        raise ValueError('dedup_path and cache_path require a function '
+                         'objective, not a coroutine')
+
+    process = (executor == "process"
+               or isinstance(executor, ProcessPoolExecutor))
+    if (dedup_path or cache_path) and process:
+        raise ValueError('dedup_path and cache_path cannot be used with a '
+                         'process executor: hits would be counted in the '
+                         'worker processes')
+
+    if halving_every and (scheduler != "static" or share_every
+                          or checkpointer == "mpi"):
+        raise ValueError('Successive halving requires scheduler="static", '
+                         'and cannot be combined with share_every or '
+                         'checkpointer="mpi"')
+
+    if refine_every and (checkpoints_path or share_every or halving_every):
+        raise ValueError('Adaptive refinement cannot be combined with '
+                         'checkpoints_path, share_every or halving_every')
+
+    if batch_size < 1:
+        raise ValueError(f'batch_size must be >= 1. Got {batch_size}')
+
+    if ranks_per_space < 1:
+        raise ValueError('ranks_per_space must be >= 1. '
+                         f'Got {ranks_per_space}')
+
+    if ranks_per_space > 1 and (scheduler != "static" or share_every
+                                or halving_every or checkpointer == "mpi"
+                                or design == "global"
+                                or dedup_path or cache_path
+                                or asyncio.iscoroutinefunction(objective)):
+        raise ValueError('ranks_per_space > 1 requires scheduler="static" '
+                         'and a function objective, and cannot be combined '
+                         'with share_every, halving_every, '
+                         'checkpointer="mpi", design="global", dedup_path '
+                         'or cache_path')
+
+    num_spaces = count_hyperspaces(hyperparameters)
+
+    if design not in ("local", "global"):
+        raise ValueError("Invalid design {}. Read the documentation for "
+                         "supported designs.".format(design))
+
+    if design == "global" and not (sampler and scheduler == "static"
+                                   and size >= num_spaces):
+        raise ValueError('A global design requires a sampler, '
+                         f'scheduler="static" and {num_spaces} ranks, got '
+                         f'sampler={sampler}, '
+                         f'scheduler="{scheduler}" and {size} ranks')
+
+    options = dict(
+        objective=objective, hyperparameters=hyperparameters,
+        results_path=results_path, model=model, n_iterations=n_iterations,
+        deadline=deadline, random_state=random_state,
+        keep_models=keep_models, compress=compress,
+        design=_Design(sampler, n_samples, design, pilot),
+        evaluation=_Evaluation(batch_size, batch_strategy, executor),
+        caching=_Caching(dedup_path, dedup_tolerance, dedup_timeout,
+                         cache_path, cache_size),
+        checkpointing=_Checkpointing(checkpoints_path, checkpointer,
+                                     checkpoint_every, checkpoint_interval),
+        cooperation=_Cooperation(share_every, halving_every, halving_fraction,
+                                 refine_every, refine_depth)
+    )
+
+    if scheduler == "static" and ranks_per_space > 1:
+        entries = _run_groups(comm, num_spaces, ranks_per_space, verbose,
+                              options)
+    elif scheduler == "static":
+        entries = _run_static(comm, num_spaces, verbose, options)
+    elif scheduler == "dynamic":
+        entries = _run_dynamic(comm, num_spaces, verbose, options)
     else:
-        init_points = None
-        init_response = None
-        n_rand = 10
-
-    # Resuming from checkpoint
-    if checkpoints_path:
-        checkpoint = _load_checkpoint(checkpoints_path, rank)
-        try:
-            init_points = checkpoint.x_iters
-            init_response = checkpoint.func_vals
-            n_rand = 10 - len(init_points)
-        except AttributeError:
-            # Missing saves won't have initial values.
-            init_points = None
-            init_response = None
-            n_rand = 10
-
-    callbacks = []
-    if deadline:
-        deadline = DeadlineStopper(deadline)
-        callbacks.append(deadline)
-
-    if checkpoints_path:
-        checkpoint_callback = CheckpointSaver(checkpoints_path, filename)
-        callbacks.append(checkpoint_callback)
-
-    # Thanks Guido for refusing to believe in switch statements.
-    # Case 0
-    if model == "GP":
+        raise ValueError("Invalid scheduler {}. Read the documentation for "
+                         "supported schedulers.".format(scheduler))
+
+    # Summaries of every result, so they can be queried without loading them.
+    entries = comm.gather(entries, root=0)
+    if rank == 0:
+        write_manifest(results_path, [entry for rank_entries in entries
+                                      for entry in rank_entries])
+
+
+def _run_static(comm, num_spaces, verbose, options):
+    """
+    Optimize hyperspace N on rank N. Ranks beyond the last hyperspace sit idle.
+
+    Returns
+    -------
+    * `entries` [list of dict]
+        Manifest entries for the results saved by this rank.
+
+    Parameters
+    ----------
+    * `comm` [MPI communicator]
+
+    * `num_spaces` [int]
+        Number of hyperspaces.
+
+    * `options` [dict]
+        Passed on to `_SpaceSearch`.
+    """
+    rank, size = comm.Get_rank(), comm.Get_size()
+    if rank == 0 and size < num_spaces:
+        warnings.warn(f'Only {size} ranks for {num_spaces} hyperspaces: '
+                      f'hyperspaces {size} through {num_spaces - 1} will not '
+                      'be searched. Use scheduler="dynamic" to search all of '
+                      'them.')
+    elif rank == 0 and size > num_spaces:
+        warnings.warn(f'{size} ranks for {num_spaces} hyperspaces: ranks '
+                      f'{num_spaces} through {size - 1} will sit idle.')
+
+    # Collective features, such as sharing, only involve ranks with work.
+    active = comm.Split(0 if rank < num_spaces else MPI.UNDEFINED, rank)
+    if active == MPI.COMM_NULL:
+        return []
+
+    try:
         # Verbose mode should only run on node 0.
-        if verbose and rank == 0:
-            result = gp_minimize(objective, space, n_calls=n_iterations, verbose=verbose,
-                                 callback=callbacks, x0=init_points, y0=init_response,
-                                 n_random_starts=n_rand, random_state=random_state)
-        else:
-            result = gp_minimize(objective, space, n_calls=n_iterations,
-                                 callback=callbacks, x0=init_points, y0=init_response,
-                                 n_random_starts=n_rand, random_state=random_state)
-
-    # Case 1
-    elif model == "RF":
-        if verbose and rank == 0:
-            result = forest_minimize(objective, space, n_calls=n_iterations, verbose=verbose,
-                                     callback=callbacks, x0=init_points, y0=init_response,
-                                     n_random_starts=n_rand, random_state=random_state)
+        search = _SpaceSearch(index=rank, verbose=verbose and rank == 0,
+                              comm=active, **options)
+        return search.run()
+    finally:
+        active.Free()
+
+
+def _run_groups(comm, num_spaces, ranks_per_space, verbose, options):
+    """
+    Optimize hyperspace N on group N of `ranks_per_space` consecutive ranks.
+
+    Groups beyond the last hyperspace sit idle. See `_run_static` for the
+    return value and the other parameters.
+    """
+    rank, size = comm.Get_rank(), comm.Get_size()
+    num_groups = -(-size // ranks_per_space)
+    if rank == 0 and num_groups < num_spaces:
+        warnings.warn(f'Only {num_groups} groups of {ranks_per_space} ranks '
+                      f'for {num_spaces} hyperspaces: hyperspaces '
+                      f'{num_groups} through {num_spaces - 1} will not be '
+                      'searched.')
+    elif rank == 0 and num_groups > num_spaces:
+        warnings.warn(f'{num_groups} groups of {ranks_per_space} ranks for '
+                      f'{num_spaces} hyperspaces: ranks '
+                      f'{num_spaces * ranks_per_space} through {size - 1} '
+                      'will sit idle.')
+
+    index = rank // ranks_per_space
+    group = comm.Split(index if index < num_spaces else MPI.UNDEFINED, rank)
+    if group == MPI.COMM_NULL:
+        return []
+
+    try:
+        if group.Get_rank() == 0:
+            return _lead_group(group, index=index,
+                               verbose=verbose and rank == 0, **options)
+        serve_evaluations(group)
+        return []
+    finally:
+        group.Free()
+
+
+def _run_dynamic(comm, num_spaces, verbose, options):
+    """
+    Hand out hyperspaces from rank 0 to the other ranks as they finish.
+
+    See `_run_static` for the return value and the parameters.
+    """
+    rank, size = comm.Get_rank(), comm.Get_size()
+    # Hyperspaces are optimized on their own: there are no collective features.
+    entries = []
+    if size == 1:
+        for index in range(num_spaces):
+            search = _SpaceSearch(index=index, verbose=verbose,
+                                  comm=MPI.COMM_SELF, **options)
+            entries.extend(search.run())
+    elif rank == 0:
+        _dispatch_spaces(comm, num_spaces)
+    else:
+        # Rank 0 only schedules, so the first worker reports progress.
+        for index in _request_spaces(comm):
+            search = _SpaceSearch(index=index, verbose=verbose and rank == 1,
+                                  comm=MPI.COMM_SELF, **options)
+            entries.extend(search.run())
+    return entries
+
+
+def _dispatch_spaces(comm, num_spaces):
+    """
+    Hand out hyperspace indices to worker ranks as they become ready.
+
+    Parameters
+    ----------
+    * `comm` [MPI communicator]
+
+    * `num_spaces` [int]
+        Number of hyperspaces to be optimized.
+    """
+    status = MPI.Status()
+    num_workers = comm.Get_size() - 1
+
+    if num_workers > num_spaces:
+        warnings.warn(f'{num_workers} workers for {num_spaces} hyperspaces: '
+                      f'{num_workers - num_spaces} workers will sit idle.')
+
+    for index in range(num_spaces):
+        comm.recv(source=MPI.ANY_SOURCE, tag=_TAG_READY, status=status)
+        comm.send(index, dest=status.Get_source(), tag=_TAG_WORK)
+
+    # Tell every worker that there is no work left.
+    for _ in range(num_workers):
+        comm.recv(source=MPI.ANY_SOURCE, tag=_TAG_READY, status=status)
+        comm.send(None, dest=status.Get_source(), tag=_TAG_WORK)
+
+
+def _request_spaces(comm):
+    """
+    Ask rank 0 for hyperspace indices until none are left.
+
+    Parameters
+    ----------
+    * `comm` [MPI communicator]
+
+    Yields
+    ------
+    * `index` [int]
+        Index of the next hyperspace to optimize.
+    """
+    while True:
+        comm.send(None, dest=0, tag=_TAG_READY)
+        index = comm.recv(source=0, tag=_TAG_WORK)
+        if index is None:
+            return
+        yield index
+
+
+def _lead_group(group, evaluation, **options):
+    """
+    Optimize a hyperspace from the leader of a group, evaluating on the other
+    ranks.
+
+    Parameters
+    ----------
+    * `group` [MPI communicator]
+        Ranks sharing this hyperspace. This rank, the leader, is rank 0.
+        - The other ranks have to run `serve_evaluations`.
+
+    * `evaluation` [`_Evaluation`]
+        The batch size is raised to the number of other ranks, so that every
+        one of them has a point. The executor is only used when the leader is
+        alone in its group.
+
+    See `_SpaceSearch` for the remaining parameters.
+    """
+    # Groups have no collective features: the members only serve evaluations.
+    n_members = group.Get_size() - 1
+    if n_members == 0:
+        return _SpaceSearch(evaluation=evaluation, comm=MPI.COMM_SELF,
+                            **options).run()
+
+    with GroupExecutor(group) as members:
+        evaluation = evaluation._replace(
+            batch_size=max(evaluation.batch_size, n_members), executor=members)
+        return _SpaceSearch(evaluation=evaluation, comm=MPI.COMM_SELF,
+                            **options).run()
+
+
+def _evaluate_points(objective, points):
+    """
+    Evaluate a blocking or coroutine objective at every point.
+
+    Coroutine objectives are awaited concurrently.
+    """
+    if asyncio.iscoroutinefunction(objective):
+        return asyncio.run(_gather_points(objective, points))
+    return [objective(x) for x in points]
+
+
+async def _gather_points(objective, points):
+    """
+    Await a coroutine objective at every point concurrently.
+    """
+    return list(await asyncio.gather(*[objective(x) for x in points]))
+
+
+def _pilot_stage(objective, hyperparameters, n_samples, random_state,
+                 comm=None):
+    """
+    Evaluate a latin hypercube over the undivided search space, shared between
+    all ranks.
+
+    Collective: every rank has to call it.
+
+    Returns
+    -------
+    * `pilot` [list of tuples, shape=(n_samples,)]
+        Every `(x, y)` evaluation, in the same order on every rank.
+
+    Parameters
+    ----------
+    * `comm` [MPI communicator, default=MPI.COMM_WORLD]
+
+    See `hyperdrive` for the remaining parameters.
+    """
+    comm = comm if comm is not None else MPI.COMM_WORLD
+    rank, size = comm.Get_rank(), comm.Get_size()
+
+    points = None
+    if rank == 0:
+        points = lhs_start(Space(hyperparameters).dimensions, n_samples,
+                           rng=random_state)
+    points = comm.bcast(points, root=0)
+
+    mine = points[rank::size]
+    values = _evaluate_points(objective, mine)
+    evaluated = comm.allgather(list(zip(mine, values)))
+    # Interleave back into the order of `points`.
+    return [evaluated[i % size][i // size] for i in range(len(points))]
+
+
+def _global_design(objective, hyperparameters, index, sampler, n_samples,
+                   random_state, comm=None):
+    """
+    Evaluate this hyperspace's share of a design drawn over the whole search
+    space.
+
+    Collective: every rank has to call it, each with its own hyperspace.
+
+    Returns
+    -------
+    * `x0` [list of lists]
+        Points of the design within this hyperspace, evaluated by any rank.
+
+    * `y0` [list]
+        Objective values at `x0`.
+
+    * `received` [list of tuples]
+        The `(x, y)` evaluations of `x0` made by other ranks.
+
+    Parameters
+    ----------
+    * `index` [int]
+        Index of the hyperspace to optimize.
+
+    * `comm` [MPI communicator, default=MPI.COMM_WORLD]
+
+    See `hyperdrive` for the remaining parameters.
+    """
+    comm = comm if comm is not None else MPI.COMM_WORLD
+
+    design = None
+    if comm.Get_rank() == 0:
+        num_points = n_samples * count_hyperspaces(hyperparameters)
+        bounds = Space(hyperparameters).dimensions
+        points = _SAMPLERS[sampler](bounds, num_points, rng=random_state)
+        design = points, route_points(hyperparameters, points, random_state)
+    points, owners = comm.bcast(design, root=0)
+
+    owned = [point for point, owner in zip(points, owners) if owner == index]
+    values = _evaluate_points(objective, owned)
+
+    space = create_subspace(hyperparameters, index)
+    x0, y0, received = [], [], []
+    evaluated = comm.allgather(list(zip(owned, values)))
+    for rank, rank_evaluations in enumerate(evaluated):
+        for point, value in rank_evaluations:
+            if point in space:
+                x0.append(point)
+                y0.append(value)
+                if rank != comm.Get_rank():
+                    received.append((point, value))
+
+    return x0, y0, received
+
+
+class _SpaceSearch(object):
+    """
+    Optimize the objective over a single hyperspace and save the result.
+
+    `run` goes through the stages of the optimization: the initial design,
+    the main run, moving to a better hyperspace with successive halving,
+    adaptive refinement, and saving. They share the objective, wrapped by the
+    caches, the current driver and its callbacks, and the observations
+    received from other ranks, which are kept out of saved results.
+
+    Parameters
+    ----------
+    * `index` [int]
+        Index of the hyperspace to optimize.
+
+    * `design` [`_Design`]
+        `sampler`, `n_samples`, `layout` ("local" or "global"), and the
+        `(x, y, owner)` evaluations of the `pilot` stage, or None.
+
+    * `evaluation` [`_Evaluation`]
+        `batch_size`, `batch_strategy` and `executor`.
+
+    * `caching` [`_Caching`]
+        `dedup_path`, `tolerance`, `timeout`, `cache_path` and `cache_size`.
+
+    * `checkpointing` [`_Checkpointing`]
+        `path`, `checkpointer`, `every` and `interval`.
+
+    * `cooperation` [`_Cooperation`]
+        `share_every`, `halving_every`, `halving_fraction`, `refine_every`
+        and `refine_depth`.
+
+    * `comm` [MPI communicator]
+        Ranks taking part in collective features, such as sharing.
+
+    See `hyperdrive` for the remaining parameters.
+    """
+    def __init__(self, objective, hyperparameters, index, results_path, model,
+                 n_iterations, verbose, deadline, random_state, keep_models,
+                 compress, design, evaluation, caching, checkpointing,
+                 cooperation, comm):
+        self.hyperparameters = hyperparameters
+        self.index = index
+        self.results_path = results_path
+        self.model = model
+        self.n_iterations = n_iterations
+        self.verbose = verbose
+        self.deadline = deadline
+        self.random_state = random_state
+        self.keep_models = keep_models
+        self.compress = compress
+        self.design = design
+        self.evaluation = evaluation
+        self.checkpointing = checkpointing
+        self.cooperation = cooperation
+        self.comm = comm
+        self.objective, self.cache, self.memo = _cached_objective(
+            objective, hyperparameters, caching)
+        self.filename = savefile_name(index)
+        self.driver = None
+        self.callbacks = []
+        self.checkpoint_callback = None
+        self.sharer = None
+        self.halving = None
+        self.refinement = None
+        # Evaluations made by other ranks, kept out of the saved results.
+        self.received = []
+        self.entries = []
+
+    @property
+    def is_coroutine(self):
+        return asyncio.iscoroutinefunction(self.objective)
+
+    @property
+    def n_rounds(self):
+        """
+        Number of callback calls: after every batch, or every evaluation
+        of a coroutine objective.
+        """
+        if self.is_coroutine:
+            return self.n_iterations
+        return -(-self.n_iterations // self.evaluation.batch_size)
+
+    def run(self):
+        """
+        Returns
+        -------
+        * `entries` [list of dict]
+            Manifest entries for the saved results.
+            - More than one when successive halving moves this rank to
+              another hyperspace.
+        """
+        x0, y0, n_calls = self._initial_points()
+        self.driver = self._driver(x0, self.random_state)
+        self._add_callbacks(0 if x0 is None else len(x0))
+        result = self._minimize(n_calls, x0, y0)
+
+        while self.halving and self.halving.reassigned is not None:
+            result = self._follow_halving(result)
+
+        if self.refinement:
+            result = self._refine(result)
+
+        return self._finish(result)
+
+    def _initial_points(self):
+        """
+        Initial points from the design or a checkpoint, and the budget left.
+        """
+        design = self.design
+        n_calls = self.n_iterations
+        if design.sampler and design.n_samples and design.layout == "global":
+            x0, y0, self.received = _global_design(
+                self.objective, self.hyperparameters, self.index,
+                design.sampler, design.n_samples, self.random_state,
+                comm=self.comm)
+            # This rank's design evaluations count against its budget,
+            # as with a local design.
+            n_calls = max(n_calls - (len(x0) - len(self.received)), 0)
+        elif design.sampler and design.n_samples:
+            bounds = create_subspace(self.hyperparameters,
+                                     self.index).dimensions
+            # Get initial points in domain from the sampler, seeded per
+            # hyperspace
+            rng = None
+            if self.random_state is not None:
+                rng = self.random_state + self.index
+            x0 = _SAMPLERS[design.sampler](bounds, design.n_samples, rng=rng)
+            y0 = None
+        elif design.pilot:
+            space = create_subspace(self.hyperparameters, self.index)
+            x0, y0 = [], []
+            for x, y, owner in design.pilot:
+                if x in space:
+                    x0.append(x)
+                    y0.append(y)
+                    if owner != self.index:
+                        self.received.append((x, y))
+            n_calls = max(n_calls - (len(x0) - len(self.received)), 0)
         else:
-            result = forest_minimize(objective, space, n_calls=n_iterations,
-                                     callback=callbacks, x0=init_points, y0=init_response,
-                                     n_random_starts=n_rand, random_state=random_state)
-    # Case 2
-    elif model == "GBRT":
-        if verbose and rank == 0:
-            result = gbrt_minimize(objective, space, n_calls=n_iterations, verbose=verbose,
-                                   callback=callbacks, x0=init_points, y0=init_response,
-                                   n_random_starts=n_rand, random_state=random_state)
+            x0, y0 = None, None
+
+        # Resuming from checkpoint
+        if self.checkpointing.path:
+            checkpoint = self._load_checkpoint()
+            # Missing saves won't have initial values.
+            x0 = getattr(checkpoint, 'x_iters', None)
+            y0 = getattr(checkpoint, 'func_vals', None)
+            # Checkpoints only hold this rank's own evaluations.
+            self.received = []
+
+        if x0 is not None and len(x0) == 0:
+            x0, y0 = None, None
+        return x0, y0, n_calls
+
+    def _load_checkpoint(self):
+        if self.checkpointing.checkpointer == "mpi":
+            return load_mpi_checkpoint(self.checkpointing.path,
+                                       Space(self.hyperparameters),
+                                       comm=self.comm)
+        return _load_checkpoint(self.checkpointing.path, self.index)
+
+    def _driver(self, x0, random_state, space=None):
+        """
+        HyperDriver for the current hyperspace, or for a refined `space`.
+        """
+        n_x0 = 0 if x0 is None else len(x0)
+        # Told points count toward the initial points, so x0 is added back,
+        # as in the `*_minimize` functions of Scikit-Optimize.
+        n_initial_points = max(10 - n_x0, 0) + n_x0
+        if space is None:
+            return HyperDriver(self.hyperparameters, self.index,
+                               model=self.model,
+                               n_initial_points=n_initial_points,
+                               random_state=random_state,
+                               keep_models=self.keep_models)
+        return HyperDriver(space.dimensions, model=self.model,
+                           n_initial_points=n_initial_points,
+                           random_state=random_state,
+                           keep_models=self.keep_models)
+
+    def _add_callbacks(self, n_initial):
+        """
+        Set up the callbacks of the run.
+
+        Parameters
+        ----------
+        * `n_initial` [int]
+            Number of initial points.
+        """
+        if self.deadline:
+            self.callbacks.append(DeadlineStopper(self.deadline))
+
+        checkpointing = self.checkpointing
+        if checkpointing.path and checkpointing.checkpointer == "mpi":
+            # One more call for the initial points.
+            saver = MPICheckpointSaver(
+                checkpointing.path, self.driver.search_space,
+                capacity=n_initial + self.n_iterations,
+                n_calls=self.n_rounds + 1, every=checkpointing.every or 1,
+                comm=self.comm)
+            self.checkpoint_callback = _LocalCheckpoints(saver,
+                                                         self._received)
+        elif checkpointing.path:
+            self.checkpoint_callback = self._checkpoint_saver()
+        if self.checkpoint_callback:
+            self.callbacks.append(self.checkpoint_callback)
+
+        cooperation = self.cooperation
+        if cooperation.share_every:
+            self.sharer = ObservationSharer(
+                self.driver.optimizer, self.driver.search_space,
+                self.n_rounds, every=cooperation.share_every, comm=self.comm)
+            self.callbacks.append(self.sharer)
+
+        if cooperation.halving_every:
+            self.halving = SuccessiveHalving(
+                self.driver.optimizer, self.index, self.n_rounds,
+                every=cooperation.halving_every,
+                fraction=cooperation.halving_fraction, comm=self.comm)
+            self.callbacks.append(self.halving)
+
+        if cooperation.refine_every:
+            self.refinement = AdaptiveRefinement(
+                self.n_rounds, every=cooperation.refine_every,
+                max_depth=cooperation.refine_depth)
+            self.callbacks.append(self.refinement)
+
+        if self.verbose:
+            self.callbacks.append(VerboseCallback(n_total=self.n_rounds))
+
+    def _checkpoint_saver(self):
+        """
+        Callback checkpointing the current hyperspace to its own file.
+        """
+        checkpointing = self.checkpointing
+        if checkpointing.checkpointer == "log":
+            saver = LogCheckpointSaver(checkpointing.path, self.filename)
         else:
-            result = gbrt_minimize(objective, space, n_calls=n_iterations,
-                                   callback=callbacks, x0=init_points, y0=init_response,
-                                   n_random_starts=n_rand, random_state=random_state)
-    # Case 3
-    elif model == "RAND":
-        if verbose and rank == 0:
-            result = dummy_minimize(objective, space, n_calls=n_iterations, verbose=verbose,
-                                    callback=callbacks, x0=init_points, y0=init_response,
-                                    random_state=random_state)
+            saver = CheckpointSaver(checkpointing.path, self.filename,
+                                    background=True,
+                                    every=checkpointing.every,
+                                    interval=checkpointing.interval,
+                                    keep_models=self.keep_models,
+                                    compress=self.compress)
+        return _LocalCheckpoints(saver, self._received)
+
+    def _received(self):
+        """
+        Observations made by other ranks and told to the current optimizer.
+        """
+        received = list(self.received)
+        for callback in (self.sharer, self.halving):
+            if callback:
+                received.extend(callback.received)
+        return received
+
+    def _minimize(self, n_calls, x0, y0):
+        return _run_driver(self.driver, self.objective, n_calls,
+                           self.callbacks, x0, y0, self.evaluation)
+
+    def _calls(self, n_rounds):
+        """
+        Number of objective calls in `n_rounds` callback calls.
+        """
+        if self.is_coroutine:
+            return n_rounds
+        return n_rounds * self.evaluation.batch_size
+
+    def _follow_halving(self, result):
+        """
+        Save the stopped hyperspace, then help search the one this rank was
+        reassigned to.
+        """
+        halving = self.halving
+        self._save(_local_evaluations(result, self._received()))
+
+        self.index, x0, y0 = halving.reassigned
+        # The observations made so far in the new hyperspace are other ranks'.
+        self.received = list(zip(x0, y0))
+        rank = MPI.COMM_WORLD.Get_rank()
+        self.filename = savefile_name(self.index) + '_rank' + str(rank)
+
+        if self.checkpoint_callback:
+            self.checkpoint_callback.close()
+            # Resume what this rank did in the new hyperspace before a restart.
+            checkpoint = _load_checkpoint_file(
+                os.path.join(self.checkpointing.path, self.filename))
+            if checkpoint is not None:
+                for x, y in zip(checkpoint.x_iters, checkpoint.func_vals):
+                    if list(x) not in x0:
+                        x0.append(list(x))
+                        y0.append(y)
+            saver = self._checkpoint_saver()
+            position = self.callbacks.index(self.checkpoint_callback)
+            self.callbacks[position] = saver
+            self.checkpoint_callback = saver
+
+        # A different seed from the ranks already there, so they do not
+        # ask for the same points.
+        seed = None
+        if self.random_state is not None:
+            seed = self.random_state + rank + 1
+        self.driver = self._driver(x0, seed)
+        halving.follow(self.driver.optimizer)
+        return self._minimize(self._calls(halving.remaining), x0, y0)
+
+    def _refine(self, result):
+        """
+        Split the hyperspace around the incumbent while it keeps improving.
+        """
+        refinement = self.refinement
+        outside_x, outside_y = [], []
+        while refinement.refine:
+            refined = refine_space(self.driver.space, result.x,
+                                   depth=refinement.depth)
+            if refined is None:
+                # Nothing left to split: finish the budget where we are.
+                refinement.max_depth = refinement.depth
+                refinement.refine = False
+                x0, y0 = None, None
+            else:
+                x0, y0 = [], []
+                for x, y in zip(result.x_iters, result.func_vals):
+                    if x in refined:
+                        x0.append(x)
+                        y0.append(y)
+                    else:
+                        outside_x.append(x)
+                        outside_y.append(y)
+                refinement.follow()
+                self.driver = self._driver(x0, self.random_state, refined)
+
+            result = self._minimize(self._calls(refinement.remaining), x0, y0)
+
+        # Keep every evaluation, including those outside the final bounds.
+        result.x_iters = outside_x + list(result.x_iters)
+        result.func_vals = np.concatenate([outside_y, result.func_vals])
+        best = np.argmin(result.func_vals)
+        result.x = result.x_iters[best]
+        result.fun = result.func_vals[best]
+        result.refinements = refinement.depth
+        return result
+
+    def _finish(self, result):
+        """
+        Close the callbacks and save this rank's evaluations.
+        """
+        if self.cache:
+            result.dedup_hits = self.cache.hits
+
+        if self.memo:
+            result.cache_hits = self.memo.hits
+            result.cache_misses = self.memo.misses
+            self.memo.close()
+
+        if self.sharer:
+            # Keep taking part in exchanges until every rank is done.
+            self.sharer.finish()
+
+        if self.halving:
+            self.halving.finish()
+
+        if self.checkpoint_callback:
+            self.checkpoint_callback.close()
+
+        # Each worker will independently write their results to disk
+        self._save(_local_evaluations(result, self._received()))
+        return self.entries
+
+    def _save(self, result):
+        dump(result, os.path.join(self.results_path, self.filename),
+             compress=self.compress)
+        self.entries.append(manifest_entry(self.index, self.filename, result))
+
+
+def _cached_objective(objective, hyperparameters, caching):
+    """
+    Wrap the objective with the caches set up in `caching`.
+
+    Returns
+    -------
+    * `objective` [callable]
+
+    * `cache` [`SharedEvaluationCache`, or None]
+
+    * `memo` [`PersistentMemo`, or None]
+    """
+    cache = None
+    if caching.dedup_path:
+        cache = SharedEvaluationCache(objective, caching.dedup_path,
+                                      Space(hyperparameters),
+                                      tolerance=caching.tolerance,
+                                      timeout=caching.timeout)
+        objective = cache
+
+    memo = None
+    if caching.cache_path:
+        path = caching.cache_path.format(rank=MPI.COMM_WORLD.Get_rank())
+        memo = PersistentMemo(objective, path, Space(hyperparameters),
+                              tolerance=caching.tolerance,
+                              max_entries=caching.cache_size)
+        objective = memo
+
+    return objective, cache, memo
+
+
+def _local_evaluations(result, received):
+    """
+    Keep only the evaluations made by this rank in a result.
+
+    Observations received from other ranks are told to the optimizer, so they
+    end up in its result. Saved there, they would be counted by several
+    results. Only their number is kept, in `n_received`.
+
+    Parameters
+    ----------
+    * `result` [`OptimizeResult`, scipy object]
+
+    * `received` [list of tuples]
+        `(x, y)` observations made by other ranks.
+        - Each one removes a single matching evaluation from the result.
+    """
+    remaining = collections.Counter((tuple(x), float(y)) for x, y in received)
+    local = []
+    for i, (x, y) in enumerate(zip(result.x_iters, result.func_vals)):
+        key = (tuple(x), float(y))
+        if remaining[key]:
+            remaining[key] -= 1
         else:
-            result = dummy_minimize(objective, space, n_calls=n_iterations,
-                                    callback=callbacks, x0=init_points, y0=init_response,
-                                    random_state=random_state)
-    else:
-        raise ValueError("Invalid model {}. Read the documentation for "
-                         "supported models.".format(model))
+            local.append(i)
+
+    result.n_received = len(result.func_vals) - len(local)
+    result.x_iters = [result.x_iters[i] for i in local]
+    result.func_vals = np.asarray(result.func_vals)[local]
+    if local:
+        best = int(np.argmin(result.func_vals))
+        result.x = result.x_iters[best]
+        result.fun = result.func_vals[best]
+    return result
 
-    # Each worker will independently write their results to disk
-    dump(result, savefile)
+
+class _LocalCheckpoints(object):
+    """
+    Checkpoint only the evaluations made by this rank.
+
+    Received observations would otherwise be reloaded as this rank's own
+    evaluations on a restart, like in saved results.
+
+    Parameters
+    ----------
+    * `saver` [callable]
+        Checkpoint callback, with a `close` method.
+
+    * `received` [callable]
+        Returns the `(x, y)` observations made by other ranks so far.
+    """
+    def __init__(self, saver, received):
+        self.saver = saver
+        self.received = received
+
+    def __call__(self, res):
+        local = _local_evaluations(OptimizeResult(res), self.received())
+        return self.saver(local)
+
+    def close(self):
+        self.saver.close()
+
+
+def _run_driver(driver, objective, n_calls, callbacks, x0, y0, evaluation):
+    """
+    Run a HyperDriver on a blocking or coroutine objective.
+
+    See `_SpaceSearch` for the parameters.
+    """
+    if asyncio.iscoroutinefunction(objective):
+        return asyncio.run(
+            driver.run(objective, n_calls, callbacks, x0=x0, y0=y0,
+                       n_concurrent=evaluation.batch_size,
+                       strategy=evaluation.batch_strategy)
+        )
+    return driver.minimize(objective, n_calls, callbacks, x0=x0, y0=y0,
+                           batch_size=evaluation.batch_size,
+                           batch_strategy=evaluation.batch_strategy,
+                           executor=evaluation.executor)
@@ -0,0 +1,105 @@
+import queue
+from concurrent.futures import Executor
+from concurrent.futures import ThreadPoolExecutor
+
+from mpi4py import MPI
+
+
+# Message tags between a group leader and its members.
+_TAG_EVALUATE = 3
+_TAG_RESULT = 4
+
+
+class GroupExecutor(Executor):
+    """
+    Evaluate functions on the other ranks of a group, from the group's leader.
+
+    Each submitted call is pickled and sent to an idle member, which runs it
+    and sends back the result. At most one call runs on each member at a time.
+    Members have to run `serve_evaluations` until the executor is shut down.
+
+    Calls are sent from one thread per member, so MPI must provide
+    `MPI.THREAD_MULTIPLE`, which mpi4py requests by default.
+
+    Example usage:
+        group = MPI.COMM_WORLD.Split(rank // ranks_per_space, rank)
+        if group.Get_rank() == 0:
+            with GroupExecutor(group) as executor:
+                driver.minimize(objective, 50, batch_size=group.Get_size() - 1,
+                                executor=executor)
+        else:
+            serve_evaluations(group)
+
+    Parameters
+    ----------
+    * `comm` [MPI communicator]:
+        Group communicator. This rank, the leader, must be rank 0 of it.
+    """
+    def __init__(self, comm):
+        if comm.Get_rank() != 0:
+            raise ValueError('GroupExecutor has to run on rank 0 of its '
+                             'group.')
+        if comm.Get_size() < 2:
+            raise ValueError('GroupExecutor needs at least one other rank in '
+                             'its group.')
+        if MPI.Query_thread() != MPI.THREAD_MULTIPLE:
+            raise RuntimeError('GroupExecutor requires MPI.THREAD_MULTIPLE.')
+
+        self.comm = comm
+        self._members = queue.Queue()
+        for member in range(1, comm.Get_size()):
+            self._members.put(member)
+        self._pool = ThreadPoolExecutor(max_workers=comm.Get_size() - 1)
+        self._shutdown = False
+
+    def submit(self, fn, *args, **kwargs):
+        if self._shutdown:
+            raise RuntimeError('cannot submit calls after shutdown')
+        return self._pool.submit(self._evaluate, fn, args, kwargs)
+
+    def shutdown(self, wait=True):
+        if self._shutdown:
+            return
+        self._shutdown = True
+        self._pool.shutdown(wait=True)
+        for member in range(1, self.comm.Get_size()):
+            self.comm.send(None, dest=member, tag=_TAG_EVALUATE)
+
+    def _evaluate(self, fn, args, kwargs):
+        """
+        Run a call on an idle member and wait for its result.
+        """
+        member = self._members.get()
+        try:
+            self.comm.send((fn, args, kwargs), dest=member, tag=_TAG_EVALUATE)
+            failed, value = self.comm.recv(source=member, tag=_TAG_RESULT)
+        finally:
+            self._members.put(member)
+
+        if failed:
+            raise value
+        return value
+
+
+def serve_evaluations(comm):
+    """
+    Run the calls sent by the group's leader until it shuts down its
+    `GroupExecutor`.
+
+    Parameters
+    ----------
+    * `comm` [MPI communicator]:
+        Group communicator, whose rank 0 is the leader.
+    """
+    while True:
+        call = comm.recv(source=0, tag=_TAG_EVALUATE)
+        if call is None:
+            return
+
+        fn, args, kwargs = call
+        try:
+            result = (False, fn(*args, **kwargs))
+        except Exception as error:
+            # Raised again on the leader, like a failed future.
+            result = (True, error)
+        comm.send(result, dest=0, tag=_TAG_RESULT)
@@ -0,0 +1,224 @@
+import os
+import math
+import numbers
+
+import numpy as np
+from mpi4py import MPI
+from sklearn.utils import check_random_state
+
+from skopt import dump
+
+from hyperspace.space.mapping_space import count_hyperspaces
+from hyperspace.space.mapping_space import create_subspace
+from hyperspace.utils.utils import create_result
+from hyperspace.utils.utils import manifest_entry
+from hyperspace.utils.utils import savefile_name
+from hyperspace.utils.utils import write_manifest
+
+
+def hyperband(objective, hyperparameters, results_path, max_resource=81,
+              eta=3, n_iterations=1, random_state=0, verbose=False):
+    """
+    Distributed Hyperband - hyperspaces spread over ranks, sharing brackets.
+
+    Every rank samples configurations within its own hyperspaces. Brackets of
+    successive halving run in lockstep: at each rung, ranks evaluate their
+    surviving configurations with the rung's resource, then only the best
+    1 / `eta` configurations over all ranks are promoted to the next rung.
+    Most configurations are therefore stopped after a cheap evaluation.
+
+    Rank R searches hyperspaces R, R + size, R + 2 * size, ... With more
+    ranks than hyperspaces, rank R searches hyperspace R % n_hyperspaces
+    instead, with its own seed, so every rank contributes configurations.
+
+    Parameters
+    ----------
+    * `objective` [function]:
+        User defined function, called as `objective(x, resource)`, which trains
+        a learner with the given resource (epochs, fraction of the data, ...)
+        and returns a metric of interest to minimize.
+
+    * `hyperparameters` [list, shape=(n_hyperparameters,)]:
+
+    * `results_path` [string]
+        Path to save optimization results
+        - A manifest summarizing every result is saved alongside them.
+
+    * `max_resource` [int or float, default=81]
+        Resource given to a configuration at the last rung of a bracket.
+        - Resources are rounded to integers if `max_resource` is an integer.
+
+    * `eta` [int, default=3]
+        Only 1 / `eta` of the configurations are promoted at each rung.
+
+    * `n_iterations` [int, default=1]
+        Number of times all brackets are run.
+
+    * `random_state` [int, default=0]
+        Random state for reproducibility.
+        - Hyperspace N samples configurations with `random_state + N`.
+        - Rank R searching a hyperspace also searched by a lower rank uses
+          `random_state + R`.
+
+    * `verbose` [bool, default=False]
+        Verbosity of optimization.
+
+    Returns
+    -------
+    Saves one result per hyperspace searched by a rank. Evaluations are
+    stored per rung, as nested lists, and flattened by `create_result`. The
+    resource of each evaluation is kept in the result's `resources`, in the
+    same order as `x_iters`.
+    - `x` and `fun` are the best evaluation with `max_resource`, so that
+      results of different ranks compare losses measured with the same
+      resource.
+    - A hyperspace searched by several ranks gets one result per rank, with
+      "_rank" and the rank appended to its file name.
+    """
+    comm = MPI.COMM_WORLD
+    rank, size = comm.Get_rank(), comm.Get_size()
+
+    if eta < 2:
+        raise ValueError(f'eta must be >= 2. Got {eta}')
+
+    n_spaces = count_hyperspaces(hyperparameters)
+    searches = [_BracketSearch(hyperparameters, slot, n_spaces, random_state)
+                for slot in range(rank, max(n_spaces, size), size)]
+
+    s_max = int(math.log(max_resource) / math.log(eta) + 1e-9)
+    budget = (s_max + 1) * max_resource
+
+    for _ in range(n_iterations):
+        for s in range(s_max, -1, -1):
+            # Configurations per hyperspace, so that every bracket uses
+            # about the same budget.
+            n_configs = int(math.ceil(
+                budget / max_resource * eta**s / (s + 1)))
+            # (search, configuration) pairs
+            configs = [(search, x) for search in searches
+                       for x in search.sample(n_configs)]
+
+            for i in range(s + 1):
+                resource = max_resource * eta**(i - s)
+                if isinstance(max_resource, numbers.Integral):
+                    resource = max(int(round(resource)), 1)
+
+                losses = [objective(x, resource) for _, x in configs]
+                for search in searches:
+                    search.record(configs, losses, resource, final=i == s)
+
+                if verbose and rank == 0:
+                    best = min(losses, default=np.inf)
+                    print(f'bracket {s}, rung {i}: {len(configs)} '
+                          f'configurations with resource {resource}, '
+                          f'best {best}')
+
+                if i < s:
+                    configs = _promote(comm, configs, losses, eta)
+
+    entries = []
+    for search in searches:
+        result = search.result()
+        dump(result, os.path.join(results_path, search.filename))
+        entries.append(manifest_entry(search.index, search.filename, result))
+
+    entries = comm.gather(entries, root=0)
+    if rank == 0:
+        write_manifest(results_path, [entry for rank_entries in entries
+                                      for entry in rank_entries])
+
+
+class _BracketSearch(object):
+    """
+    Configurations sampled in one hyperspace and their evaluations.
+
+    Parameters
+    ----------
+    * `hyperparameters` [list, shape=(n_hyperparameters,)]
+
+    * `slot` [int]
+        Position in the assignment of hyperspaces to ranks.
+        - Hyperspace `slot % n_spaces`, sampled with `random_state + slot`.
+
+    * `n_spaces` [int]
+        Number of hyperspaces.
+
+    * `random_state` [int]
+    """
+    def __init__(self, hyperparameters, slot, n_spaces, random_state):
+        self.index = slot % n_spaces
+        self.space = create_subspace(hyperparameters, self.index)
+        self.rng = check_random_state(
+            None if random_state is None else random_state + slot)
+        self.filename = savefile_name(self.index)
+        if slot >= n_spaces:
+            self.filename += '_rank' + str(MPI.COMM_WORLD.Get_rank())
+        self.x_iters, self.func_vals, self.resources = [], [], []
+        # Evaluations at the last rung of a bracket, with the full resource.
+        self.final = []
+
+    def sample(self, n_configs):
+        return self.space.rvs(n_samples=n_configs, random_state=self.rng)
+
+    def record(self, configs, losses, resource, final=False):
+        """
+        Keep the evaluations of this hyperspace's configurations at a rung.
+        """
+        rung = [(x, loss) for (search, x), loss in zip(configs, losses)
+                if search is self]
+        self.x_iters.append([x for x, _ in rung])
+        self.func_vals.append([loss for _, loss in rung])
+        self.resources.extend([resource] * len(rung))
+        if final:
+            self.final.extend((loss, x) for x, loss in rung)
+
+    def result(self):
+        result = create_result(self.x_iters, self.func_vals,
+                               space=self.space, rng=self.rng)
+        result.resources = np.asarray(self.resources)
+        # Cheaper evaluations often have lower losses: only compare full ones.
+        result.fun, result.x = min(self.final,
+                                   key=lambda evaluation: evaluation[0])
+        return result
+
+
+def _promote(comm, configs, losses, eta):
+    """
+    Keep this rank's configurations among the best 1 / `eta` over all ranks.
+
+    Collective: every rank has to call it. No rank has more configurations
+    promoted than are promoted overall, so only each rank's best are gathered
+    on rank 0, which broadcasts the last one promoted.
+
+    Parameters
+    ----------
+    * `comm` [MPI communicator]
+
+    * `configs` [list]
+        This rank's configurations at the current rung.
+
+    * `losses` [list]
+        Objective values of `configs`.
+
+    * `eta` [int]
+        Fraction of configurations promoted is 1 / `eta`.
+    """
+    rank = comm.Get_rank()
+    n_promoted = comm.allreduce(len(losses)) // eta
+    # Ties are broken by rank, then by position.
+    best = sorted((loss, rank, position)
+                  for position, loss in enumerate(losses))[:n_promoted]
+
+    candidates = comm.gather(best, root=0)
+    cutoff = None
+    if rank == 0 and n_promoted:
+        ranked = sorted(candidate for rank_best in candidates
+                        for candidate in rank_best)
+        cutoff = ranked[n_promoted - 1]
+    cutoff = comm.bcast(cutoff, root=0)
+
+    if cutoff is None:
+        return []
+    promoted = sorted(position for loss, _, position in best
+                      if (loss, rank, position) <= cutoff)
+    return [configs[position] for position in promoted]
@@ -0,0 +1,424 @@
+import pickle
+import asyncio
+from concurrent.futures import Executor
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+
+import numpy as np
+from sklearn.utils import check_random_state
+
+from skopt import Optimizer
+from skopt.space import Space
+from skopt.utils import cook_estimator
+from skopt.utils import eval_callbacks
+
+from hyperspace.space.mapping_space import create_subspace
+from hyperspace.utils.utils import _kept_models
+
+
+# Surrogates used by the matching `*_minimize` functions.
+_BASE_ESTIMATORS = {"GP": "GP", "RF": "ET", "GBRT": "GBRT", "RAND": "DUMMY"}
+
+
+class HyperDriver(object):
+    """
+    Ask and tell optimization over a single hyperspace.
+
+    Example usage:
+        driver = HyperDriver(hyperparameters, index=rank, model="GP")
+        for _ in range(n_iterations):
+            x = driver.ask()
+            driver.tell(x, objective(x))
+
+    Coroutine objectives can be awaited concurrently:
+        result = asyncio.run(driver.run(objective, n_calls=50, n_concurrent=8))
+
+    Parameters
+    ----------
+    * `hyperparameters` [list, shape=(n_hyperparameters,)]:
+        The undivided search space.
+
+    * `index` [int, default=None]:
+        Index of the hyperspace to optimize over, typically the MPI rank.
+        - If None, optimize over the undivided search space.
+
+    * `model` [string, default="GP"]
+        Probilistic learner used to model our objective function.
+        Options:
+        - "GP": Gaussian process
+        - "RF": Random forest
+        - "GBRT": Gradient boosted regression trees
+        - "RAND": Random search
+
+    * `n_initial_points` [int, default=10]
+        Number of points told before fitting the surrogate.
+        - Initial points passed as `x0` count toward them.
+
+    * `random_state` [int, default=0]
+        Random state for reproducibility.
+
+    * `keep_models` [str or int, default="all"]
+        Fitted surrogate models kept in memory, and so in saved results.
+        - "all": keep every model, like Scikit-Optimize.
+        - "none": keep no model.
+        - int N: keep the last N models.
+        - The optimizer always keeps its newest model, which it needs to ask
+          for points, but results only hold the models kept by the policy.
+        - The pickled size of the models dropped after each `tell` is
+          recorded in `model_bytes_saved`, and in the result.
+    """
+    def __init__(self, hyperparameters, index=None, model="GP",
+                 n_initial_points=10, random_state=0, keep_models="all"):
+        if model not in _BASE_ESTIMATORS:
+            raise ValueError("Invalid model {}. Read the documentation for "
+                             "supported models.".format(model))
+        # Fail early on an invalid policy.
+        _kept_models([], keep_models)
+
+        self.hyperparameters = hyperparameters
+        self.index = index
+        self.model = model
+        self.search_space = Space(hyperparameters)
+        if index is None:
+            self.space = self.search_space
+        else:
+            self.space = create_subspace(hyperparameters, index)
+        self.optimizer = _make_optimizer(self.space, model, n_initial_points,
+                                         random_state)
+        self.keep_models = keep_models
+        self.model_bytes_saved = []
+        self.result = None
+
+    def ask(self, n_points=None, strategy="cl_min"):
+        """
+        Suggest the next point(s) to evaluate.
+
+        Parameters
+        ----------
+        * `n_points` [int, default=None]
+            Number of points to suggest. If None, a single point is returned.
+
+        * `strategy` [str, default="cl_min"]
+            Constant liar strategy used when `n_points` is given.
+            Options: "cl_min", "cl_mean", "cl_max".
+        """
+        if n_points is None:
+            return self.optimizer.ask()
+        return self.optimizer.ask(n_points=n_points, strategy=strategy)
+
+    def tell(self, x, y, fit=True):
+        """
+        Record the objective value of one point or a list of points.
+
+        Parameters
+        ----------
+        * `x` [list or list of lists]
+            Point(s) that were evaluated.
+
+        * `y` [scalar or list]
+            Objective value(s) at `x`.
+
+        * `fit` [bool, default=True]
+            Whether to refit the surrogate model.
+
+        Returns
+        -------
+        * `result` [`OptimizeResult`, scipy object]
+        """
+        self.result = self.optimizer.tell(x, y, fit=fit)
+        if self.keep_models != "all":
+            self._drop_models()
+            self.result.model_bytes_saved = self.model_bytes_saved
+        return self.result
+
+    def minimize(self, objective, n_calls, callbacks=None, x0=None, y0=None,
+                 batch_size=1, batch_strategy="cl_min", executor="thread"):
+        """
+        Minimize a blocking objective.
+
+        Parameters
+        ----------
+        * `objective` [function]
+            Function to minimize.
+
+        * `n_calls` [int]
+            Number of calls to `objective`, including the evaluation of `x0`.
+
+        * `callbacks` [list of callables, optional]
+            Called with the current result after every iteration, or batch.
+            Optimization stops once any of them returns True.
+
+        * `x0` [list of lists, optional]
+            Initial points.
+
+        * `y0` [list, optional]
+            Objective values at `x0`. Evaluated if not given.
+
+        * `batch_size` [int, default=1]
+            Number of points asked for and evaluated at once.
+
+        * `batch_strategy` [str, default="cl_min"]
+            Constant liar strategy used to ask for a batch.
+
+        * `executor` [str or concurrent.futures.Executor, default="thread"]
+            Where batches are evaluated. Unused when `batch_size` is 1.
+            - "thread": a thread pool.
+            - "process": a process pool. The objective must be picklable.
+            - an existing `Executor` instance.
+
+        Returns
+        -------
+        * `result` [`OptimizeResult`, scipy object]
+        """
+        if batch_size == 1:
+            pool = None
+        else:
+            pool = _make_executor(executor, batch_size)
+
+        try:
+            if x0 is not None and len(x0) > 0:
+                x0 = [list(x) for x in x0]
+                if y0 is None:
+                    n_calls -= len(x0)
+                    if pool is None:
+                        self.tell(x0, [objective(x) for x in x0])
+                    else:
+                        self._evaluate_batch(objective, x0, pool)
+                else:
+                    self.tell(x0, list(y0))
+
+                if eval_callbacks(callbacks, self.result):
+                    return self.result
+
+            while n_calls > 0:
+                if pool is None:
+                    next_x = self.ask()
+                    self.tell(next_x, objective(next_x))
+                    n_calls -= 1
+                else:
+                    n_points = min(batch_size, n_calls)
+                    next_xs = self.ask(n_points=n_points,
+                                       strategy=batch_strategy)
+                    self._evaluate_batch(objective, next_xs, pool)
+                    n_calls -= n_points
+
+                if eval_callbacks(callbacks, self.result):
+                    break
+        finally:
+            # Leave executors passed in by the caller running.
+            if pool is not None and pool is not executor:
+                pool.shutdown()
+
+        return self.result
+
+    async def run(self, objective, n_calls, callbacks=None, x0=None, y0=None,
+                  n_concurrent=1, strategy="cl_min"):
+        """
+        Minimize an objective, keeping up to `n_concurrent` evaluations in
+        flight.
+
+        Coroutine objectives are awaited, blocking objectives run in the event
+        loop's default executor. Surrogate fitting runs in a separate thread so
+        that it overlaps with the pending evaluations. New points account for
+        the pending ones with a constant liar.
+
+        Parameters
+        ----------
+        * `objective` [function or coroutine function]
+            Function to minimize.
+
+        * `n_calls` [int]
+            Number of calls to `objective`, including the evaluation of `x0`.
+
+        * `callbacks` [list of callables, optional]
+            Called with the current result after every evaluation.
+            Once any of them returns True no new points are asked for,
+            and the pending evaluations are told as they finish.
+
+        * `x0` [list of lists, optional]
+            Initial points.
+
+        * `y0` [list, optional]
+            Objective values at `x0`. Evaluated concurrently if not given.
+
+        * `n_concurrent` [int, default=1]
+            Maximum number of evaluations in flight.
+
+        * `strategy` [str, default="cl_min"]
+            Constant liar strategy used for the pending points.
+
+        Returns
+        -------
+        * `result` [`OptimizeResult`, scipy object]
+        """
+        loop = asyncio.get_running_loop()
+        # A single worker keeps the optimizer to one thread at a time.
+        surrogate = ThreadPoolExecutor(max_workers=1)
+
+        try:
+            if x0 is not None and len(x0) > 0:
+                x0 = [list(x) for x in x0]
+                if y0 is None:
+                    n_calls -= len(x0)
+                    y0 = await asyncio.gather(*[_call(objective, x)
+                                                for x in x0])
+                await loop.run_in_executor(surrogate, self.tell, x0, list(y0))
+                if eval_callbacks(callbacks, self.result):
+                    return self.result
+
+            pending = {}
+            n_asked = 0
+            while n_asked < n_calls or pending:
+                while n_asked < n_calls and len(pending) < n_concurrent:
+                    next_x = await loop.run_in_executor(
+                        surrogate, self._ask_pending, list(pending.values()),
+                        strategy
+                    )
+                    task = asyncio.ensure_future(_call(objective, next_x))
+                    pending[task] = next_x
+                    n_asked += 1
+
+                done, _ = await asyncio.wait(
+                    list(pending), return_when=asyncio.FIRST_COMPLETED)
+                for n_told, task in enumerate(done, 1):
+                    x = pending.pop(task)
+                    await loop.run_in_executor(surrogate, self.tell, x,
+                                               task.result(),
+                                               n_told == len(done))
+                    if eval_callbacks(callbacks, self.result):
+                        # Stop asking, but keep what is already being paid
+                        # for.
+                        n_calls = n_asked
+        finally:
+            surrogate.shutdown()
+
+        return self.result
+
+    def _drop_models(self):
+        """
+        Drop surrogate models beyond the `keep_models` policy, recording their
+        size.
+
+        The optimizer asks for points with its newest model, so that one stays
+        in memory whatever the policy. Only the result, which is what
+        checkpoints and saved results hold, follows the policy exactly.
+        """
+        models = self.optimizer.models
+        kept = _kept_models(models, self.keep_models)
+        n_live = max(len(kept), min(len(models), 1))
+        dropped = models[:len(models) - n_live]
+        self.model_bytes_saved.append(
+            sum(len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL))
+                for model in dropped)
+        )
+        del models[:len(dropped)]
+        # The result would otherwise share its list with the optimizer.
+        self.result.models = kept
+
+    def _ask_pending(self, pending, strategy="cl_min"):
+        """
+        Ask for a point while `pending` points are still being evaluated.
+
+        Parameters
+        ----------
+        * `pending` [list of lists]
+            Points asked for, but not told yet.
+
+        * `strategy` [str, default="cl_min"]
+            Constant liar strategy used for the pending points.
+        """
+        if not pending or not self.optimizer.yi:
+            return self.ask()
+
+        if strategy == "cl_min":
+            lie = np.min(self.optimizer.yi)
+        elif strategy == "cl_mean":
+            lie = np.mean(self.optimizer.yi)
+        elif strategy == "cl_max":
+            lie = np.max(self.optimizer.yi)
+        else:
+            raise ValueError("Invalid strategy {}. Read the documentation for "
+                             "supported strategies.".format(strategy))
+
+        seed = self.optimizer.rng.randint(0, np.iinfo(np.int32).max)
+        optimizer = self.optimizer.copy(random_state=seed)
+        optimizer.tell(pending, [lie] * len(pending))
+        return optimizer.ask()
+
+    def _evaluate_batch(self, objective, points, pool):
+        """
+        Evaluate points concurrently and tell each result as it arrives.
+
+        The surrogate is only refit once the last result has arrived.
+        """
+        futures = {pool.submit(objective, x): x for x in points}
+        for n_done, future in enumerate(as_completed(futures), 1):
+            self.tell(futures[future], future.result(),
+                      fit=n_done == len(futures))
+
+
+async def _call(objective, x):
+    """
+    Await a coroutine objective, or run a blocking one in the default executor.
+    """
+    if asyncio.iscoroutinefunction(objective):
+        return await objective(x)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, objective, x)
+
+
+def _make_optimizer(space, model, n_initial_points, random_state):
+    """
+    Create an `Optimizer` set up like the `*_minimize` function for `model`.
+
+    Parameters
+    ----------
+    * `space` [skopt.space.Space]
+        Hyperspace to optimize over.
+
+    * `model` [string]
+        One of "GP", "RF", "GBRT" or "RAND". See `HyperDriver`.
+
+    * `n_initial_points` [int]
+        Number of points told before fitting the surrogate, `x0` included.
+
+    * `random_state` [int]
+        Random state for reproducibility.
+    """
+    rng = check_random_state(random_state)
+    if model == "GP":
+        seed = rng.randint(0, np.iinfo(np.int32).max)
+        base_estimator = cook_estimator("GP", space=space.dimensions,
+                                        noise="gaussian", random_state=seed)
+        acq_func = "gp_hedge"
+    else:
+        base_estimator = _BASE_ESTIMATORS[model]
+        acq_func = "EI"
+
+    return Optimizer(space.dimensions, base_estimator,
+                     n_initial_points=n_initial_points, acq_func=acq_func,
+                     random_state=rng)
+
+
+def _make_executor(executor, max_workers):
+    """
+    Create the executor used to evaluate batches.
+
+    Parameters
+    ----------
+    * `executor` [str or concurrent.futures.Executor]
+        "thread", "process", or an existing executor which is used as is.
+
+    * `max_workers` [int]
+        Number of workers for a new pool.
+    """
+    if isinstance(executor, Executor):
+        return executor
+    elif executor == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers)
+    elif executor == "process":
+        return ProcessPoolExecutor(max_workers=max_workers)
+    else:
+        raise ValueError("Invalid executor {}. Read the documentation for "
+                         "supported executors.".format(executor))
@@ -1,10 +1,148 @@
 """Latin Hypercube Sampling"""
+import time
 import numbers
-import random
 import numpy as np
 
+from sklearn.utils import check_random_state
+from skopt.space import Real
+from skopt.space import Integer
+from skopt.space import Categorical
 
-def sample_latin_hypercube(low, high, n_samples, rng=None):
+
+def stratified_unit_samples(n_samples, n_dims, rng=None):
+    """
+    Draws a latin hypercube in the unit cube.
+
+    Each dimension is cut into `n_samples` equal strata and every stratum
+    holds exactly one sample. Strata are matched up across dimensions by
+    an independent random permutation per dimension.
+
+    Parameters:
+    ----------
+    * `n_samples`: [int]
+        number of samples to be drawn.
+
+    * `n_dims`: [int]
+        number of dimensions.
+
+    * `rng`: [int, RandomState instance or None, default=None]
+        random state of the sampler.
+
+    Returns:
+    -------
+    * `samples`: [np.array, shape=(n_samples, n_dims), dtype=float64]
+    """
+    rng = check_random_state(rng)
+    # Sorting uniform noise along each column gives one permutation of the
+    # strata per dimension.
+    strata = rng.random_sample((n_samples, n_dims)).argsort(axis=0)
+    return (strata + rng.random_sample((n_samples, n_dims))) / n_samples
+
+
+def _squared_distances(samples):
+    """Squared pairwise distances, with the diagonal set to infinity."""
+    dist = ((samples[:, None, :] - samples[None, :, :])**2).sum(axis=2)
+    np.fill_diagonal(dist, np.inf)
+    return dist
+
+
+def maximin_unit_samples(n_samples, n_dims, rng=None, max_iter=1000,
+                         time_budget=None, patience=200, temperature=0.1):
+    """
+    Draws a latin hypercube in the unit cube with a large minimum pairwise
+    distance.
+
+    Starts from `stratified_unit_samples` and anneals: each step swaps one
+    coordinate between a point of the closest pair and a random point, which
+    keeps the design a latin hypercube. Only the two affected rows of the
+    distance matrix are recomputed.
+
+    Parameters:
+    ----------
+    * `n_samples`: [int]
+        number of samples to be drawn.
+
+    * `n_dims`: [int]
+        number of dimensions.
+
+    * `rng`: [int, RandomState instance or None, default=None]
+        random state of the sampler.
+
+    * `max_iter`: [int, default=1000]
+        maximum number of swaps tried.
+
+    * `time_budget`: [float, default=None]
+        stop after this many seconds.
+
+    * `patience`: [int, default=200]
+        stop after this many swaps without improving the best design.
+
+    * `temperature`: [float, default=0.1]
+        initial probability scale of accepting a swap that shrinks the minimum
+        distance, relative to the current minimum distance. Decays linearly to
+        zero.
+
+    Returns:
+    -------
+    * `samples`: [np.array, shape=(n_samples, n_dims), dtype=float64]
+    """
+    rng = check_random_state(rng)
+    samples = stratified_unit_samples(n_samples, n_dims, rng=rng)
+    if n_samples < 3:
+        return samples
+
+    start = time.perf_counter()
+    dist = _squared_distances(samples)
+    current = dist.min()
+    best, best_min = samples.copy(), current
+    stale = 0
+
+    for iteration in range(max_iter):
+        if stale >= patience:
+            break
+        elapsed = time.perf_counter() - start
+        if time_budget is not None and elapsed > time_budget:
+            break
+
+        # Move one point of the closest pair.
+        i = np.unravel_index(dist.argmin(), dist.shape)[rng.randint(2)]
+        j = rng.randint(n_samples - 1)
+        j += j >= i
+        k = rng.randint(n_dims)
+        rows = [i, j]
+        old = dist[rows].copy()
+
+        samples[rows, k] = samples[[j, i], k]
+        updated = ((samples[rows, None, :] - samples[None, :, :])**2)
+        updated = updated.sum(axis=2)
+        updated[0, i] = updated[1, j] = np.inf
+        dist[rows] = updated
+        dist[:, rows] = updated.T
+        candidate = dist.min()
+
+        threshold = temperature * (1 - iteration / max_iter) * current
+        accept = candidate >= current
+        if not accept and threshold > 0:
+            accept = rng.random_sample() < np.exp((candidate - current)
+                                                  / threshold)
+        if accept:
+            current = candidate
+            if current > best_min:
+                best, best_min = samples.copy(), current
+                stale = 0
+            else:
+                stale += 1
+        else:
+            samples[rows, k] = samples[[j, i], k]
+            dist[rows] = old
+            dist[:, rows] = old.T
+            stale += 1
+
+    return best
+
+
+def sample_latin_hypercube(low, high, n_samples, rng=None, integer=None,
+                           log=None):
     """
     Creates initial design of n_samples drawn from a latin hypercube.
 
@@ -15,40 +153,95 @@ def sample_latin_hypercube(low, high, n_samples, rng=None):
 
     * `high`: [np.array, shape=(n_dims,)]
         upper bound for each dimension to be sampled.
+        - Inclusive for integer dimensions.
 
     * `n_samples`: [int]
         number of samples to be drawn.
-        - Must be < number of unique points within each dimension's bounds.
+        - If larger than the number of unique points of an integer dimension,
+          each point is drawn n_samples / n_points times, up to rounding.
+
+    * `rng`: [int, RandomState instance or None, default=None]
+        random state of the sampler.
+
+    * `integer`: [np.array of bool, shape=(n_dims,), default=None]
+        dimensions to sample as integers.
+        - By default, dimensions whose bounds are both integers.
+
+    * `log`: [np.array of bool, shape=(n_dims,), default=None]
+        dimensions to sample uniformly between `log10(low)` and `log10(high)`.
+        - By default, none.
 
     Returns:
     -------
-    * `samples.T`: [np.array, shape=(n_samples, n_dims)]
+    * `samples`: [np.array, shape=(n_samples, n_dims), dtype=float64]
+        - Integer dimensions hold whole numbers.
     """
-    if rng is None:
-        rng = np.random.RandomState(np.random.randint(0, 10000))
+    if integer is None:
+        integer = np.array([isinstance(lo, numbers.Integral)
+                            and isinstance(hi, numbers.Integral)
+                            for lo, hi in zip(low, high)], dtype=bool)
+    if log is None:
+        log = np.zeros(len(low), dtype=bool)
 
-    n_dims = low.shape[0]
+    low = np.asarray(low, dtype=np.float64)
+    high = np.asarray(high, dtype=np.float64)
+    integer = np.asarray(integer, dtype=bool)
+    log = np.asarray(log, dtype=bool)
 
-    samples = []
-    for i in range(n_dims):
-        if isinstance(low[i], numbers.Integral):
-            sample = random.sample(range(low[i], high[i]), n_samples)
-        elif isinstance(low[i], numbers.Real):
-            lower_bound = low[i]
-            upper_bound = high[i]
-            sample = lower_bound + rng.uniform(0, 1, n_samples) * (upper_bound - lower_bound)
-        else:
-            raise ValueError('Latin hypercube sampling can only draw from types int and real,'
-                             ' got {}!'.format(type(low[i])))
+    unit = stratified_unit_samples(n_samples, low.shape[0], rng=rng)
+    return _scale_unit_samples(unit, low, high, integer, log)
+
+
+def _scale_unit_samples(unit, low, high, integer, log):
+    """
+    Maps samples from the unit cube onto the bounds of each dimension.
+
+    See `sample_latin_hypercube` for the parameters.
+    """
+    if np.any(high < low):
+        raise ValueError('Sampler bounds must have low <= high.')
+    if np.any(log & ((low <= 0) | integer)):
+        raise ValueError('Log-uniform dimensions must be real valued with '
+                         'positive bounds.')
 
-        samples.append(sample)
+    # Integer strata cover [low, high + 1) so the upper bound is as likely as
+    # any other value.
+    lower = np.where(log, np.log10(np.where(log, low, 1.0)), low)
+    upper = np.where(log, np.log10(np.where(log, high, 1.0)), high + integer)
+    samples = lower + unit * (upper - lower)
 
-    samples = np.array(samples, dtype=object)
+    samples[:, log] = 10**samples[:, log]
+    samples[:, integer] = np.minimum(np.floor(samples[:, integer]),
+                                     high[integer])
+    return samples
+
+
+def _dimension_bounds(bound):
+    """
+    Reads a hyperspace bound as `(low, high, kind, categories)`.
+
+    `kind` is one of "uniform", "log-uniform", "integer" or "categorical".
+    Categorical dimensions are sampled over the indices of their categories.
+    """
+    if isinstance(bound, Categorical):
+        categories = tuple(bound.categories)
+        return 0, len(categories) - 1, "categorical", categories
+    if isinstance(bound, Integer):
+        return bound.low, bound.high, "integer", None
+    if isinstance(bound, Real):
+        return bound.low, bound.high, bound.prior, None
 
-    for i in range(n_dims):
-        rng.shuffle(samples[i, :])
+    if len(bound) == 3 and bound[2] in ["uniform", "log-uniform"]:
+        return bound[0], bound[1], bound[2], None
+    if len(bound) == 2 and all(isinstance(b, numbers.Integral)
+                               and not isinstance(b, bool) for b in bound):
+        return bound[0], bound[1], "integer", None
+    if len(bound) == 2 and all(isinstance(b, numbers.Real)
+                               and not isinstance(b, bool) for b in bound):
+        return bound[0], bound[1], "uniform", None
 
-    return samples.T
+    categories = tuple(bound)
+    return 0, len(categories) - 1, "categorical", categories
 
 
 def lhs_start(hyperbounds, n_samples, rng=None):
@@ -57,30 +250,101 @@ def lhs_start(hyperbounds, n_samples, rng=None):
 
     Parameters:
     ----------
-    * `hyperbounds` [list of tuples, shape=(1, n_dims)]
-        Lower and Upper bounds of each hyperparameter dimension in a hyperspace.
+    * `hyperbounds` [list, shape=(n_dims,)]
+        Bounds of each hyperparameter dimension in a hyperspace. Each bound is
+        either
+        - a `(lower_bound, upper_bound)` tuple for real or integer dimensions,
+        - a `(lower_bound, upper_bound, "prior")` tuple for real dimensions,
+        - a sequence of categories, or
+        - a `Real`, `Integer` or `Categorical` dimension, as in
+          `create_subspace(...).dimensions`.
 
     * `n_samples` [int]
         Number of random samples to be drawn from a latin hypercube
-        - Must be <= the number of elements in the smallest hyperparameter bound's set.
 
-    * `rng` [int, default=None]
+    * `rng` [int, RandomState instance or None, default=None]
         Random seed for the latin hypercube sampler.
 
     Returns:
     -------
     * `samples` [list of lists, shape=(n_samples, n_dims)
-        Sequence of initial points to try the Bayesian optimization loop.    
+        Sequence of initial points to try the Bayesian optimization loop.
     """
-    low_bounds = []
-    high_bounds = []
-    for bound in hyperbounds:
-        low_bounds.append(bound[0])
-        high_bounds.append(bound[1])
+    unit = stratified_unit_samples(n_samples, len(hyperbounds), rng=rng)
+    return scale_to_bounds(unit, hyperbounds)
 
-    low_bounds = np.array(low_bounds, dtype=object)
-    high_bounds = np.array(high_bounds, dtype=object)
 
-    samples = sample_latin_hypercube(low_bounds, high_bounds, n_samples, rng=rng)
-    samples = samples.tolist()
-    return samples
+def maximin_lhs_start(hyperbounds, n_samples, rng=None, time_budget=1.0):
+    """
+    Creates the initial search space using a maximin optimized latin hypercube.
+
+    Worth the extra construction time when each evaluation is expensive.
+
+    Parameters:
+    ----------
+    * `hyperbounds` [list, shape=(n_dims,)]
+        Bounds of each hyperparameter dimension in a hyperspace. See
+        `lhs_start`.
+
+    * `n_samples` [int]
+        Number of random samples to be drawn from a latin hypercube
+
+    * `rng` [int, RandomState instance or None, default=None]
+        Random seed for the latin hypercube sampler.
+
+    * `time_budget` [float, default=1.0]
+        Seconds spent optimizing the design, at most.
+
+    Returns:
+    -------
+    * `samples` [list of lists, shape=(n_samples, n_dims)
+        Sequence of initial points to try the Bayesian optimization loop.
+    """
+    unit = maximin_unit_samples(n_samples, len(hyperbounds), rng=rng,
+                                time_budget=time_budget)
+    return scale_to_bounds(unit, hyperbounds)
+
+
+def scale_to_bounds(unit, hyperbounds):
+    """
+    Maps samples from the unit cube onto the bounds of a hyperspace.
+
+    Used by every sampler in `hyperspace.samplers` to turn its design into
+    points.
+
+    Parameters:
+    ----------
+    * `unit` [np.array, shape=(n_samples, n_dims)]
+        Samples in [0, 1).
+
+    * `hyperbounds` [list, shape=(n_dims,)]
+        Bounds of each hyperparameter dimension in a hyperspace. See
+        `lhs_start`.
+
+    Returns:
+    -------
+    * `samples` [list of lists, shape=(n_samples, n_dims)
+        Points within the hyperspace.
+    """
+    bounds = [_dimension_bounds(bound) for bound in hyperbounds]
+    low_bounds, high_bounds, kinds, categories = zip(*bounds)
+    kinds = np.array(kinds)
+
+    samples = _scale_unit_samples(
+        unit, np.array(low_bounds, dtype=np.float64),
+        np.array(high_bounds, dtype=np.float64),
+        integer=np.isin(kinds, ["integer", "categorical"]),
+        log=kinds == "log-uniform"
+    )
+
+    columns = []
+    for dim, kind in enumerate(kinds):
+        if kind == "categorical":
+            indices = samples[:, dim].astype(np.int64)
+            columns.append([categories[dim][i] for i in indices])
+        elif kind == "integer":
+            columns.append(samples[:, dim].astype(np.int64).tolist())
+        else:
+            columns.append(samples[:, dim].tolist())
+
+    return [list(point) for point in zip(*columns)]
@@ -0,0 +1,239 @@
+"""Scrambled Sobol and Halton Sampling"""
+import numpy as np
+
+from sklearn.utils import check_random_state
+
+from hyperspace.samplers.latin_hypercube_sampler import scale_to_bounds
+
+
+# Bits of precision of the Sobol sequence.
+_SOBOL_BITS = 30
+
+# Degree, coefficients and initial direction numbers of dimensions 2 and up,
+# from Joe and Kuo's new-joe-kuo-6.21201. Dimension 1 is the van der Corput
+# sequence.
+_SOBOL_PARAMETERS = [
+    (1, 0, [1]),
+    (2, 1, [1, 3]),
+    (3, 1, [1, 3, 1]),
+    (3, 2, [1, 1, 1]),
+    (4, 1, [1, 1, 3, 3]),
+    (4, 4, [1, 3, 5, 13]),
+    (5, 2, [1, 1, 5, 5, 17]),
+    (5, 4, [1, 1, 5, 5, 5]),
+    (5, 7, [1, 1, 7, 11, 19]),
+    (5, 11, [1, 1, 5, 1, 1]),
+    (5, 13, [1, 1, 1, 3, 11]),
+    (5, 14, [1, 3, 5, 5, 31]),
+    (6, 1, [1, 3, 3, 9, 7, 49]),
+    (6, 13, [1, 1, 1, 15, 21, 21]),
+    (6, 16, [1, 3, 1, 13, 27, 49]),
+    (6, 19, [1, 1, 1, 15, 7, 5]),
+    (6, 22, [1, 3, 1, 15, 13, 25]),
+    (6, 25, [1, 1, 5, 5, 19, 61]),
+    (7, 1, [1, 3, 7, 11, 23, 15, 103]),
+    (7, 4, [1, 3, 7, 13, 13, 15, 69]),
+]
+
+SOBOL_MAX_DIMS = len(_SOBOL_PARAMETERS) + 1
+
+
+def _sobol_direction_numbers(n_dims):
+    """
+    Direction numbers of the first `n_dims` Sobol dimensions.
+
+    Returns
+    -------
+    * `directions` [np.array, shape=(n_dims, _SOBOL_BITS), dtype=int64]
+        Direction number k of each dimension, scaled to `_SOBOL_BITS` bits.
+    """
+    if n_dims > SOBOL_MAX_DIMS:
+        raise ValueError('Sobol sampling supports up to '
+                         f'{SOBOL_MAX_DIMS} dimensions. Got {n_dims}, use '
+                         'sampler="halton" instead.')
+
+    directions = np.zeros((n_dims, _SOBOL_BITS), dtype=np.int64)
+    shifts = _SOBOL_BITS - 1 - np.arange(_SOBOL_BITS)
+    directions[0] = 1 << shifts
+
+    for dim in range(1, n_dims):
+        degree, coefficients, initial = _SOBOL_PARAMETERS[dim - 1]
+        m = list(initial)
+        for k in range(degree, _SOBOL_BITS):
+            new = m[k - degree] ^ (m[k - degree] << degree)
+            for j in range(1, degree):
+                if (coefficients >> (degree - 1 - j)) & 1:
+                    new ^= m[k - j] << j
+            m.append(new)
+        directions[dim] = np.array(m[:_SOBOL_BITS], dtype=np.int64) << shifts
+
+    return directions
+
+
+def _scramble_directions(directions, rng):
+    """
+    Linear matrix scrambling: multiply each dimension's generator matrix by a
+    random lower triangular matrix with a unit diagonal, over GF(2).
+    """
+    n_dims, n_bits = directions.shape
+    bits = 1 << (n_bits - 1 - np.arange(n_bits))
+    # Row i of each scrambling matrix, packed in the same bit order as the
+    # direction numbers.
+    lower = rng.randint(0, 2, size=(n_dims, n_bits, n_bits)).astype(np.int64)
+    lower = np.tril(lower, k=-1) + np.eye(n_bits, dtype=np.int64)
+    rows = (lower * bits).sum(axis=2)
+
+    scrambled = np.zeros_like(directions)
+    for i in range(n_bits):
+        masked = rows[:, i, None] & directions
+        # Parity of each masked direction number.
+        parity = np.zeros_like(masked)
+        for j in range(n_bits):
+            parity ^= (masked >> j) & 1
+        scrambled |= parity << (n_bits - 1 - i)
+
+    return scrambled
+
+
+def sample_sobol(n_samples, n_dims, rng=None, scramble=True):
+    """
+    Draws points from a scrambled Sobol sequence in the unit cube.
+
+    Parameters:
+    ----------
+    * `n_samples`: [int]
+        number of samples to be drawn.
+        - Powers of two keep the balance properties of the sequence.
+
+    * `n_dims`: [int]
+        number of dimensions, at most `SOBOL_MAX_DIMS`.
+
+    * `rng`: [int, RandomState instance or None, default=None]
+        random state of the scrambling.
+
+    * `scramble`: [bool, default=True]
+        whether to apply linear matrix scrambling and a random digital shift.
+
+    Returns:
+    -------
+    * `samples`: [np.array, shape=(n_samples, n_dims), dtype=float64]
+    """
+    rng = check_random_state(rng)
+    directions = _sobol_direction_numbers(n_dims)
+    shift = np.zeros(n_dims, dtype=np.int64)
+    if scramble:
+        directions = _scramble_directions(directions, rng)
+        shift = rng.randint(0, 1 << _SOBOL_BITS, size=n_dims).astype(np.int64)
+
+    # Point n is the XOR of the direction numbers of the set bits of n.
+    index = np.arange(n_samples, dtype=np.int64)
+    samples = np.zeros((n_samples, n_dims), dtype=np.int64)
+    for k in range(int(n_samples - 1).bit_length()):
+        samples ^= ((index >> k) & 1)[:, None] * directions[:, k]
+
+    return (samples ^ shift) / float(1 << _SOBOL_BITS)
+
+
+def _first_primes(n):
+    """The first `n` prime numbers."""
+    primes = []
+    candidate = 2
+    while len(primes) < n:
+        if all(candidate % p for p in primes if p * p <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+
+def sample_halton(n_samples, n_dims, rng=None, scramble=True):
+    """
+    Draws points from a scrambled Halton sequence in the unit cube.
+
+    Parameters:
+    ----------
+    * `n_samples`: [int]
+        number of samples to be drawn.
+
+    * `n_dims`: [int]
+        number of dimensions.
+
+    * `rng`: [int, RandomState instance or None, default=None]
+        random state of the scrambling.
+
+    * `scramble`: [bool, default=True]
+        whether to randomly permute the digits of each dimension.
+
+    Returns:
+    -------
+    * `samples`: [np.array, shape=(n_samples, n_dims), dtype=float64]
+    """
+    rng = check_random_state(rng)
+    samples = np.zeros((n_samples, n_dims))
+
+    for dim, base in enumerate(_first_primes(n_dims)):
+        # Enough digits to resolve a float64, so that scrambled trailing zeros
+        # are accounted for.
+        n_digits = int(np.ceil(53 / np.log2(base)))
+        index = np.arange(n_samples, dtype=np.int64)
+        scale = 1.0
+        for _ in range(n_digits):
+            scale /= base
+            digits = index % base
+            if scramble:
+                digits = rng.permutation(base)[digits]
+            samples[:, dim] += digits * scale
+            index //= base
+
+    return samples
+
+
+def sobol_start(hyperbounds, n_samples, rng=None):
+    """
+    Creates the initial search space using a scrambled Sobol sequence.
+
+    Parameters:
+    ----------
+    * `hyperbounds` [list, shape=(n_dims,)]
+        Bounds of each hyperparameter dimension in a hyperspace. See
+        `lhs_start`.
+
+    * `n_samples` [int]
+        Number of points drawn from the sequence.
+
+    * `rng` [int, RandomState instance or None, default=None]
+        Random seed for the scrambling. Use a different seed for each
+        hyperspace.
+
+    Returns:
+    -------
+    * `samples` [list of lists, shape=(n_samples, n_dims)
+        Sequence of initial points to try the Bayesian optimization loop.
+    """
+    unit = sample_sobol(n_samples, len(hyperbounds), rng=rng)
+    return scale_to_bounds(unit, hyperbounds)
+
+
+def halton_start(hyperbounds, n_samples, rng=None):
+    """
+    Creates the initial search space using a scrambled Halton sequence.
+
+    Parameters:
+    ----------
+    * `hyperbounds` [list, shape=(n_dims,)]
+        Bounds of each hyperparameter dimension in a hyperspace. See
+        `lhs_start`.
+
+    * `n_samples` [int]
+        Number of points drawn from the sequence.
+
+    * `rng` [int, RandomState instance or None, default=None]
+        Random seed for the scrambling. Use a different seed for each
+        hyperspace.
+
+    Returns:
+    -------
+    * `samples` [list of lists, shape=(n_samples, n_dims)
+        Sequence of initial points to try the Bayesian optimization loop.
+    """
+    unit = sample_halton(n_samples, len(hyperbounds), rng=rng)
+    return scale_to_bounds(unit, hyperbounds)
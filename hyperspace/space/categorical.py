@@ -1,4 +1,3 @@
-import warnings
 from math import floor, ceil
 
 from skopt.space import Categorical
@@ -29,14 +28,25 @@ class HyperCategorical(HyperSpace, Categorical):
 
         name: [str or None]:
             Name associated with dimension, e.g., "colors".
+
+        overlap: [float, default=0.25]:
+            Amount of overlap between between each hyperspace.
+            - Should be between 0 and 1.
+
+        n_splits: [int, default=2]:
+            Number of hyperspaces the categories are divided into.
+            - If n_splits=1, the categories are not divided.
     """
-    def __init__(self, categories, prior=None, transform=None, overlap=0.25, name=None):
+    def __init__(self, categories, prior=None, transform=None, overlap=0.25,
+                 name=None, n_splits=2):
         super().__init__(categories, prior, transform)
         self.categories = categories
         self.prior = prior
         self.transform = transform
         self.overlap = overlap
         self.name = name
+        self.n_splits = n_splits
+        self.splits = None
         self.cat_low = None
         self.cat_high = None
         self._divide_space()
@@ -56,23 +66,37 @@ class HyperCategorical(HyperSpace, Categorical):
 
     def _divide_space(self):
         """
-        Divides the original search space into overlapping subspaces.
+        Divides the original search space into `n_splits` overlapping
+        subspaces.
         """
-        subinterval_length = floor(len(self.categories)/2)
-        overlap_length = ceil(subinterval_length * self.overlap)
+        if self.n_splits < 1:
+            raise ValueError("n_splits has to be at least 1, got {}".format(
+                self.n_splits))
 
-        if subinterval_length < 1:
-            warnings.warn("Each hyperspace contains a single value.")
-
-        cat_low = self.categories[0:subinterval_length + overlap_length]
-        self.cat_low = tuple(cat_low)
-        cat_reverse = self.categories[::-1]
-        cat_high = cat_reverse[0:subinterval_length + overlap_length]
-        self.cat_high = tuple(cat_high[::-1])
+        n_categories = len(self.categories)
+        subinterval_length = floor(n_categories/self.n_splits)
+        overlap_length = ceil(subinterval_length * self.overlap)
+        if self.n_splits == 1:
+            overlap_length = 0
+
+        self.splits = []
+        for split in range(self.n_splits):
+            start = ceil(split * n_categories / self.n_splits)
+            stop = floor((split + 1) * n_categories / self.n_splits)
+            start = max(start - overlap_length, 0)
+            stop = min(stop + overlap_length, n_categories)
+            if start >= stop:
+                raise ValueError("Cannot split {} categories into {} "
+                                 "hyperspaces: some would be empty.".format(
+                                     n_categories, self.n_splits))
+            self.splits.append(tuple(self.categories[start:stop]))
+
+        self.cat_low = self.splits[0]
+        self.cat_high = self.splits[-1]
 
     def get_hyperspace(self):
         """
-        Create integer HyperSpaces.
+        Create categorical HyperSpaces, one per split.
         """
-        return Categorical(self.cat_low, self.prior, self.transform), \
-               Categorical(self.cat_high, self.prior, self.transform)
\ No newline at end of file
+        return tuple(Categorical(categories, self.prior, self.transform)
+                     for categories in self.splits)
@@ -30,12 +30,19 @@ class HyperInteger(HyperSpace, Integer):
             - Should be between 0 and 1.
             - If overlap=0, there are no shared values between the hyperspaces.
             - If overlap=1, two copies of the search space is made.
+
+        n_splits: [int, default=2]:
+            Number of hyperspaces the dimension is divided into.
+            - If n_splits=1, the dimension is not divided.
     """
-    def __init__(self, low, high, transform=None, overlap=0.25, name=None):
+    def __init__(self, low, high, transform=None, overlap=0.25, name=None,
+                 n_splits=2):
         super().__init__(low, high, transform)
         self.transform = transform
         self.overlap = overlap
         self.name = name
+        self.n_splits = n_splits
+        self.splits = None
         self.space0_low = None
         self.space0_high = None
         self.space1_low = None
@@ -50,30 +57,46 @@ class HyperInteger(HyperSpace, Integer):
         """
         Representation of the Integer HyperSpace. Useful when checking the hyperspace bounds.
         """
-        return "HyperInteger(low={}, high={})\n" \
-               "HyperInteger(low={}, high={})".format(self.space0_low, self.space0_high,
-                                                      self.space1_low, self.space1_high)
+        return "\n".join("HyperInteger(low={}, high={})".format(low, high)
+                         for low, high in self.splits)
 
     def _divide_space(self):
         """
-        Divides the original search space into overlapping subspaces.
+        Divides the original search space into `n_splits` overlapping
+        subspaces.
         """
-        subinterval_length = abs(self.high - self.low)/2
+        if self.n_splits < 1:
+            raise ValueError("n_splits has to be at least 1, got {}".format(
+                self.n_splits))
+
+        subinterval_length = abs(self.high - self.low)/self.n_splits
         overlap_length = subinterval_length * self.overlap
+        if self.n_splits == 1:
+            overlap_length = 0
 
         if subinterval_length < 1:
             warnings.warn("Each hyperspace contains a single value.")
 
         # Define the bounds of the hyperspaces.
         # Mind the floor and ceiling: spaces defined with short ranges can get interesting.
-        self.space0_low = self.low
-        self.space0_high = floor(self.space0_low + subinterval_length + overlap_length)
-        self.space1_low = ceil(self.high - (subinterval_length + overlap_length))
-        self.space1_high = self.high
+        self.splits = []
+        for split in range(self.n_splits):
+            start = self.low + split * subinterval_length
+            stop = self.low + (split + 1) * subinterval_length
+            low = max(ceil(start - overlap_length), self.low)
+            high = min(floor(stop + overlap_length), self.high)
+            if low >= high:
+                # Integer dimensions need at least two values.
+                raise ValueError("Cannot split [{}, {}] into {} hyperspaces: "
+                                 "some would hold fewer than two values."
+                                 .format(self.low, self.high, self.n_splits))
+            self.splits.append((low, high))
+
+        self.space0_low, self.space0_high = self.splits[0]
+        self.space1_low, self.space1_high = self.splits[-1]
 
     def get_hyperspace(self):
         """
-        Create integer HyperSpaces.
+        Create integer HyperSpaces, one per split.
         """
-        return Integer(self.space0_low, self.space0_high), \
-               Integer(self.space1_low, self.space1_high)
\ No newline at end of file
+        return tuple(Integer(low, high) for low, high in self.splits)
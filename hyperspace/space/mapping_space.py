@@ -1,8 +1,13 @@
 import numbers
 import numpy as np
 
+from sklearn.utils import check_random_state
+
 from skopt.space import Dimension
 from skopt.space import Space
+from skopt.space import Real
+from skopt.space import Integer
+from skopt.space import Categorical
 
 from hyperspace.api.space import HyperSpace
 from hyperspace.space.real import HyperReal
@@ -10,7 +15,7 @@ from hyperspace.space.integer import HyperInteger
 from hyperspace.space.categorical import HyperCategorical
 
 
-def check_dimension(dimension, transform=None):
+def check_dimension(dimension, transform=None, n_splits=2):
     """
     Turn a provided dimension description into a dimension object.
     Checks that the provided dimension falls into one of the
@@ -42,50 +47,22 @@ def check_dimension(dimension, transform=None):
             original space.
           - "normalize", the transformed space is scaled to be between 0 and 1.
 
+    * `n_splits` [int, default=2]:
+        Number of hyperspaces the dimension is divided into, unless it is
+        already a hyperspace class such as `HyperReal`.
+
     Returns
     -------
-    * `dimension`:
-        Dimension instance.
+    * `dimensions` [tuple, shape=(n_splits,)]:
+        Dimension instance of each hyperspace.
     """
     if isinstance(dimension, HyperSpace):
         return dimension.get_hyperspace()
 
-    if not isinstance(dimension, (list, tuple, np.ndarray)):
-        raise ValueError("Dimension has to be a list or tuple.")
+    return _hyperspace_class(dimension, n_splits, transform).get_hyperspace()
 
-    if len(dimension) == 2:
-        if any([isinstance(d, (str, bool)) for d in dimension]):
-            hyper_cat = HyperCategorical(dimension, transform=transform)
-            return hyper_cat.get_hyperspace()
-        elif all([isinstance(dim, numbers.Integral) for dim in dimension]):
-            hyper_int = HyperInteger(*dimension, transform=transform)
-            return hyper_int.get_hyperspace()
-        elif any([isinstance(dim, numbers.Real) for dim in dimension]):
-            hyper_real = HyperReal(*dimension, transform=transform)
-            return hyper_real.get_hyperspace()
-        else:
-            raise ValueError("Invalid dimension {}. Read the documentation for"
-                             " supported types.".format(dimension))
 
-    if len(dimension) == 3:
-        if (any([isinstance(dim, (float, int)) for dim in dimension[:2]]) and
-            dimension[2] in ["uniform", "log-uniform"]):
-            hyper_real = HyperReal(*dimension, transform=transform)
-            return hyper_real.get_hyperspace()
-        else:
-            hyper_cat = HyperCategorical(dimension, transform=transform)
-            return hyper_cat.get_hyperspace()
-
-    if len(dimension) > 3:
-        hyper_cat = HyperCategorical(dimension, transform=transform)
-        return hyper_cat.get_hyperspace()
-
-    raise ValueError("Invalid dimension {}. Read the documentation for "
-                     "supported types.".format(dimension))
-
-
-
-def check_hyperbounds(dimension, transform=None):
+def check_hyperbounds(dimension, transform=None, n_splits=2):
     """
     Turn a provided dimension description into a dimension object.
     Checks that the provided dimension falls into one of the
@@ -117,58 +94,35 @@ def check_hyperbounds(dimension, transform=None):
             original space.
           - "normalize", the transformed space is scaled to be between 0 and 1.
 
+    * `n_splits` [int, default=2]:
+        Number of hyperspaces the dimension is divided into, unless it is
+        already a hyperspace class such as `HyperReal`.
+
     Returns
     -------
-    * `dimension`:
-        Dimension instance.
+    * `bounds` [tuple, shape=(n_splits,)]:
+        Bounds of each hyperspace: `(low, high)` for integer and real
+        dimensions, `(low, high, prior)` for log-uniform real dimensions, and
+        a tuple of categories for categorical dimensions.
     """
+    if isinstance(dimension, HyperSpace):
+        return _hyperbounds(dimension)
+
     if isinstance(dimension, Dimension):
         return dimension
 
-    if not isinstance(dimension, (list, tuple, np.ndarray)):
-        raise ValueError("Dimension has to be a list or tuple.")
-
-    if len(dimension) == 2:
-        if any([isinstance(d, (str, bool)) for d in dimension]):
-            hyper_cat = HyperCategorical(dimension, transform=transform)
-            space0_low = hyper_cat.space0_low
-            space0_high = hyper_cat.space0_high
-            space1_low = hyper_cat.space1_low
-            space1_high = hyper_cat.space1_high
-            return (space0_low, space0_high), (space1_low, space1_high)
-        elif all([isinstance(dim, numbers.Integral) for dim in dimension]):
-            hyper_int = HyperInteger(*dimension, transform=transform)
-            space0_low = hyper_int.space0_low
-            space0_high = hyper_int.space0_high
-            space1_low = hyper_int.space1_low
-            space1_high = hyper_int.space1_high
-            return (space0_low, space0_high), (space1_low, space1_high)
-        elif any([isinstance(dim, numbers.Real) for dim in dimension]):
-            hyper_real = HyperReal(*dimension, transform=transform)
-            space0_low = hyper_real.space0_low
-            space0_high = hyper_real.space0_high
-            space1_low = hyper_real.space1_low
-            space1_high = hyper_real.space1_high
-            return (space0_low, space0_high), (space1_low, space1_high)
-        else:
-            raise ValueError("Invalid dimension {}. Read the documentation for"
-                             " supported types.".format(dimension))
-
-    if len(dimension) == 3:
-        if (any([isinstance(dim, (float, int)) for dim in dimension[:2]]) and
-            dimension[2] in ["uniform", "log-uniform"]):
-            hyper_real = HyperReal(*dimension, transform=transform)
-            return hyper_real.get_hyperspace()
-        else:
-            hyper_cat = HyperCategorical(dimension, transform=transform)
-            return hyper_cat.get_hyperspace()
+    return _hyperbounds(_hyperspace_class(dimension, n_splits, transform))
 
-    if len(dimension) > 3:
-        hyper_cat = HyperCategorical(dimension, transform=transform)
-        return hyper_cat.get_hyperspace()
 
-    raise ValueError("Invalid dimension {}. Read the documentation for "
-                     "supported types.".format(dimension))
+def _hyperbounds(hyper):
+    """
+    Bounds of each split of a hyperspace class. See `check_hyperbounds`.
+    """
+    if isinstance(hyper, HyperCategorical):
+        return tuple(hyper.splits)
+    if isinstance(hyper, HyperReal) and hyper.prior != "uniform":
+        return tuple((low, high, hyper.prior) for low, high in hyper.splits)
+    return tuple(hyper.splits)
 
 
 def fold_spaces(low_spaces, high_spaces):
@@ -193,19 +147,109 @@ def fold_spaces(low_spaces, high_spaces):
         raise ValueError(("low_spaces and high_spaces must have the same length. "
                          "Got {} and {} respectively.".format(len(low_spaces), len(high_spaces))))
 
-    indices = len(low_spaces)
-    num_hyperspaces = 2**indices
-    hyperspace = [[] for i in range(num_hyperspaces)]
+    return fold_splits(list(zip(low_spaces, high_spaces)))
 
-    for space in range(num_hyperspaces):
-        for index in range(indices):
-            bit_tester = 1 << index
-            if space & bit_tester:
-                hyperspace[space].insert(index, low_spaces[index])
-            else:
-                hyperspace[space].insert(index, high_spaces[index])
 
-    return hyperspace
+def fold_splits(splits):
+    """
+    Creates all possible combinations of hyperspaces, for any number of splits
+    per dimension.
+
+    Hyperspace `index` takes split `k - 1 - digit` of a dimension split `k`
+    ways, where `digit` is the dimension's digit of `index` in mixed radix,
+    with the first dimension as the least significant digit. With two splits
+    per dimension, this is the ordering of `fold_spaces`.
+
+    Parameters
+    ----------
+    * `splits` [list of tuples, shape=(n_dimensions, n_splits)]:
+        Spaces, or bounds, of each split of each dimension.
+
+    Returns
+    -------
+    * `hyperspace` [`list of lists`, shape=(prod(n_splits), n_dimensions)]:
+        - All combinations of hyperspaces.
+    """
+    num_hyperspaces = int(np.prod([len(split) for split in splits]))
+    return [_pick_splits(splits, index) for index in range(num_hyperspaces)]
+
+
+def _pick_splits(splits, index):
+    """
+    Split of each dimension in hyperspace `index`. See `fold_splits`.
+    """
+    picked = []
+    for split in splits:
+        index, digit = divmod(index, len(split))
+        picked.append(split[len(split) - 1 - digit])
+    return picked
+
+
+def split_hyperparameters(hyperparameters, n_splits=2):
+    """
+    Sets how many ways each hyperparameter is split.
+
+    Parameters
+    ----------
+    * `hyperparameters` [list, shape=(n_hyperparameters,)]
+
+    * `n_splits` [int or list of int, default=2]
+        Number of splits of every hyperparameter, or of each of them.
+        - A hyperparameter with 1 split is not divided: every hyperspace
+          searches its whole range.
+        - Hyperparameters already given as hyperspace classes, such as
+          `HyperReal`, keep their own `n_splits`.
+
+    Returns
+    -------
+    * `hyperparameters` [list, shape=(n_hyperparameters,)]
+        Hyperspace classes, which the functions of this module divide
+        accordingly.
+    """
+    if isinstance(n_splits, numbers.Integral):
+        n_splits = [n_splits] * len(hyperparameters)
+
+    if len(n_splits) != len(hyperparameters):
+        raise ValueError("n_splits must have one entry per hyperparameter. "
+                         "Got {} for {} hyperparameters.".format(
+                             len(n_splits), len(hyperparameters)))
+
+    return [hparam if isinstance(hparam, HyperSpace)
+            else _hyperspace_class(hparam, splits)
+            for hparam, splits in zip(hyperparameters, n_splits)]
+
+
+def _hyperspace_class(dimension, n_splits, transform=None):
+    """
+    Hyperspace class matching a dimension description. See `check_dimension`.
+    """
+    if not isinstance(dimension, (list, tuple, np.ndarray)):
+        raise ValueError("Dimension has to be a list or tuple.")
+
+    if len(dimension) == 2:
+        if any([isinstance(d, (str, bool)) for d in dimension]):
+            return HyperCategorical(dimension, transform=transform,
+                                    n_splits=n_splits)
+        elif all([isinstance(dim, numbers.Integral) for dim in dimension]):
+            return HyperInteger(*dimension, transform=transform,
+                                n_splits=n_splits)
+        elif any([isinstance(dim, numbers.Real) for dim in dimension]):
+            return HyperReal(*dimension, transform=transform,
+                             n_splits=n_splits)
+        raise ValueError("Invalid dimension {}. Read the documentation for"
+                         " supported types.".format(dimension))
+
+    if (len(dimension) == 3 and
+            any([isinstance(dim, (float, int)) for dim in dimension[:2]]) and
+            dimension[2] in ["uniform", "log-uniform"]):
+        return HyperReal(*dimension, transform=transform, n_splits=n_splits)
+
+    if len(dimension) >= 3:
+        return HyperCategorical(list(dimension), transform=transform,
+                                n_splits=n_splits)
+
+    raise ValueError("Invalid dimension {}. Read the documentation for "
+                     "supported types.".format(dimension))
 
 
 def create_hyperspace(hyperparameters):
@@ -220,16 +264,12 @@ def create_hyperspace(hyperparameters):
     -------
     * `hyperspace` [list of lists, shape(n_spaces, n_hyperparameters)]
         - All combinations of hyperspaces. Each list within hyperspace
-          is a search space to be distributed across 2**n_spaces nodes.
+          is a search space to be distributed across n_spaces nodes.
+        - n_spaces is 2**n_hyperparameters unless `split_hyperparameters`
+          says otherwise.
     """
-    hparams_low = []
-    hparams_high = []
-    for hparam in hyperparameters:
-        low, high = check_dimension(hparam)
-        hparams_low.append(low)
-        hparams_high.append(high)
-
-    all_spaces = fold_spaces(hparams_low, hparams_high)
+    all_spaces = fold_splits([check_dimension(hparam)
+                              for hparam in hyperparameters])
 
     hyperspace = []
     for space in all_spaces:
@@ -251,17 +291,221 @@ def create_hyperbounds(hyperparameters):
         - All combinations of hyperspace bounds.
         - Matches the bounds in hyerspaces from create_hyperspace.
     """
-    hparams_low = []
-    hparams_high = []
-    for hparam in hyperparameters:
-        low, high = check_hyperbounds(hparam)
-        hparams_low.append(low)
-        hparams_high.append(high)
-
-    all_spaces = fold_spaces(hparams_low, hparams_high)
+    all_spaces = fold_splits([check_hyperbounds(hparam)
+                              for hparam in hyperparameters])
 
     hyperspace_bounds = []
     for space in all_spaces:
         hyperspace_bounds.append(space)
 
     return hyperspace_bounds
+
+
+def count_hyperspaces(hyperparameters):
+    """
+    Number of hyperspaces created from `hyperparameters`.
+
+    Parameters
+    ----------
+    * `hyperparameters` [list, shape=(n_hyperparameters,)]
+
+    Returns
+    -------
+    * `num_hyperspaces` [int]
+    """
+    num_hyperspaces = 1
+    for hparam in hyperparameters:
+        if isinstance(hparam, HyperSpace):
+            num_hyperspaces *= hparam.n_splits
+        else:
+            num_hyperspaces *= 2
+    return num_hyperspaces
+
+
+def _subspace_dimensions(hyperparameters, index, check):
+    """
+    Picks out the dimensions of a single hyperspace from its index.
+
+    With two splits per hyperparameter, bit `i` of `index` selects the lower
+    half of hyperparameter `i` when set, and the upper half otherwise. This
+    matches the ordering of `fold_splits`.
+
+    Parameters
+    ----------
+    * `hyperparameters` [list, shape=(n_hyperparameters,)]
+
+    * `index` [int]
+        Index of the hyperspace, typically the MPI rank.
+
+    * `check` [callable]
+        Either `check_dimension` or `check_hyperbounds`.
+    """
+    num_hyperspaces = count_hyperspaces(hyperparameters)
+    if not 0 <= index < num_hyperspaces:
+        raise ValueError("Hyperspace index {} out of range. {} "
+                         "hyperparameters define {} hyperspaces.".format(
+                             index, len(hyperparameters), num_hyperspaces))
+
+    return _pick_splits([check(hparam) for hparam in hyperparameters], index)
+
+
+def create_subspace(hyperparameters, index):
+    """
+    Builds a single hyperspace without creating all the others.
+
+    Equivalent to `create_hyperspace(hyperparameters)[index]`, but only
+    takes O(n_hyperparameters) time and memory.
+
+    Parameters
+    ----------
+    * `hyperparameters` [list, shape=(n_hyperparameters,)]
+
+    * `index` [int]
+        Index of the hyperspace, typically the MPI rank.
+
+    Returns
+    -------
+    * `space` [skopt.space.Space]
+        Search space for the hyperspace at `index`.
+    """
+    return Space(_subspace_dimensions(hyperparameters, index, check_dimension))
+
+
+def create_subbounds(hyperparameters, index):
+    """
+    Gets the bounds of a single hyperspace for sampling.
+
+    Equivalent to `create_hyperbounds(hyperparameters)[index]`, but only
+    takes O(n_hyperparameters) time and memory.
+
+    Parameters
+    ----------
+    * `hyperparameters` [list, shape=(n_hyperparameters,)]
+
+    * `index` [int]
+        Index of the hyperspace, typically the MPI rank.
+
+    Returns
+    -------
+    * `bounds` [list, shape=(n_hyperparameters,)]
+        - Bounds of each hyperparameter in the hyperspace at `index`.
+    """
+    return _subspace_dimensions(hyperparameters, index, check_hyperbounds)
+
+
+def route_points(hyperparameters, points, random_state=None):
+    """
+    Assigns each point to a single hyperspace that contains it.
+
+    Points in the overlap of several hyperspaces go to one of them at random,
+    so that overlapping regions are spread evenly between their owners.
+
+    Parameters
+    ----------
+    * `hyperparameters` [list, shape=(n_hyperparameters,)]
+
+    * `points` [list of lists, shape=(n_points, n_hyperparameters)]
+        Points within the undivided search space.
+
+    * `random_state` [int, RandomState instance or None, default=None]
+        Breaks ties between overlapping hyperspaces.
+
+    Returns
+    -------
+    * `owners` [list of int, shape=(n_points,)]
+        Index of the hyperspace owning each point. Matches `create_subspace`.
+    """
+    rng = check_random_state(random_state)
+    splits = [check_dimension(hparam) for hparam in hyperparameters]
+
+    owners = []
+    for point in points:
+        owner = 0
+        radix = 1
+        for split, value in zip(splits, point):
+            containing = [k for k, dimension in enumerate(split)
+                          if value in dimension]
+            if containing:
+                k = containing[rng.randint(len(containing))]
+            else:
+                k = len(split) - 1
+            # Inverse of `_pick_splits`.
+            owner += radix * (len(split) - 1 - k)
+            radix *= len(split)
+        owners.append(owner)
+
+    return owners
+
+
+def _split_dimension(dimension, overlap=0.25):
+    """
+    Splits a dimension in two overlapping halves, like the hyperspace classes.
+
+    Returns
+    -------
+    * `halves` [tuple of Dimension, or None]
+        Lower and upper halves, or None if the dimension is too small to split.
+    """
+    if isinstance(dimension, Categorical):
+        if len(dimension.categories) < 3:
+            return None
+        return HyperCategorical(list(dimension.categories),
+                                overlap=overlap).get_hyperspace()
+    elif isinstance(dimension, Integer):
+        if dimension.high - dimension.low < 2:
+            return None
+        return HyperInteger(dimension.low, dimension.high,
+                            overlap=overlap).get_hyperspace()
+    elif isinstance(dimension, Real):
+        return HyperReal(dimension.low, dimension.high, prior=dimension.prior,
+                         overlap=overlap).get_hyperspace()
+    raise ValueError("Cannot split dimension {}.".format(dimension))
+
+
+def refine_space(space, point, depth=0, overlap=0.25):
+    """
+    Splits a hyperspace in two around a point, as one level of a k-d tree.
+
+    The split dimension cycles with `depth`, skipping dimensions too small to
+    be split. The half whose center is closest to `point` is kept.
+
+    Parameters
+    ----------
+    * `space` [skopt.space.Space]
+        Hyperspace to refine.
+
+    * `point` [list, shape=(n_dims,)]
+        Point within `space`, typically the incumbent.
+
+    * `depth` [int, default=0]
+        Depth of `space` in the tree.
+
+    * `overlap` [float, default=0.25]
+        Overlap between the two halves. See `HyperReal`.
+
+    Returns
+    -------
+    * `refined` [skopt.space.Space, or None]
+        Half of `space` containing `point`, or None if no dimension can be
+        split.
+    """
+    n_dims = len(space.dimensions)
+    for step in range(n_dims):
+        position = (depth + step) % n_dims
+        dimension = space.dimensions[position]
+        halves = _split_dimension(dimension, overlap)
+        if halves is None:
+            continue
+
+        value = point[position]
+        if isinstance(dimension, Categorical):
+            n_categories = len(dimension.categories)
+            lower = dimension.categories.index(value) < n_categories / 2
+        else:
+            lower = value <= (dimension.low + dimension.high) / 2
+
+        dimensions = list(space.dimensions)
+        dimensions[position] = halves[0] if lower else halves[1]
+        return Space(dimensions)
+
+    return None
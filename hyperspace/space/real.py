@@ -1,5 +1,3 @@
-import warnings
-
 from skopt.space import Real
 from hyperspace.api.space import HyperSpace
 
@@ -36,13 +34,20 @@ class HyperReal(HyperSpace, Real):
             - Should be between 0 and 1.
             - If overlap=0, there are no shared values between the hyperspaces.
             - If overlap=1, two copies of the search space is made.
+
+        n_splits: [int, default=2]:
+            Number of hyperspaces the dimension is divided into.
+            - If n_splits=1, the dimension is not divided.
     """
-    def __init__(self, low, high, prior="uniform", transform=None, overlap=0.25, name=None):
+    def __init__(self, low, high, prior="uniform", transform=None,
+                 overlap=0.25, name=None, n_splits=2):
         super().__init__(low, high, prior, transform)
         self.prior = prior
         self.transform = transform
         self.overlap = overlap
         self.name = name
+        self.n_splits = n_splits
+        self.splits = None
         self.space0_low = None
         self.space0_high = None
         self.space1_low = None
@@ -55,31 +60,43 @@ class HyperReal(HyperSpace, Real):
 
     def __repr__(self):
         """
-        Representation of the Integer HyperSpace. Useful when checking the hyperspace bounds.
+        Representation of the Real HyperSpace. Useful when checking the
+        hyperspace bounds.
         """
-        return "HyperReal(low={}, high={}, prior={}, transform={})\n" \
-               "HyperReal(low={}, high={}, prior={}, transform={})" \
-               "".format(self.space0_low, self.space0_high, self.prior, self.transform,
-                         self.space1_low, self.space1_high, self.prior, self.transform)
+        return "\n".join(
+            "HyperReal(low={}, high={}, prior={}, transform={})".format(
+                low, high, self.prior, self.transform)
+            for low, high in self.splits
+        )
 
     def _divide_space(self):
         """
-        Divides the original search space into overlapping subspaces.
+        Divides the original search space into `n_splits` overlapping
+        subspaces.
         """
-        subinterval_length = abs(self.high - self.low)/2
+        if self.n_splits < 1:
+            raise ValueError("n_splits has to be at least 1, got {}".format(
+                self.n_splits))
+
+        subinterval_length = abs(self.high - self.low)/self.n_splits
         overlap_length = subinterval_length * self.overlap
+        if self.n_splits == 1:
+            overlap_length = 0
 
-        if subinterval_length < 1:
-            warnings.warn("Each hyperspace contains a single value.")
+        self.splits = []
+        for split in range(self.n_splits):
+            start = self.low + split * subinterval_length
+            stop = self.low + (split + 1) * subinterval_length
+            low = max(start - overlap_length, self.low)
+            high = min(stop + overlap_length, self.high)
+            self.splits.append((low, high))
 
-        self.space0_low = self.low
-        self.space0_high = self.space0_low + subinterval_length + overlap_length
-        self.space1_low = self.high - (subinterval_length + overlap_length)
-        self.space1_high = self.high
+        self.space0_low, self.space0_high = self.splits[0]
+        self.space1_low, self.space1_high = self.splits[-1]
 
     def get_hyperspace(self):
         """
-        Create integer HyperSpaces.
+        Create real HyperSpaces, one per split.
         """
-        return Real(self.space0_low, self.space0_high, self.prior, self.transform), \
-               Real(self.space1_low, self.space1_high, self.prior, self.transform)
\ No newline at end of file
+        return tuple(Real(low, high, self.prior, self.transform)
+                     for low, high in self.splits)
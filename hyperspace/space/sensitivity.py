@@ -0,0 +1,66 @@
+import numpy as np
+
+from sklearn.ensemble import RandomForestRegressor
+
+from hyperspace.utils.utils import _encode_points
+
+
+def dimension_importances(x_iters, func_vals, space, random_state=0):
+    """
+    Estimates how much each hyperparameter affects the objective.
+
+    Fits a random forest to the evaluations and returns its impurity based
+    feature importances. Categorical values are encoded by their index.
+
+    Parameters
+    ----------
+    * `x_iters` [list of lists, shape=(n_points, n_dims)]
+        Evaluated points.
+
+    * `func_vals` [array-like, shape=(n_points,)]
+        Objective values at `x_iters`.
+
+    * `space` [skopt.space.Space]
+        Undivided search space.
+
+    * `random_state` [int, default=0]
+        Random state of the forest.
+
+    Returns
+    -------
+    * `importances` [np.array, shape=(n_dims,)]
+        Non-negative importances summing to 1.
+    """
+    encoded = _encode_points(x_iters, space)
+    forest = RandomForestRegressor(n_estimators=100, random_state=random_state)
+    forest.fit(encoded, np.asarray(func_vals, dtype=np.float64))
+    return forest.feature_importances_
+
+
+def choose_splits(importances, n_split_dims, n_splits=2):
+    """
+    Splits only the most important hyperparameters.
+
+    Parameters
+    ----------
+    * `importances` [array-like, shape=(n_dims,)]
+        Importance of each hyperparameter, see `dimension_importances`.
+
+    * `n_split_dims` [int]
+        Number of hyperparameters to split.
+
+    * `n_splits` [int, default=2]
+        Number of ways each of them is split.
+
+    Returns
+    -------
+    * `splits` [list of int, shape=(n_dims,)]
+        `n_splits` for the `n_split_dims` most important hyperparameters, 1
+        for the rest.
+        Can be passed to `split_hyperparameters`.
+    """
+    top = np.argsort(importances)[::-1][:n_split_dims]
+    splits = [1] * len(importances)
+    for position in top:
+        splits[position] = n_splits
+    return splits
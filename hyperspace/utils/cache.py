@@ -0,0 +1,384 @@
+import os
+import json
+import time
+import socket
+import sqlite3
+import hashlib
+import threading
+
+import numpy as np
+from skopt.space import Real
+from skopt.space import Integer
+
+from hyperspace.utils.utils import _to_python
+
+
+def canonical_point(point, space, tolerance=1e-8):
+    """
+    Canonical form of a point, so that equal configurations share a cache key.
+
+    Parameters
+    ----------
+    * `point` [list, shape=(n_dims,)]
+
+    * `space` [skopt.space.Space]
+        Undivided search space.
+
+    * `tolerance` [float, default=1e-8]
+        Relative tolerance: real values whose logarithms are closer than
+        `tolerance` to the same grid point are equal.
+
+    Returns
+    -------
+    * `canonical` [list, shape=(n_dims,)]
+        Integers rounded to the nearest integer, reals as their sign and the
+        index of their logarithm on a grid of spacing `tolerance`, and
+        categories as is.
+    """
+    canonical = []
+    for value, dim in zip(point, space.dimensions):
+        if isinstance(dim, Integer):
+            canonical.append(int(np.round(value)))
+        elif isinstance(dim, Real) and value == 0:
+            canonical.append(0)
+        elif isinstance(dim, Real):
+            # Relative, so that small values such as learning rates stay
+            # distinct.
+            exponent = np.log(abs(value)) / tolerance
+            canonical.append([int(np.sign(value)), int(np.round(exponent))])
+        else:
+            canonical.append(_to_python(value))
+    return canonical
+
+
+def point_key(point, space, tolerance=1e-8):
+    """
+    Cache key of a point. See `canonical_point`.
+    """
+    canonical = json.dumps(canonical_point(point, space, tolerance),
+                           default=str)
+    return hashlib.sha1(canonical.encode()).hexdigest()
+
+
+class SharedEvaluationCache(object):
+    """
+    Evaluate each configuration once across all ranks.
+
+    Wraps an objective with a cache in a directory every rank can reach, such
+    as node-local storage or a shared file system. Overlapping hyperspaces
+    often propose the same configuration; the first rank to claim it evaluates
+    the objective, the others wait for its result.
+
+    A claim is a file created exclusively, and a result is a JSON file
+    written atomically, so no locking is needed beyond what the file system
+    provides. Claims record the host, pid and time of the claimant: a claim
+    older than `timeout`, or whose claimant died on the same host, is
+    abandoned and the point claimed again by a waiting rank.
+
+    `hits` and `misses` are counted by the instance that is called: a copy
+    pickled into a worker process counts its own, which the original never
+    sees.
+
+    Example usage:
+        objective = SharedEvaluationCache(objective, "./evaluations",
+                                          Space(hyperparameters))
+
+    Parameters
+    ----------
+    * `objective` [function]:
+        Objective to be cached. Called only on a cache miss.
+
+    * `cache_path` [str]:
+        Directory shared by every rank.
+
+    * `space` [skopt.space.Space]:
+        Undivided search space, used to canonicalize points.
+
+    * `tolerance` [float, default=1e-8]:
+        Real values within a relative `tolerance` of each other are the same
+        configuration.
+
+    * `timeout` [float, default=3600.0]:
+        Age in seconds of a claim without a result after which the point is
+        evaluated again.
+        - Set it above the longest evaluation.
+        - If None, wait as long as the claimant may be alive: forever when
+          it runs on another host.
+
+    * `poll_interval` [float, default=1.0]:
+        Seconds between checks for another rank's result.
+    """
+    def __init__(self, objective, cache_path, space, tolerance=1e-8,
+                 timeout=3600.0, poll_interval=1.0):
+        self.objective = objective
+        self.cache_path = cache_path
+        self.space = space
+        self.tolerance = tolerance
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_path, exist_ok=True)
+
+    def __call__(self, x):
+        """
+        Parameters
+        ----------
+        * `x` [list, shape=(n_dims,)]:
+            Point to evaluate.
+        """
+        key = point_key(x, self.space, self.tolerance)
+        resultfile = os.path.join(self.cache_path, key + '.json')
+        claimfile = os.path.join(self.cache_path, key + '.claim')
+
+        value = self._read(resultfile)
+        if value is None and not self._claim(claimfile):
+            value = self._wait(resultfile, claimfile)
+
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        try:
+            value = self.objective(x)
+        except BaseException:
+            # Let another rank evaluate the point instead of waiting on it
+            # forever.
+            os.remove(claimfile)
+            raise
+        self._write(resultfile, x, value)
+        return value
+
+    def _claim(self, claimfile):
+        """
+        Claim a point for evaluation. Only one rank succeeds.
+        """
+        try:
+            fd = os.open(claimfile, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w') as f:
+            json.dump(_claimant(), f)
+        return True
+
+    def _wait(self, resultfile, claimfile):
+        """
+        Wait for the rank that claimed a point to write its result.
+
+        Returns None once this rank has claimed an abandoned point instead.
+        """
+        since = time.time()
+        while True:
+            value = self._read(resultfile)
+            if value is not None:
+                return value
+
+            claim = _read_claim(claimfile)
+            if claim is None:
+                # Released by a claimant whose evaluation failed.
+                if self._claim(claimfile):
+                    return None
+            elif self._abandoned(claim, since):
+                # Replace the claim, so that other ranks go on waiting.
+                tmpfile = claimfile + '.' + str(os.getpid()) + '.tmp'
+                with open(tmpfile, 'w') as f:
+                    json.dump(_claimant(), f)
+                os.replace(tmpfile, claimfile)
+                return None
+            time.sleep(self.poll_interval)
+
+    def _abandoned(self, claim, since):
+        """
+        Whether a claim is too old, or its claimant died on this host.
+        """
+        claimed = claim.get('time', since)
+        if self.timeout is not None and time.time() - claimed >= self.timeout:
+            return True
+        local = claim.get('host') == socket.gethostname()
+        return local and not _alive(claim['pid'])
+
+    def _read(self, resultfile):
+        """
+        Cached objective value, or None if the point has not been evaluated.
+        """
+        try:
+            with open(resultfile) as f:
+                return json.load(f)['y']
+        except FileNotFoundError:
+            return None
+
+    def _write(self, resultfile, x, value):
+        """
+        Write a result atomically, so waiting ranks never read a partial file.
+        """
+        tmpfile = resultfile + '.' + str(os.getpid()) + '.tmp'
+        with open(tmpfile, 'w') as f:
+            json.dump({'x': [_to_python(v) for v in x], 'y': float(value)}, f)
+        os.replace(tmpfile, resultfile)
+
+
+def _claimant():
+    """
+    Host, pid and time identifying a claim.
+    """
+    return {'host': socket.gethostname(), 'pid': os.getpid(),
+            'time': time.time()}
+
+
+def _read_claim(claimfile):
+    """
+    Contents of a claim, or None if there is no claim.
+    """
+    try:
+        with open(claimfile) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        # Claimed, but not written yet.
+        return {}
+
+
+def _alive(pid):
+    """
+    Whether a process is running on this host.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class PersistentMemo(object):
+    """
+    Remember objective values across runs and restarts.
+
+    Wraps an objective with a sqlite store on local disk. Points are keyed by
+    `point_key`, which does not depend on the bounds of the search space, so a
+    study restarted with different bounds reuses every evaluation still inside
+    them.
+
+    sqlite locking is only reliable on local file systems: give each node its
+    own `cache_path`, or use `SharedEvaluationCache` to share values between
+    nodes.
+
+    `hits` and `misses` are counted by the instance that is called: a copy
+    pickled into a worker process counts its own, which the original never
+    sees.
+
+    Example usage:
+        objective = PersistentMemo(objective, "./memo.sqlite",
+                                   Space(hyperparameters))
+        ... run the optimization ...
+        print(objective.hits, objective.misses)
+        objective.close()
+
+    Parameters
+    ----------
+    * `objective` [function]:
+        Objective to be memoized. Called only on a miss.
+
+    * `cache_path` [str]:
+        Path to the sqlite file. Created if missing.
+
+    * `space` [skopt.space.Space]:
+        Undivided search space, used to canonicalize points.
+
+    * `tolerance` [float, default=1e-8]:
+        Real values within a relative `tolerance` of each other are the same
+        configuration.
+
+    * `max_entries` [int, default=None]:
+        Number of values kept. The least recently used are evicted first.
+        - By default, keep every value.
+    """
+    def __init__(self, objective, cache_path, space, tolerance=1e-8,
+                 max_entries=None):
+        if max_entries is not None and max_entries < 1:
+            raise ValueError(f'max_entries must be >= 1. Got {max_entries}')
+
+        self.objective = objective
+        self.cache_path = cache_path
+        self.space = space
+        self.tolerance = tolerance
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._connection = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Connections cannot be pickled; each process opens its own.
+        state = self.__dict__.copy()
+        state['_connection'] = None
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __call__(self, x):
+        """
+        Parameters
+        ----------
+        * `x` [list, shape=(n_dims,)]:
+            Point to evaluate.
+        """
+        key = point_key(x, self.space, self.tolerance)
+
+        with self._lock, self._connect() as connection:
+            row = connection.execute(
+                'SELECT y FROM evaluations WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                connection.execute(
+                    'UPDATE evaluations SET used = ? WHERE key = ?',
+                    (time.time(), key))
+        if row is not None:
+            self.hits += 1
+            return row[0]
+
+        self.misses += 1
+        value = self.objective(x)
+        record = json.dumps([_to_python(v) for v in x])
+
+        with self._lock, self._connect() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?)',
+                (key, record, float(value), time.time()))
+            if self.max_entries is not None:
+                connection.execute(
+                    'DELETE FROM evaluations WHERE key IN '
+                    '(SELECT key FROM evaluations ORDER BY used DESC '
+                    'LIMIT -1 OFFSET ?)', (self.max_entries,)
+                )
+        return value
+
+    def close(self):
+        """
+        Close the connection to the sqlite file.
+        """
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self):
+        """
+        Open the sqlite file on first use. Called with the lock held.
+        """
+        if self._connection is None:
+            # Ranks on the same node may write concurrently; wait for their
+            # locks.
+            self._connection = sqlite3.connect(self.cache_path, timeout=60,
+                                               check_same_thread=False)
+            with self._connection:
+                self._connection.execute(
+                    'CREATE TABLE IF NOT EXISTS evaluations '
+                    '(key TEXT PRIMARY KEY, x TEXT, y REAL, used REAL)'
+                )
+        return self._connection
@@ -1,15 +1,30 @@
 import os
 import re
 import json
+import time
+import numbers
 import itertools
 
 import pickle
+from concurrent.futures import ProcessPoolExecutor
+
 from skopt import load
+from skopt.space import Integer
+from skopt.space import Categorical
 
 import numpy as np
 from scipy.optimize import OptimizeResult
 
 
+# Files written next to results that are not results themselves.
+_LOG_SUFFIX = '.log'
+_COLLECTIVE_SUFFIX = '.ckpt'
+_SIDECAR_SUFFIXES = (_LOG_SUFFIX, _COLLECTIVE_SUFFIX, '.tmp')
+MANIFEST = 'manifest.json'
+STORE_META = 'store.json'
+JSON_LINES_SUFFIX = '.jsonl'
+
+
 def _load_checkpoint(results_path, rank):
     """
     Loads checkpoint to resume optimization.
@@ -20,17 +35,81 @@ def _load_checkpoint(results_path, rank):
     * `rank` [int]
         Rank to which the saved results belong.
     """
-    files = _listfiles(results_path)
-    for file in files:
+    # Logs are replayed on top of their snapshot, which may not exist yet.
+    files = set(_listfiles(results_path))
+    for file in os.listdir(results_path):
+        if file.endswith(_LOG_SUFFIX):
+            files.add(file[:-len(_LOG_SUFFIX)])
+
+    for file in sorted(files):
         saved_rank = re.findall(r'\d+', file)
-        if rank == int(saved_rank[0]):
-            filepath = os.path.join(results_path, file)
-            checkpoint = load(str(filepath))
+        if saved_rank and rank == int(saved_rank[0]):
             print(f'loading checkpoint for rank {int(saved_rank[0])}')
-            return checkpoint
+            return _load_checkpoint_file(os.path.join(results_path, file))
+
+
+def _load_checkpoint_file(filepath):
+    """
+    Loads a checkpoint and replays its log, or None if neither exists.
+
+    * `filepath` [str]
+        Path to the checkpoint, as written by `CheckpointSaver` or
+        `LogCheckpointSaver`.
+    """
+    if os.path.exists(filepath):
+        checkpoint = load(str(filepath))
+    else:
+        checkpoint = None
+    return _replay_log(checkpoint, filepath + _LOG_SUFFIX)
+
+
+def _replay_log(checkpoint, logfile):
+    """
+    Adds the evaluations recorded by `LogCheckpointSaver` to a checkpoint.
 
+    Parameters
+    ----------
+    * `checkpoint` [`OptimizeResult`, scipy object, or None]
+        Snapshot the log was written against.
+
+    * `logfile` [str]
+        Path to the log.
+
+    Returns
+    -------
+    * `checkpoint` [`OptimizeResult`, scipy object, or None]
+    """
+    if not os.path.exists(logfile):
+        return checkpoint
 
-def load_results(results_path, sort=False, reverse_sort=False):
+    if checkpoint is None:
+        x_iters, func_vals, space = [], [], None
+    else:
+        x_iters = [list(x) for x in checkpoint.x_iters]
+        func_vals = list(checkpoint.func_vals)
+        space = getattr(checkpoint, 'space', None)
+
+    n_snapshot = len(x_iters)
+    with open(logfile, 'rb') as log:
+        while True:
+            try:
+                index, x, y = pickle.load(log)
+            except (EOFError, pickle.UnpicklingError, ValueError):
+                # A crash mid-append leaves a truncated last record.
+                break
+            # Records already in the snapshot are skipped.
+            if index == len(x_iters):
+                x_iters.append(x)
+                func_vals.append(y)
+
+    if len(x_iters) == n_snapshot:
+        return checkpoint
+
+    return create_result(x_iters, func_vals, space=space)
+
+
+def load_results(results_path, sort=False, reverse_sort=False, top_k=None,
+                 summary=False, workers=None, lazy=False, columnar=False):
     """
     Loads results from distributed run with Scikit-Optimize.
 
@@ -46,20 +125,54 @@ def load_results(results_path, sort=False, reverse_sort=False):
         Sort results by objective function minimum (highest first.)
         - `sort` must be set to True.
 
+    * `top_k` [int, default=None]
+        Only load the `top_k` results with the lowest minimum, sorted.
+        - Picked from the manifest, so no other result is loaded.
+
+    * `summary` [Bool, default=False]
+        Only return the manifest entries: rank, file, fun, x,
+        n_evaluations and last updated time. No result is loaded.
+
+    * `workers` [int, default=None]
+        Number of processes loading results in parallel.
+
+    * `lazy` [Bool, default=False]
+        Return `LazyResult` proxies that only load a result once an
+        attribute other than `fun` or `x` is accessed.
+        - `fun` and `x` come from the manifest, if there is one.
+
+    * `columnar` [Bool, default=False]
+        `results_path` is a store written by `consolidate_results`.
+        - `func_vals` and `x_columns`, one per hyperparameter, are
+          views into the memory mapped store. Nothing is unpickled.
+
     Returns
     -------
     * results [list]
     """
-    files = _listfiles(results_path)
+    if columnar:
+        results = _store_results(load_store(results_path))
+        if reverse_sort and not sort:
+            sort = True
+        if sort or top_k is not None:
+            results = sorted(results, key=lambda result: result.fun)
+        if top_k is not None:
+            results = results[:top_k]
+        return results
+
+    if top_k is not None or summary:
+        entries = _select_entries(results_path, sort, top_k,
+                                  json_results=False)
+        if summary:
+            return [OptimizeResult(entry) for entry in entries]
+        paths = [os.path.join(results_path, entry['file'])
+                 for entry in entries]
+        return _load_files(paths, _load_skopt, workers, lazy, entries)
 
-    ranks = []
-    results = []
-    for file in files:
-        rank = re.findall(r'\d+', file)
-        rank = int(rank[0])
-        ranks.append(rank)
-        full_path = os.path.join(results_path, file)
-        results.append(load(str(full_path)))
+    files = _listfiles(results_path)
+    paths = [os.path.join(results_path, file) for file in files]
+    results = _load_files(paths, _load_skopt, workers, lazy,
+                          _lazy_entries(results_path, lazy))
 
     if reverse_sort and not sort:
         sort = True
@@ -70,7 +183,7 @@ def load_results(results_path, sort=False, reverse_sort=False):
     return results
 
 
-def load_roboresults(results_path, sort=False):
+def load_roboresults(results_path, sort=False, workers=None, lazy=False):
     """
     Loads results from distributed run with RoBO.
 
@@ -82,23 +195,24 @@ def load_roboresults(results_path, sort=False):
     * `sort` [Bool, default=False]
         Sorts results by objective function minimum (lowest first).
 
+    * `workers` [int, default=None]
+        Number of processes loading results in parallel.
+
+    * `lazy` [Bool, default=False]
+        Return `LazyResult` proxies that only load a result once one
+        of its attributes is accessed.
+
     Returns
     -------
     * results [list]
     """
     spacenames = _listfiles(results_path)
-
-    results = []
-    for file in spacenames:
-        filepath = os.path.join(results_path, file)
-        with open(filepath, 'rb') as handle:
-            result = pickle.load(handle)
-            results.append(result)
+    paths = [os.path.join(results_path, file) for file in spacenames]
+    results = _load_files(paths, _load_robo, workers, lazy)
 
     if sort:
-        results = sorted(results, key=lambda result: result['f_opt'])
+        results = sorted(results, key=lambda result: result.fun)
 
-    results = convert_roboresults(results)
     return results
 
 
@@ -114,7 +228,8 @@ def _listfiles(results_path):
     files = []
     for file in os.listdir(results_path):
         # Sort files by MPI rank: used for checkpointing.
-        files.append(file)
+        if not file.endswith(_SIDECAR_SUFFIXES) and file != MANIFEST:
+            files.append(file)
 
     files = sorted(files)
     return files
@@ -265,7 +380,9 @@ def create_result(Xi, yi, n_evaluations=None, space=None, rng=None, specs=None,
     return res
 
 
-def load_json_results(results_path, sort=False, reverse_sort=False):
+def load_json_results(results_path, sort=False, reverse_sort=False,
+                      top_k=None, summary=False, workers=None, lazy=False,
+                      stream=False):
     """
     Loads results from distributed run with Scikit-Optimize.
     
@@ -280,26 +397,57 @@ def load_json_results(results_path, sort=False, reverse_sort=False):
     * `reverse_sort` [Bool, defaul=False]
         Sort results by objective function minimum (highest first.)
         - `sort` must be set to True.
+
+    * `top_k` [int, default=None]
+        Only load the `top_k` results with the lowest minimum, sorted.
+        - Picked from the manifest, so no other result is loaded.
+
+    * `summary` [Bool, default=False]
+        Only return the manifest entries: rank, file, fun, x,
+        n_evaluations and last updated time. No result is loaded.
+
+    * `workers` [int, default=None]
+        Number of processes loading results in parallel.
+
+    * `lazy` [Bool, default=False]
+        Return `LazyResult` proxies that only load a result once an
+        attribute other than `fun` or `x` is accessed.
+        - `fun` and `x` come from the manifest, if there is one.
+
+    * `stream` [Bool, default=False]
+        Return a generator yielding one result at a time.
+        - Results saved in JSON lines mode are read in a single pass: they
+          hold `x`, `fun` and `n_evaluations`, and `records()` streams
+          their evaluations again from disk, so memory stays bounded.
+        - Cannot be combined with sorting.
         
     Returns
     -------
-    * results [list]
+    * results [list, or generator if `stream`]
     """
-    files = _listfiles(results_path)
+    if stream:
+        if sort or reverse_sort or top_k is not None:
+            raise ValueError('Streamed results cannot be sorted.')
+        return _stream_json_results(results_path)
+
+    if top_k is not None or summary:
+        entries = _select_entries(results_path, sort, top_k, json_results=True)
+        if summary:
+            return [OptimizeResult(entry) for entry in entries]
+        paths = [os.path.join(results_path, entry['file'])
+                 for entry in entries]
+        return _load_files(paths, _load_json, workers, lazy, entries)
 
-    results = []
-    for file in files:
-        savefile = os.path.join(results_path, file)
-        with open(savefile, 'r') as infile:
-            results.append(json.load(infile))
+    files = _listfiles(results_path)
+    paths = [os.path.join(results_path, file) for file in files]
+    results = _load_files(paths, _load_json, workers, lazy,
+                          _lazy_entries(results_path, lazy))
             
     if reverse_sort and not sort:
         sort = True
 
     if sort:
-        results = sorted(results, key=lambda result: result['fun'])
-        
-    results = _convert_json_results(results)
+        results = sorted(results, key=lambda result: result.fun)
 
     return results
 
@@ -331,4 +479,570 @@ def _convert_json(result):
 
 def _convert_json_results(results):
     """Convert all json results to  scipy.OptimizeResults."""
-    return [_convert_json(x) for x in results]
\ No newline at end of file
+    return [_convert_json(x) for x in results]
+
+
+def _encode_points(points, space):
+    """
+    Pack points into a float64 array for MPI buffers.
+
+    Categorical values are stored as their index in the categories of `space`.
+
+    Parameters
+    ----------
+    * `points` [list of lists, shape=(n_points, n_dims)]
+        Points to encode.
+
+    * `space` [skopt.space.Space]
+        Search space containing every point, usually the undivided space.
+
+    Returns
+    -------
+    * `encoded` [np.array, shape=(n_points, n_dims)]
+    """
+    encoded = np.empty((len(points), space.n_dims), dtype=np.float64)
+    for col, dim in enumerate(space.dimensions):
+        if isinstance(dim, Categorical):
+            index = {category: i for i, category in enumerate(dim.categories)}
+            encoded[:, col] = [index[point[col]] for point in points]
+        else:
+            encoded[:, col] = [point[col] for point in points]
+
+    return encoded
+
+
+def _decode_points(encoded, space):
+    """
+    Unpack points encoded with `_encode_points`.
+
+    Parameters
+    ----------
+    * `encoded` [np.array, shape=(n_points, n_dims)]
+        Encoded points.
+
+    * `space` [skopt.space.Space]
+        Search space the points were encoded with.
+
+    Returns
+    -------
+    * `points` [list of lists, shape=(n_points, n_dims)]
+    """
+    columns = []
+    for col, dim in enumerate(space.dimensions):
+        if isinstance(dim, Categorical):
+            columns.append([dim.categories[int(i)] for i in encoded[:, col]])
+        elif isinstance(dim, Integer):
+            columns.append([int(round(value)) for value in encoded[:, col]])
+        else:
+            columns.append([float(value) for value in encoded[:, col]])
+
+    return [list(point) for point in zip(*columns)]
+
+
+def _to_python(value):
+    """Convert a numpy scalar to the matching python type for JSON."""
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    elif isinstance(value, numbers.Real):
+        return float(value)
+    return value
+
+
+def savefile_name(index):
+    """
+    Name of the result file for a hyperspace.
+
+    Parameters
+    ----------
+    * `index` [int]
+        Index of the hyperspace.
+    """
+    if index < 10:
+        # Ensure results are sorted by rank
+        return 'hyperspace' + str(0) + str(index)
+    return 'hyperspace' + str(index)
+
+
+def manifest_entry(rank, file, result):
+    """
+    Summarize a result for the manifest.
+
+    Parameters
+    ----------
+    * `rank` [int]
+        Hyperspace the result belongs to.
+
+    * `file` [str]
+        Name of the result file, relative to the results path.
+
+    * `result` [`OptimizeResult`, scipy object]
+        Result of the optimization.
+
+    Returns
+    -------
+    * `entry` [dict]
+        rank, file, fun, x, n_evaluations and last updated time.
+    """
+    return {
+        'rank': int(rank),
+        'file': file,
+        'fun': float(result.fun),
+        'x': [_to_python(value) for value in result.x],
+        'n_evaluations': len(result.func_vals),
+        'updated': time.time()
+    }
+
+
+def write_manifest(results_path, entries):
+    """
+    Merge entries into the manifest of a results path.
+
+    Entries replace earlier ones for the same file. The manifest is written
+    to a temporary file and renamed, so readers never see a partial one.
+
+    Parameters
+    ----------
+    * `results_path` [str]
+        Path where results from the distributed run is stored.
+
+    * `entries` [list of dicts]
+        Entries created with `manifest_entry`.
+    """
+    manifest = {entry['file']: entry
+                for entry in load_manifest(results_path) or []}
+    for entry in entries:
+        manifest[entry['file']] = entry
+
+    entries = sorted(manifest.values(), key=lambda entry: entry['rank'])
+    savefile = os.path.join(results_path, MANIFEST)
+    with open(savefile + '.tmp', 'w') as outfile:
+        json.dump(entries, outfile)
+    os.replace(savefile + '.tmp', savefile)
+
+
+def load_manifest(results_path):
+    """
+    Loads the manifest of a results path.
+
+    Parameters
+    ----------
+    * `results_path` [str]
+        Path where results from the distributed run is stored.
+
+    Returns
+    -------
+    * `entries` [list of dicts, or None]
+        None if there is no manifest.
+    """
+    savefile = os.path.join(results_path, MANIFEST)
+    if not os.path.exists(savefile):
+        return None
+
+    with open(savefile, 'r') as infile:
+        return json.load(infile)
+
+
+def build_manifest(results_path, json_results=False):
+    """
+    Write a manifest for results saved without one.
+
+    Loads every result once, e.g. for results saved by `JsonCheckpointSaver`.
+
+    Parameters
+    ----------
+    * `results_path` [str]
+        Path where results from the distributed run is stored.
+
+    * `json_results` [Bool, default=False]
+        Whether the results were saved in JSON format.
+    """
+    entries = []
+    for file in _listfiles(results_path):
+        savefile = os.path.join(results_path, file)
+        if json_results:
+            result = _load_json(savefile)
+        else:
+            result = load(savefile)
+        rank = int(re.findall(r'\d+', file)[0])
+        entries.append(manifest_entry(rank, file, result))
+
+    write_manifest(results_path, entries)
+
+
+def _select_entries(results_path, sort, top_k, json_results):
+    """
+    Manifest entries, sorted by minimum or limited to the `top_k` lowest.
+
+    Builds the manifest first if the results path has none.
+    """
+    entries = load_manifest(results_path)
+    if entries is None:
+        build_manifest(results_path, json_results=json_results)
+        entries = load_manifest(results_path)
+
+    if sort or top_k is not None:
+        entries = sorted(entries, key=lambda entry: entry['fun'])
+
+    if top_k is not None:
+        entries = entries[:top_k]
+
+    return entries
+
+
+class LazyResult(object):
+    """
+    Stands in for a saved result until it is needed.
+
+    `fun` and `x` are answered from the manifest when known. Any other
+    attribute loads the full result, models and all, once.
+
+    Parameters
+    ----------
+    * `path` [str]
+        Path to the saved result.
+
+    * `loader` [callable]
+        Called as `loader(path)` to load the result.
+
+    * `fun` [float, optional]
+        Known minimum of the result.
+
+    * `x` [list, optional]
+        Known location of the minimum.
+    """
+    def __init__(self, path, loader, fun=None, x=None):
+        self.path = path
+        self.loader = loader
+        self._result = None
+        self._summary = {}
+        if fun is not None:
+            self._summary['fun'] = fun
+        if x is not None:
+            self._summary['x'] = x
+
+    def __getattr__(self, name):
+        # Only reached for attributes the proxy does not have itself.
+        if name.startswith('_') or name in ('path', 'loader'):
+            raise AttributeError(name)
+        if name in self._summary:
+            return self._summary[name]
+        return getattr(self.load(), name)
+
+    def __getitem__(self, key):
+        if key in self._summary:
+            return self._summary[key]
+        return self.load()[key]
+
+    def __repr__(self):
+        state = 'loaded' if self._result is not None else 'not loaded'
+        return "LazyResult(path={}, {})".format(self.path, state)
+
+    def load(self):
+        """
+        Load the full result, once.
+
+        Returns
+        -------
+        * `result` [`OptimizeResult`, scipy object]
+        """
+        if self._result is None:
+            self._result = self.loader(self.path)
+        return self._result
+
+
+def _load_skopt(path):
+    return load(str(path))
+
+
+def _load_json(path):
+    if path.endswith(JSON_LINES_SUFFIX):
+        x_iters, func_vals = [], []
+        for x, y in iter_json_records(path):
+            x_iters.append(x)
+            func_vals.append(y)
+        # Same types as a result saved in a single JSON document.
+        best = int(np.argmin(func_vals))
+        return _convert_json({'x': x_iters[best], 'fun': func_vals[best],
+                              'func_vals': func_vals, 'x_iters': x_iters})
+
+    with open(path, 'r') as infile:
+        return _convert_json(json.load(infile))
+
+
+def iter_json_records(savefile):
+    """
+    Stream the evaluations saved by `JsonCheckpointSaver` in JSON lines mode.
+
+    Parameters
+    ----------
+    * `savefile` [str]
+        Path to the ".jsonl" file.
+
+    Yields
+    ------
+    * `(x, y)` [tuple]
+        Point evaluated and its objective value.
+    """
+    with open(savefile, 'r') as infile:
+        for line in infile:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A crash mid-append leaves a truncated last line.
+                break
+            yield record['x'], record['y']
+
+
+def _stream_json_results(results_path):
+    """
+    Yield JSON results one at a time, see `load_json_results`.
+    """
+    for file in _listfiles(results_path):
+        savefile = os.path.join(results_path, file)
+        if not savefile.endswith(JSON_LINES_SUFFIX):
+            yield _load_json(savefile)
+            continue
+
+        fun, x, n_evaluations = None, None, 0
+        for x_iter, y in iter_json_records(savefile):
+            n_evaluations += 1
+            if fun is None or y < fun:
+                fun, x = y, x_iter
+
+        yield OptimizeResult(
+            x=x,
+            fun=fun,
+            n_evaluations=n_evaluations,
+            records=lambda savefile=savefile: iter_json_records(savefile)
+        )
+
+
+def _load_robo(path):
+    with open(path, 'rb') as handle:
+        return _convert_robo(pickle.load(handle))
+
+
+def _lazy_entries(results_path, lazy):
+    """Manifest entries used to answer `fun` and `x` for lazy results."""
+    if not lazy:
+        return None
+    return load_manifest(results_path)
+
+
+def _load_files(paths, loader, workers=None, lazy=False, entries=None):
+    """
+    Load results one by one, in a process pool, or as lazy proxies.
+
+    Parameters
+    ----------
+    * `paths` [list of str]
+        Paths to the saved results.
+
+    * `loader` [callable]
+        Module level function called as `loader(path)`.
+
+    * `workers` [int, default=None]
+        Number of processes loading results in parallel.
+
+    * `lazy` [Bool, default=False]
+        Return `LazyResult` proxies instead of results.
+
+    * `entries` [list of dicts, optional]
+        Manifest entries giving `fun` and `x` to lazy proxies.
+    """
+    if lazy:
+        known = {entry['file']: entry for entry in entries or []}
+        results = []
+        for path in paths:
+            entry = known.get(os.path.basename(path), {})
+            results.append(LazyResult(path, loader, fun=entry.get('fun'),
+                                      x=entry.get('x')))
+        return results
+
+    if workers and workers > 1 and len(paths) > 1:
+        chunksize = max(1, len(paths) // (4 * workers))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(loader, paths, chunksize=chunksize))
+
+    return [loader(path) for path in paths]
+
+
+def consolidate_results(results_path, store_path, json_results=False,
+                        workers=None):
+    """
+    Write every evaluation of a run into one columnar store.
+
+    The store holds one `.npy` array per hyperparameter, `x0.npy`, `x1.npy`,
+    ..., along with `func_vals.npy`, `rank.npy` and `iteration.npy`. Rows are
+    grouped by rank. Categorical hyperparameters are stored as int64 codes,
+    with their categories listed in `store.json`. Load it with `load_store`.
+
+    Parameters
+    ----------
+    * `results_path` [str]
+        Path where results from the distributed run is stored.
+
+    * `store_path` [str]
+        Directory to write the store to. Created if needed.
+
+    * `json_results` [Bool, default=False]
+        Whether the results were saved in JSON format.
+
+    * `workers` [int, default=None]
+        Number of processes loading results in parallel.
+    """
+    loader = _load_json if json_results else _load_skopt
+    files = _listfiles(results_path)
+    paths = [os.path.join(results_path, file) for file in files]
+    results = _load_files(paths, loader, workers)
+
+    ranks = [int(re.findall(r'\d+', file)[0]) for file in files]
+    lengths = [len(result.func_vals) for result in results]
+    x_iters = [x for result in results for x in result.x_iters]
+    n_dims = len(x_iters[0]) if x_iters else 0
+
+    os.makedirs(store_path, exist_ok=True)
+    columns = []
+    for col in range(n_dims):
+        values = [x[col] for x in x_iters]
+        name = f'x{col}'
+        if all(isinstance(value, numbers.Integral) for value in values):
+            column = np.asarray(values, dtype=np.int64)
+            meta = {'name': name, 'kind': 'integer'}
+        elif all(isinstance(value, numbers.Real) for value in values):
+            column = np.asarray(values, dtype=np.float64)
+            meta = {'name': name, 'kind': 'real'}
+        else:
+            categories = sorted(set(values), key=str)
+            codes = {category: code
+                     for code, category in enumerate(categories)}
+            column = np.asarray([codes[value] for value in values],
+                                dtype=np.int64)
+            meta = {'name': name, 'kind': 'categorical',
+                    'categories': [_to_python(category)
+                                   for category in categories]}
+        np.save(os.path.join(store_path, name + '.npy'), column)
+        columns.append(meta)
+
+    func_vals = np.empty(sum(lengths), dtype=np.float64)
+    iteration = np.empty(sum(lengths), dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    offsets = offsets.astype(np.int64).tolist()
+    for result, start, stop in zip(results, offsets[:-1], offsets[1:]):
+        func_vals[start:stop] = result.func_vals
+        iteration[start:stop] = np.arange(stop - start)
+    rank = np.repeat(np.asarray(ranks, dtype=np.int64), lengths)
+
+    np.save(os.path.join(store_path, 'func_vals.npy'), func_vals)
+    np.save(os.path.join(store_path, 'rank.npy'), rank)
+    np.save(os.path.join(store_path, 'iteration.npy'), iteration)
+
+    meta = {
+        'n_evaluations': int(sum(lengths)),
+        'columns': columns,
+        'ranks': [{'rank': r, 'file': file, 'start': int(start),
+                   'stop': int(stop)}
+                  for r, file, start, stop
+                  in zip(ranks, files, offsets[:-1], offsets[1:])]
+    }
+    with open(os.path.join(store_path, STORE_META), 'w') as outfile:
+        json.dump(meta, outfile)
+
+
+def load_store(store_path, mmap_mode='r'):
+    """
+    Memory map a store written by `consolidate_results`.
+
+    Parameters
+    ----------
+    * `store_path` [str]
+        Directory of the store.
+
+    * `mmap_mode` [str or None, default='r']
+        Passed on to `np.load`. None reads the arrays into memory.
+
+    Returns
+    -------
+    * `store` [dict]
+        - `func_vals`, `rank`, `iteration`: one entry per evaluation.
+        - `x_columns`: one array per hyperparameter.
+        - `meta`: contents of `store.json`, including the categories
+          of categorical hyperparameters.
+    """
+    with open(os.path.join(store_path, STORE_META), 'r') as infile:
+        meta = json.load(infile)
+
+    def column(name):
+        return np.load(os.path.join(store_path, name + '.npy'),
+                       mmap_mode=mmap_mode)
+
+    return {
+        'func_vals': column('func_vals'),
+        'rank': column('rank'),
+        'iteration': column('iteration'),
+        'x_columns': [column(col['name']) for col in meta['columns']],
+        'meta': meta
+    }
+
+
+def _store_results(store):
+    """
+    One `OptimizeResult` per rank, holding views into a loaded store.
+    """
+    columns = store['meta']['columns']
+    results = []
+    for entry in store['meta']['ranks']:
+        start, stop = entry['start'], entry['stop']
+        if start == stop:
+            continue
+        func_vals = store['func_vals'][start:stop]
+        x_columns = [x_column[start:stop] for x_column in store['x_columns']]
+
+        best = int(np.argmin(func_vals))
+        x = []
+        for col, x_column in zip(columns, x_columns):
+            if col['kind'] == 'categorical':
+                x.append(col['categories'][int(x_column[best])])
+            else:
+                x.append(x_column[best].item())
+
+        results.append(OptimizeResult(
+            x=x,
+            fun=float(func_vals[best]),
+            func_vals=func_vals,
+            x_columns=x_columns,
+            rank=entry['rank']
+        ))
+
+    return results
+
+
+def _kept_models(models, keep_models):
+    """
+    Surrogate models retained under a `keep_models` policy.
+
+    Parameters
+    ----------
+    * `models` [list]
+        Fitted surrogate models, oldest first.
+
+    * `keep_models` [str or int]
+        - "all": keep every model.
+        - "none": keep no model.
+        - int N: keep the last N models.
+
+    Returns
+    -------
+    * `models` [list]
+    """
+    if keep_models == "all":
+        return list(models)
+    elif keep_models == "none":
+        return []
+    elif isinstance(keep_models, numbers.Integral) and keep_models >= 0:
+        if not keep_models:
+            return []
+        return list(models[max(len(models) - keep_models, 0):])
+    else:
+        raise ValueError("Invalid keep_models {}. Expected \"all\", \"none\" "
+                         "or an int >= 0.".format(keep_models))
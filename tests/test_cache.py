@@ -0,0 +1,131 @@
+"""Tests for `hyperspace.utils.cache`."""
+
+import json
+import os
+import pickle
+import socket
+import subprocess
+import sys
+import time
+
+from skopt.space import Space
+
+from hyperspace.utils.cache import PersistentMemo
+from hyperspace.utils.cache import SharedEvaluationCache
+from hyperspace.utils.cache import point_key
+
+
+SPACE = Space([(0.0, 1.0)])
+
+
+def test_point_key_tolerance_is_relative():
+    space = Space([(1e-10, 1e-1, "log-uniform"), (-5.0, 5.0)])
+    assert point_key([1e-9, 0.0], space) != point_key([2e-9, 0.0], space)
+    close = [1e-9 * (1 + 1e-10), 1.0]
+    assert point_key([1e-9, 1.0], space) == point_key(close, space)
+    assert point_key([1e-9, 1.0], space) != point_key([1e-9, -1.0], space)
+
+
+def test_point_key_rounds_integers():
+    space = Space([(0, 10), ("a", "b", "c")])
+    assert point_key([3, "b"], space) == point_key([3.0000001, "b"], space)
+    assert point_key([3, "b"], space) != point_key([3, "c"], space)
+
+
+def write_claim(cache, x, **claim):
+    claimfile = os.path.join(cache.cache_path,
+                             point_key(x, cache.space) + '.claim')
+    with open(claimfile, 'w') as f:
+        json.dump(claim, f)
+    return claimfile
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def test_claims_record_the_claimant(tmp_path):
+    cache = SharedEvaluationCache(lambda x: x[0], str(tmp_path), SPACE)
+    assert cache([0.5]) == 0.5
+    claimfile = os.path.join(str(tmp_path),
+                             point_key([0.5], SPACE) + '.claim')
+    with open(claimfile) as f:
+        claim = json.load(f)
+    assert claim['host'] == socket.gethostname()
+    assert claim['pid'] == os.getpid()
+
+
+def test_claims_of_dead_ranks_are_abandoned(tmp_path):
+    cache = SharedEvaluationCache(lambda x: x[0], str(tmp_path), SPACE,
+                                  timeout=None, poll_interval=0.01)
+    write_claim(cache, [0.5], host=socket.gethostname(), pid=dead_pid(),
+                time=time.time())
+    assert cache([0.5]) == 0.5
+    assert cache.misses == 1
+
+
+def test_old_claims_are_abandoned(tmp_path):
+    cache = SharedEvaluationCache(lambda x: x[0], str(tmp_path), SPACE,
+                                  timeout=60, poll_interval=0.01)
+    claimfile = write_claim(cache, [0.5], host='elsewhere', pid=1,
+                            time=time.time() - 120)
+    assert cache([0.5]) == 0.5
+    assert cache.misses == 1
+    # The claim was taken over.
+    with open(claimfile) as f:
+        assert json.load(f)['pid'] == os.getpid()
+
+
+def test_live_claims_are_waited_on(tmp_path):
+    cache = SharedEvaluationCache(lambda x: x[0], str(tmp_path), SPACE,
+                                  timeout=0.2, poll_interval=0.01)
+    write_claim(cache, [0.5], host='elsewhere', pid=1, time=time.time())
+    start = time.monotonic()
+    assert cache([0.5]) == 0.5
+    assert time.monotonic() - start >= 0.2
+    assert cache.misses == 1
+
+
+def counting(calls):
+    def objective(x):
+        calls.append(x)
+        return x[0] * 2
+    return objective
+
+
+def double(x):
+    return x[0] * 2
+
+
+def test_memo_remembers_values_across_runs(tmp_path):
+    path = str(tmp_path / 'memo.sqlite')
+    memo = PersistentMemo(double, path, SPACE)
+    assert memo([0.25]) == 0.5
+    assert memo([0.25 * (1 + 1e-12)]) == 0.5
+    assert (memo.hits, memo.misses) == (1, 1)
+    memo.close()
+
+    # A restarted run with other bounds, pickled into a worker process.
+    memo = PersistentMemo(double, path, Space([(0.0, 2.0)]))
+    memo = pickle.loads(pickle.dumps(memo))
+    assert memo([0.25]) == 0.5
+    assert memo([1.5]) == 3.0
+    memo.close()
+    assert (memo.hits, memo.misses) == (1, 1)
+
+
+def test_memo_evicts_the_least_recently_used(tmp_path):
+    calls = []
+    memo = PersistentMemo(counting(calls), str(tmp_path / 'memo.sqlite'),
+                          SPACE, max_entries=2)
+    memo([0.1])
+    memo([0.2])
+    memo([0.1])
+    memo([0.3])
+    # 0.2 was evicted, 0.1 was used more recently.
+    memo([0.1])
+    memo([0.2])
+    memo.close()
+    assert calls == [[0.1], [0.2], [0.3], [0.2]]
@@ -0,0 +1,208 @@
+"""Tests for `hyperspace.callbacks`."""
+
+import pytest
+from mpi4py import MPI
+from skopt import Optimizer
+from scipy.optimize import OptimizeResult
+from skopt.space import Space
+
+from hyperspace.callbacks.collective import MPICheckpointSaver
+from hyperspace.callbacks.collective import load_mpi_checkpoint
+from hyperspace.callbacks.halving import SuccessiveHalving
+from hyperspace.callbacks.sharing import ObservationSharer
+from hyperspace.utils.utils import create_result
+
+
+SPACE = Space([(0.0, 1.0)])
+
+multi_rank = pytest.mark.skipif(MPI.COMM_WORLD.Get_size() < 2,
+                                reason="needs several ranks")
+
+
+def rank_points(rank, n):
+    """Distinct points for each rank."""
+    return [[(rank * n + i + 0.5) / (MPI.COMM_WORLD.Get_size() * n)]
+            for i in range(n)]
+
+
+@multi_rank
+def test_sharer_tells_peers_observations_two_rounds_later():
+    comm = MPI.COMM_WORLD
+    optimizer = Optimizer(SPACE.dimensions, "dummy", n_initial_points=1)
+    sharer = ObservationSharer(optimizer, SPACE, 4, every=1, comm=comm)
+    for x in rank_points(comm.Get_rank(), 4):
+        optimizer.tell(x, x[0])
+        sharer(None)
+    sharer.finish()
+
+    # Rounds 0 and 1 were told at rounds 2 and 3. The last two rounds'
+    # observations are never told.
+    expected = [(x, x[0]) for rank in range(comm.Get_size())
+                if rank != comm.Get_rank() for x in rank_points(rank, 4)[:2]]
+    assert sorted(sharer.received) == sorted(expected)
+    assert len(optimizer.Xi) == 4 + len(expected)
+
+
+@multi_rank
+def test_sharer_does_not_wait_for_slower_ranks_each_round():
+    comm = MPI.COMM_WORLD
+    optimizer = Optimizer(SPACE.dimensions, "dummy", n_initial_points=1)
+    sharer = ObservationSharer(optimizer, SPACE, 2, every=1, comm=comm)
+    if comm.Get_rank() == 0:
+        # Round 0 only posts non-blocking counts, so rank 0 gets through it
+        # without the others.
+        optimizer.tell([0.5], 0.5)
+        sharer(None)
+        assert sharer._round == 1
+    comm.Barrier()
+    if comm.Get_rank() != 0:
+        optimizer.tell([0.5], 0.5)
+        sharer(None)
+    sharer.finish()
+
+
+def told_optimizer(x, y):
+    optimizer = Optimizer(SPACE.dimensions, "dummy", n_initial_points=1)
+    optimizer.tell(x, y)
+    return optimizer
+
+
+def test_halving_schedule():
+    optimizer = told_optimizer([0.5], 0.0)
+    halving = SuccessiveHalving(optimizer, 0, 10, every=3,
+                                comm=MPI.COMM_SELF)
+    assert halving.n_rounds == 3
+    for _ in range(10):
+        assert not halving(OptimizeResult(fun=0.0))
+    halving.finish()
+    # A single hyperspace is never stopped.
+    assert halving.stopped == [[], [], []]
+    assert halving.remaining == 0
+
+
+def test_halving_does_not_count_the_reassigned_observations():
+    halving = SuccessiveHalving(told_optimizer([0.5], 0.0), 0, 10, every=3,
+                                comm=MPI.COMM_SELF)
+    halving(OptimizeResult(fun=0.0))
+    halving.follow(told_optimizer([0.5], 0.0))
+    halving(OptimizeResult(fun=0.0))
+    assert halving.remaining == 9
+
+
+@multi_rank
+def test_halving_moves_ranks_to_the_best_hyperspaces():
+    comm = MPI.COMM_WORLD
+    rank, size = comm.Get_rank(), comm.Get_size()
+    points = [[(r + 0.5) / size] for r in range(size)]
+    halving = SuccessiveHalving(told_optimizer(points[rank], float(rank)),
+                                rank, 2, every=1, comm=comm)
+
+    # Lower ranks have the best incumbents.
+    n_stop = min(int(size * 0.5), size - 1)
+    survivors = list(range(size - n_stop))
+    # Freed ranks are spread over the survivors, best first.
+    targets = [r if r in survivors
+               else survivors[(r - len(survivors)) % len(survivors)]
+               for r in range(size)]
+    stop = halving(OptimizeResult(fun=float(rank)))
+    assert halving.stopped == [list(range(size - n_stop, size))]
+    assert stop == (rank not in survivors)
+
+    target = targets[rank]
+    new_point = [points[rank][0] + 0.25 / size]
+    if stop:
+        x0, y0 = halving.reassigned[1:]
+        assert halving.reassigned[0] == target
+        assert (x0, y0) == ([points[target]], [float(target)])
+        optimizer = told_optimizer(x0, y0)
+        halving.follow(optimizer)
+        halving(OptimizeResult(fun=y0[0]))
+    else:
+        optimizer = halving.optimizer
+    optimizer.tell(new_point, float(target))
+    # Stop nothing in the second round.
+    halving.fraction = 0
+    assert not halving(OptimizeResult(fun=float(target)))
+
+    # Ranks on the same hyperspace tell each other their new points.
+    peers = [r for r in range(size) if r != rank and targets[r] == target]
+    expected = [[points[r][0] + 0.25 / size] for r in peers]
+    assert sorted(x for x, _ in halving.received) == sorted(expected)
+
+
+@multi_rank
+def test_halving_without_retired_ranks():
+    comm = MPI.COMM_WORLD
+    rank, size = comm.Get_rank(), comm.Get_size()
+    halving = SuccessiveHalving(told_optimizer([0.5], float(rank)), rank, 1,
+                                every=1, fraction=0.5, comm=comm)
+    if rank == size - 1:
+        # Retires before the first round, and is left out of it.
+        halving.finish()
+    else:
+        halving(OptimizeResult(fun=float(rank)))
+
+    n_searched = size - 1
+    n_stop = min(int(n_searched * 0.5), n_searched - 1)
+    assert halving.stopped == [list(range(n_searched - n_stop, n_searched))]
+
+
+@pytest.fixture
+def checkpoint_path(tmp_path):
+    """Rank 0's temporary directory, shared by every rank."""
+    return MPI.COMM_WORLD.bcast(str(tmp_path), root=0)
+
+
+def points(n):
+    rank = MPI.COMM_WORLD.Get_rank()
+    return [[(rank + i / 10) / MPI.COMM_WORLD.Get_size()] for i in range(n)]
+
+
+def evaluations(n):
+    x_iters = points(n)
+    return create_result(x_iters, [x[0] for x in x_iters])
+
+
+def saved_points(checkpoint):
+    return [list(x) for x in checkpoint.x_iters]
+
+
+def test_mpi_checkpoint_round_trip(checkpoint_path, capsys):
+    saver = MPICheckpointSaver(checkpoint_path, SPACE, capacity=5, n_calls=4)
+    for n in range(1, 5):
+        saver(evaluations(n))
+    saver.close()
+
+    checkpoint = load_mpi_checkpoint(checkpoint_path, SPACE)
+    assert saved_points(checkpoint) == points(4)
+    assert list(checkpoint.func_vals) == [x[0] for x in points(4)]
+    assert capsys.readouterr().out == ""
+
+
+def test_mpi_checkpoint_every(checkpoint_path):
+    saver = MPICheckpointSaver(checkpoint_path, SPACE, capacity=5, n_calls=4,
+                               every=3)
+    saver(evaluations(1))
+    saver(evaluations(2))
+    # Nothing written yet.
+    assert load_mpi_checkpoint(checkpoint_path, SPACE) is None
+    saver(evaluations(3))
+    assert len(load_mpi_checkpoint(checkpoint_path, SPACE).func_vals) == 3
+    saver(evaluations(4))
+    saver.close()
+    assert len(load_mpi_checkpoint(checkpoint_path, SPACE).func_vals) == 4
+
+
+def test_mpi_checkpoint_kept_until_the_first_write(checkpoint_path):
+    saver = MPICheckpointSaver(checkpoint_path, SPACE, capacity=5, n_calls=1)
+    saver(evaluations(2))
+    saver.close()
+
+    # A restart with a larger capacity moves every slot.
+    saver = MPICheckpointSaver(checkpoint_path, SPACE, capacity=9, n_calls=1)
+    checkpoint = load_mpi_checkpoint(checkpoint_path, SPACE)
+    assert saved_points(checkpoint) == points(2)
+    saver(evaluations(3))
+    saver.close()
+    checkpoint = load_mpi_checkpoint(checkpoint_path, SPACE)
+    assert saved_points(checkpoint) == points(3)
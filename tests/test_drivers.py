@@ -0,0 +1,273 @@
+"""Tests for `hyperspace.drivers`."""
+
+import os
+import asyncio
+import threading
+
+import pytest
+from mpi4py import MPI
+
+from hyperspace.drivers.driver import hyperdrive
+from hyperspace.drivers.group import GroupExecutor
+from hyperspace.drivers.group import serve_evaluations
+from hyperspace.drivers.hyperband import hyperband
+from hyperspace.drivers.hyperband import _promote
+from hyperspace.drivers.hyperdriver import HyperDriver
+from hyperspace.utils.utils import load_results
+from hyperspace.utils.utils import _load_checkpoint
+
+
+HYPERPARAMETERS = [(0.0, 1.0), (0, 5)]
+
+
+def quadratic(x):
+    return (x[0] - 0.3)**2 + x[1]
+
+
+def parabola(x):
+    return (x[0] - 0.3)**2
+
+
+@pytest.fixture
+def results_path(tmp_path):
+    """Rank 0's temporary directory, shared by every rank."""
+    return MPI.COMM_WORLD.bcast(str(tmp_path), root=0)
+
+
+@pytest.mark.parametrize("model", ["GP", "RF", "GBRT"])
+@pytest.mark.parametrize("keep_models", ["none", 0])
+def test_keep_no_models_past_the_initial_points(model, keep_models):
+    driver = HyperDriver(HYPERPARAMETERS, model=model, n_initial_points=3,
+                         keep_models=keep_models)
+    result = driver.minimize(quadratic, 8)
+    assert len(result.func_vals) == 8
+    assert result.models == []
+    # The optimizer still needs its newest model to ask for points.
+    assert len(driver.optimizer.models) == 1
+    assert len(result.model_bytes_saved) == 8
+
+
+def test_minimize_evaluates_batches_concurrently():
+    threads = set()
+
+    def objective(x):
+        threads.add(threading.get_ident())
+        return quadratic(x)
+
+    driver = HyperDriver(HYPERPARAMETERS, n_initial_points=3)
+    # The last batch is cut short to stay within n_calls.
+    result = driver.minimize(objective, 8, x0=[[0.5, 1]], batch_size=3)
+    assert len(result.func_vals) == 8
+    assert result.x_iters[0] == [0.5, 1]
+    assert threading.get_ident() not in threads
+
+
+def test_run_awaits_coroutine_objectives():
+    async def objective(x):
+        await asyncio.sleep(0)
+        return quadratic(x)
+
+    driver = HyperDriver(HYPERPARAMETERS, n_initial_points=3)
+    result = asyncio.run(driver.run(objective, 8, n_concurrent=3))
+    assert len(result.func_vals) == 8
+
+
+def test_keep_the_last_models():
+    driver = HyperDriver(HYPERPARAMETERS, n_initial_points=3, keep_models=2)
+    result = driver.minimize(quadratic, 8)
+    assert len(result.models) == 2
+    assert result.models == driver.optimizer.models
+    assert result.models is not driver.optimizer.models
+
+
+@pytest.mark.skipif(MPI.COMM_WORLD.Get_size() < 3,
+                    reason="needs more ranks than hyperspaces")
+def test_spare_ranks_sit_idle(results_path):
+    # One dimension makes two hyperspaces.
+    hyperdrive(parabola, [(0.0, 1.0)], results_path,
+               n_iterations=4, random_state=0)
+    # The manifest is written by rank 0.
+    MPI.COMM_WORLD.Barrier()
+
+    entries = load_results(results_path, summary=True)
+    assert sorted(entry.file for entry in entries) == [
+        'hyperspace00', 'hyperspace01']
+    assert all(entry.n_evaluations == 4 for entry in entries)
+
+
+@pytest.mark.skipif(MPI.COMM_WORLD.Get_size() < 6,
+                    reason="needs more groups than hyperspaces")
+def test_spare_groups_sit_idle(results_path):
+    hyperdrive(parabola, [(0.0, 1.0)], results_path,
+               n_iterations=4, random_state=0, ranks_per_space=2)
+    MPI.COMM_WORLD.Barrier()
+
+    entries = load_results(results_path, summary=True)
+    assert sorted(entry.file for entry in entries) == [
+        'hyperspace00', 'hyperspace01']
+
+
+@pytest.mark.filterwarnings("ignore:Only")
+def test_initial_points_include_the_design(results_path):
+    # Four design points and six random points come before the first fit.
+    hyperdrive(parabola, [(0.0, 1.0)], results_path, n_iterations=12,
+               sampler="lhs", n_samples=4, random_state=0)
+    MPI.COMM_WORLD.Barrier()
+
+    result = load_results(results_path)[0]
+    assert len(result.func_vals) == 12
+    assert len(result.models) == 12 - 10 + 1
+
+
+@pytest.mark.skipif(MPI.COMM_WORLD.Get_size() < 2,
+                    reason="needs several ranks to share observations")
+def test_checkpoints_leave_out_shared_observations(results_path):
+    checkpoints_path = os.path.join(results_path, "checkpoints")
+    if MPI.COMM_WORLD.Get_rank() == 0:
+        os.makedirs(checkpoints_path)
+    MPI.COMM_WORLD.Barrier()
+
+    hyperdrive(parabola, [(0.0, 1.0)], results_path, n_iterations=12,
+               share_every=2, checkpoints_path=checkpoints_path,
+               random_state=0)
+
+    rank = MPI.COMM_WORLD.Get_rank()
+    if rank < 2:
+        checkpoint = _load_checkpoint(checkpoints_path, rank)
+        # Resuming from it does not count other ranks' observations.
+        assert len(checkpoint.func_vals) == 12
+
+
+def counting_objective(calls):
+    def objective(x, resource):
+        calls.append(resource)
+        return (x[0] - 0.3)**2 + 1 / resource
+    return objective
+
+
+@pytest.mark.skipif(MPI.COMM_WORLD.Get_size() > 1,
+                    reason="counts the evaluations of a single rank")
+def test_hyperband_brackets_and_rungs(results_path):
+    calls = []
+    hyperband(counting_objective(calls), [(0.0, 1.0)], results_path,
+              max_resource=9, eta=3)
+    MPI.COMM_WORLD.Barrier()
+
+    # Two hyperspaces, each with 9, 5 and 3 configurations in brackets 2,
+    # 1 and 0. A third of them is promoted at each rung.
+    assert calls == [1] * 18 + [3] * 6 + [9] * 2 + [3] * 10 + [9] * 3 + [9] * 6
+
+    results = load_results(results_path)
+    entries = load_results(results_path, summary=True)
+    assert sorted(entry.file for entry in entries) == [
+        'hyperspace00', 'hyperspace01']
+    for result in results:
+        assert len(result.resources) == len(result.func_vals)
+        full = result.func_vals[result.resources == 9]
+        assert result.fun == min(full)
+
+
+def test_promote_keeps_the_best_configurations():
+    configs = ['a', 'b', 'c', 'd', 'e', 'f']
+    losses = [5.0, 1.0, 4.0, 0.0, 3.0, 2.0]
+    assert _promote(MPI.COMM_SELF, configs, losses, 3) == ['b', 'd']
+    assert _promote(MPI.COMM_SELF, configs[:2], losses[:2], 3) == []
+
+
+@pytest.mark.skipif(MPI.COMM_WORLD.Get_size() < 2,
+                    reason="promotes configurations across ranks")
+def test_promote_across_ranks():
+    comm = MPI.COMM_WORLD
+    rank, size = comm.Get_rank(), comm.Get_size()
+    # Rank 0 has the worst configurations and the last rank the best.
+    losses = [float(size - rank) + position / 10 for position in range(3)]
+    configs = [(rank, position) for position in range(3)]
+    promoted = _promote(comm, configs, losses, 3)
+
+    best = sorted((float(size - r) + p / 10, r, p)
+                  for r in range(size) for p in range(3))[:size]
+    assert promoted == sorted((r, p) for _, r, p in best if r == rank)
+
+
+@pytest.mark.skipif(MPI.COMM_WORLD.Get_size() < 3,
+                    reason="needs more ranks than hyperspaces")
+def test_hyperband_spare_ranks_search_again(results_path):
+    hyperband(counting_objective([]), [(0.0, 1.0)], results_path,
+              max_resource=9, eta=3)
+    MPI.COMM_WORLD.Barrier()
+
+    entries = load_results(results_path, summary=True)
+    spares = [f'hyperspace0{rank % 2}_rank{rank}'
+              for rank in range(2, MPI.COMM_WORLD.Get_size())]
+    assert sorted(entry.file for entry in entries) == sorted(
+        ['hyperspace00', 'hyperspace01'] + spares)
+
+
+@pytest.mark.skipif(MPI.COMM_WORLD.Get_size() < 2,
+                    reason="needs several hyperspaces searched")
+def test_pilot_evaluations_are_saved_once(results_path):
+    hyperdrive(parabola, [(0.0, 1.0), (0.0, 1.0)], results_path,
+               n_iterations=8, pilot_samples=6, split_dims=1,
+               random_state=0)
+    MPI.COMM_WORLD.Barrier()
+
+    # Split along one dimension only: two hyperspaces.
+    entries = load_results(results_path, summary=True)
+    assert sorted(entry.file for entry in entries) == [
+        'hyperspace00', 'hyperspace01']
+    assert all(entry.n_evaluations == 8 for entry in entries)
+
+
+@pytest.mark.filterwarnings("ignore:Only")
+def test_hyperdrive_evaluates_batches(results_path):
+    hyperdrive(parabola, [(0.0, 1.0)], results_path, n_iterations=7,
+               batch_size=3, random_state=0)
+    MPI.COMM_WORLD.Barrier()
+
+    entries = load_results(results_path, summary=True)
+    assert entries
+    assert all(entry.n_evaluations == 7 for entry in entries)
+
+
+def world_rank(x):
+    return MPI.COMM_WORLD.Get_rank()
+
+
+def failing(x):
+    raise ValueError(x)
+
+
+@pytest.mark.skipif(MPI.COMM_WORLD.Get_size() < 2,
+                    reason="needs a group of several ranks")
+def test_group_executor_evaluates_on_members():
+    rank = MPI.COMM_WORLD.Get_rank()
+    group = MPI.COMM_WORLD.Split(rank // 2, rank)
+    if group.Get_size() < 2:
+        # The last rank of an odd number of ranks.
+        return
+
+    if group.Get_rank() == 0:
+        with GroupExecutor(group) as executor:
+            ranks = list(executor.map(world_rank, range(4)))
+            failed = executor.submit(failing, 'bad point')
+            with pytest.raises(ValueError, match='bad point'):
+                failed.result()
+        assert ranks == [rank + 1] * 4
+    else:
+        serve_evaluations(group)
+    group.Free()
+
+
+@pytest.mark.filterwarnings("ignore:Only")
+@pytest.mark.skipif(MPI.COMM_WORLD.Get_size() < 2,
+                    reason="needs a group of several ranks")
+def test_groups_search_hyperspaces(results_path):
+    hyperdrive(parabola, [(0.0, 1.0)], results_path, n_iterations=6,
+               ranks_per_space=2, random_state=0)
+    MPI.COMM_WORLD.Barrier()
+
+    entries = load_results(results_path, summary=True)
+    # The last group may have a single rank.
+    n_groups = -(-MPI.COMM_WORLD.Get_size() // 2)
+    assert len(entries) == min(n_groups, 2)
+    assert all(entry.n_evaluations == 6 for entry in entries)
@@ -0,0 +1,164 @@
+"""Tests for `hyperspace.space.mapping_space`."""
+
+import itertools
+
+import pytest
+from skopt.space import Space
+
+from hyperspace.space.integer import HyperInteger
+from hyperspace.space.real import HyperReal
+from hyperspace.space.mapping_space import check_dimension
+from hyperspace.space.mapping_space import check_hyperbounds
+from hyperspace.space.mapping_space import count_hyperspaces
+from hyperspace.space.mapping_space import create_hyperbounds
+from hyperspace.space.mapping_space import create_hyperspace
+from hyperspace.space.mapping_space import create_subbounds
+from hyperspace.space.mapping_space import create_subspace
+from hyperspace.space.mapping_space import fold_spaces
+from hyperspace.space.mapping_space import fold_splits
+from hyperspace.space.mapping_space import refine_space
+from hyperspace.space.mapping_space import route_points
+from hyperspace.space.mapping_space import split_hyperparameters
+
+
+# A real, an integer and a categorical hyperparameter.
+MIXED = [(0.0, 9.0), (0, 20), ("a", "b", "c", "d")]
+
+
+def bounds(space):
+    return [dimension.bounds for dimension in space.dimensions]
+
+
+@pytest.mark.parametrize("dimension", [
+    (0.0, 1.0), (1e-4, 1.0, "log-uniform"), (0, 10), ("a", "b"),
+    ("a", "b", "c"), ["a", "b", "c", "d", "e"], (True, False)
+])
+def test_dimensions_and_bounds_split_alike(dimension):
+    dimensions = check_dimension(dimension)
+    bounds = check_hyperbounds(dimension)
+    assert len(dimensions) == len(bounds) == 2
+    for split, bound in zip(dimensions, bounds):
+        assert split == Space([bound]).dimensions[0]
+
+
+@pytest.mark.parametrize("dimension", [0.5, (1.0,), (None, None)])
+def test_invalid_dimensions(dimension):
+    with pytest.raises(ValueError):
+        check_dimension(dimension)
+    with pytest.raises(ValueError):
+        check_hyperbounds(dimension)
+
+
+def bit_tester_fold(low_spaces, high_spaces):
+    """
+    Two-way fold of the original implementation: a set bit picks the lower
+    space.
+    """
+    return [[low if space & (1 << index) else high
+             for index, (low, high) in enumerate(zip(low_spaces, high_spaces))]
+            for space in range(2**len(low_spaces))]
+
+
+def test_fold_splits_matches_the_two_way_ordering():
+    low_spaces, high_spaces = ["a0", "b0", "c0"], ["a1", "b1", "c1"]
+    expected = bit_tester_fold(low_spaces, high_spaces)
+    assert fold_spaces(low_spaces, high_spaces) == expected
+    assert fold_splits(list(zip(low_spaces, high_spaces))) == expected
+
+
+def test_two_way_hyperbounds_match_the_original_bounds():
+    hyperparameters = [(0.0, 10.0), (0, 100)]
+    expected = bit_tester_fold([(0.0, 6.25), (0, 62)],
+                               [(3.75, 10.0), (38, 100)])
+    assert create_hyperbounds(hyperparameters) == expected
+    split = split_hyperparameters(hyperparameters, 2)
+    assert create_hyperbounds(split) == expected
+    assert count_hyperspaces(hyperparameters) == 4
+
+
+def test_k_way_splits():
+    hyperparameters = split_hyperparameters(MIXED, [3, 1, 2])
+    assert count_hyperspaces(hyperparameters) == 6
+
+    hyperbounds = create_hyperbounds(hyperparameters)
+    assert len(hyperbounds) == 6
+    assert all(bounds[1] == (0, 20) for bounds in hyperbounds)
+    # Every combination of splits appears exactly once.
+    reals = sorted({bounds[0] for bounds in hyperbounds})
+    categories = sorted({bounds[2] for bounds in hyperbounds})
+    assert len(reals) == 3 and len(categories) == 2
+    assert sorted(map(tuple, hyperbounds)) == \
+        sorted(itertools.product(reals, [(0, 20)], categories))
+    # Splits cover the whole range.
+    assert reals[0][0] == 0.0 and reals[-1][1] == 9.0
+    assert all(low[1] >= high[0] for low, high in zip(reals, reals[1:]))
+
+
+def test_hyperspace_classes_keep_their_own_splits():
+    hyperparameters = [HyperReal(0.0, 1.0, n_splits=4),
+                       HyperInteger(0, 10, n_splits=1), (0, 5)]
+    assert count_hyperspaces(hyperparameters) == 8
+    assert count_hyperspaces(split_hyperparameters(hyperparameters, 3)) == 12
+
+
+@pytest.mark.parametrize("n_splits", [2, [3, 1, 2]])
+def test_subspaces_match_the_hyperspaces(n_splits):
+    hyperparameters = split_hyperparameters(MIXED, n_splits)
+    hyperspace = create_hyperspace(hyperparameters)
+    hyperbounds = create_hyperbounds(hyperparameters)
+    for index in range(count_hyperspaces(hyperparameters)):
+        assert create_subspace(hyperparameters, index) == hyperspace[index]
+        assert create_subbounds(hyperparameters, index) == hyperbounds[index]
+
+    with pytest.raises(ValueError):
+        create_subspace(hyperparameters, len(hyperspace))
+
+
+@pytest.mark.parametrize("n_splits", [2, [3, 1, 2]])
+def test_route_points_to_a_hyperspace_containing_them(n_splits):
+    hyperparameters = split_hyperparameters(MIXED, n_splits)
+    points = Space(MIXED).rvs(50, random_state=0)
+    owners = route_points(hyperparameters, points, random_state=0)
+    for point, owner in zip(points, owners):
+        assert point in create_subspace(hyperparameters, owner)
+
+
+def test_refine_space_keeps_the_half_containing_the_point():
+    space = Space([(0.0, 10.0), (0, 100)])
+    assert bounds(refine_space(space, [1.0, 50])) == [(0.0, 6.25), (0, 100)]
+    assert bounds(refine_space(space, [9.0, 50])) == [(3.75, 10.0), (0, 100)]
+
+
+def test_refine_space_cycles_through_dimensions_with_depth():
+    space = Space([(0.0, 10.0), (0, 100), ("a", "b", "c", "d")])
+    point = [1.0, 90, "a"]
+    refined = refine_space(space, point, depth=1)
+    assert bounds(refined)[0] == (0.0, 10.0)
+    assert bounds(refined)[2] == ("a", "b", "c", "d")
+    low, high = bounds(refined)[1]
+    assert 0 < low <= point[1] <= high == 100
+
+    refined = refine_space(space, point, depth=2)
+    assert bounds(refined)[:2] == [(0.0, 10.0), (0, 100)]
+    assert "a" in bounds(refined)[2]
+    assert len(bounds(refined)[2]) < 4
+    assert refined.dimensions[0] == space.dimensions[0]
+
+
+def test_refine_space_skips_dimensions_too_small_to_split():
+    space = Space([(0, 1), ("a", "b"), (0.0, 1.0)])
+    refined = refine_space(space, [0, "a", 0.9])
+    assert bounds(refined)[:2] == [(0, 1), ("a", "b")]
+    assert 0 < bounds(refined)[2][0] < 0.9
+
+
+def test_refine_space_returns_none_when_nothing_can_be_split():
+    assert refine_space(Space([(0, 1), ("a", "b")]), [1, "b"]) is None
+
+
+def test_refined_spaces_contain_the_point():
+    space = Space([(0.0, 10.0), (0, 100), ("a", "b", "c", "d")])
+    point = [3.0, 42, "c"]
+    for depth in range(6):
+        space = refine_space(space, point, depth)
+        assert point in space
@@ -0,0 +1,90 @@
+"""Tests for `hyperspace.samplers`."""
+
+import numpy as np
+import pytest
+
+from hyperspace.samplers.latin_hypercube_sampler import maximin_unit_samples
+from hyperspace.samplers.latin_hypercube_sampler import stratified_unit_samples
+from hyperspace.samplers.quasi_random_sampler import halton_start
+from hyperspace.samplers.quasi_random_sampler import sample_halton
+from hyperspace.samplers.quasi_random_sampler import sample_sobol
+from hyperspace.samplers.quasi_random_sampler import sobol_start
+
+
+def assert_latin_hypercube(samples, n_samples, n_dims):
+    """Every dimension has one sample in each of its `n_samples` strata."""
+    assert samples.shape == (n_samples, n_dims)
+    assert np.all((samples >= 0) & (samples < 1))
+    strata = np.sort(np.floor(samples * n_samples).astype(int), axis=0)
+    assert np.all(strata == np.arange(n_samples)[:, None])
+
+
+@pytest.mark.parametrize("n_samples, n_dims", [(1, 3), (10, 1), (20, 4)])
+def test_stratified_unit_samples_are_stratified(n_samples, n_dims):
+    samples = stratified_unit_samples(n_samples, n_dims, rng=0)
+    assert_latin_hypercube(samples, n_samples, n_dims)
+
+
+def test_stratified_unit_samples_are_reproducible():
+    first = stratified_unit_samples(8, 3, rng=1)
+    assert np.array_equal(first, stratified_unit_samples(8, 3, rng=1))
+
+
+def min_distance(samples):
+    return min(np.linalg.norm(a - b)
+               for i, a in enumerate(samples) for b in samples[i + 1:])
+
+
+@pytest.mark.parametrize("n_samples, n_dims", [(2, 3), (10, 2), (20, 4)])
+def test_maximin_unit_samples_are_stratified(n_samples, n_dims):
+    samples = maximin_unit_samples(n_samples, n_dims, rng=0)
+    assert_latin_hypercube(samples, n_samples, n_dims)
+
+
+def test_maximin_unit_samples_spread_out_the_initial_design():
+    # The annealing starts from the stratified design drawn with the same seed.
+    initial = stratified_unit_samples(20, 4, rng=0)
+    samples = maximin_unit_samples(20, 4, rng=0)
+    assert min_distance(samples) > min_distance(initial)
+
+
+def test_maximin_unit_samples_without_iterations():
+    samples = maximin_unit_samples(10, 3, rng=0, max_iter=0)
+    assert np.array_equal(samples, stratified_unit_samples(10, 3, rng=0))
+
+
+def test_sobol_without_scrambling_is_the_sobol_sequence():
+    assert sample_sobol(4, 2, scramble=False).tolist() == [
+        [0.0, 0.0], [0.5, 0.5], [0.25, 0.75], [0.75, 0.25]]
+
+
+def test_halton_without_scrambling_is_the_halton_sequence():
+    samples = sample_halton(4, 2, scramble=False)
+    assert np.allclose(samples, [[0, 0], [1 / 2, 1 / 3], [1 / 4, 2 / 3],
+                                 [3 / 4, 1 / 9]])
+
+
+@pytest.mark.parametrize("sample, n_samples, n_bins", [
+    (sample_sobol, 16, [16, 16]),
+    # Halton dimensions use bases 2 and 3.
+    (sample_halton, 6, [2, 3]),
+])
+def test_scrambled_sequences_are_balanced(sample, n_samples, n_bins):
+    samples = sample(n_samples, 2, rng=1)
+    assert np.all((samples >= 0) & (samples < 1))
+    for dim, bins in enumerate(n_bins):
+        counts = np.bincount(np.floor(samples[:, dim] * bins).astype(int),
+                             minlength=bins)
+        assert np.all(counts == n_samples // bins)
+
+
+@pytest.mark.parametrize("start", [sobol_start, halton_start])
+def test_quasi_random_starts_use_one_stream_per_seed(start):
+    bounds = [(0.0, 1.0), (0, 5), ("a", "b")]
+    samples = start(bounds, 8, rng=0)
+    assert samples == start(bounds, 8, rng=0)
+    assert samples != start(bounds, 8, rng=1)
+    for x in samples:
+        assert 0.0 <= x[0] <= 1.0
+        assert x[1] in range(6)
+        assert x[2] in ("a", "b")
@@ -0,0 +1,25 @@
+"""Tests for `hyperspace.space.sensitivity`."""
+
+import numpy as np
+from skopt.space import Space
+
+from hyperspace.space.sensitivity import choose_splits
+from hyperspace.space.sensitivity import dimension_importances
+
+
+def test_choose_splits_splits_the_most_important():
+    assert choose_splits([0.1, 0.6, 0.3], 1) == [1, 2, 1]
+    assert choose_splits([0.1, 0.6, 0.3], 2, n_splits=3) == [1, 3, 3]
+    assert choose_splits([0.1, 0.6, 0.3], 0) == [1, 1, 1]
+
+
+def test_dimension_importances_finds_the_active_dimension():
+    space = Space([(0.0, 1.0), (0.0, 1.0), ("a", "b")])
+    rng = np.random.RandomState(0)
+    x_iters = space.rvs(n_samples=50, random_state=rng)
+    func_vals = [x[1]**2 for x in x_iters]
+
+    importances = dimension_importances(x_iters, func_vals, space)
+    assert np.isclose(sum(importances), 1)
+    assert np.argmax(importances) == 1
+    assert choose_splits(importances, 1) == [1, 2, 1]
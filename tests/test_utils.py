@@ -0,0 +1,305 @@
+"""Tests for `hyperspace.utils.utils`."""
+
+import os
+import threading
+
+import numpy as np
+import pytest
+from scipy.optimize import OptimizeResult
+from skopt import dump
+from skopt import load
+
+from hyperspace.callbacks.checkpoints import CheckpointSaver
+from hyperspace.callbacks.checkpoints import JsonCheckpointSaver
+from hyperspace.callbacks.checkpoints import LogCheckpointSaver
+from hyperspace.callbacks.checkpoints import _CheckpointWriter
+from hyperspace.utils.utils import LazyResult
+from hyperspace.utils.utils import consolidate_results
+from hyperspace.utils.utils import create_result
+from hyperspace.utils.utils import load_json_results
+from hyperspace.utils.utils import load_manifest
+from hyperspace.utils.utils import load_results
+from hyperspace.utils.utils import load_store
+from hyperspace.utils.utils import savefile_name
+from hyperspace.utils.utils import _kept_models
+from hyperspace.utils.utils import _load_checkpoint
+
+
+@pytest.mark.parametrize("n_models", range(8))
+def test_kept_models_keeps_the_last_models(n_models):
+    models = list(range(n_models))
+    assert _kept_models(models, 5) == models[-5:]
+
+
+def test_kept_models_with_fewer_models_than_kept():
+    assert _kept_models([0], 5) == [0]
+    assert _kept_models([0, 1, 2, 3], 5) == [0, 1, 2, 3]
+
+
+def test_kept_models_policies():
+    models = [0, 1, 2]
+    assert _kept_models(models, "all") == models
+    assert _kept_models(models, "none") == []
+    assert _kept_models(models, 0) == []
+
+
+@pytest.mark.parametrize("keep_models", ["some", -1, 1.5])
+def test_kept_models_invalid(keep_models):
+    with pytest.raises(ValueError):
+        _kept_models([0], keep_models)
+
+
+@pytest.mark.parametrize("n_evaluations", [1, 3, 7])
+def test_log_checkpoint_replays_on_the_snapshot(tmp_path, n_evaluations):
+    saver = LogCheckpointSaver(str(tmp_path), 'hyperspace00', compact_every=3)
+    func_vals = [float(i) for i in range(n_evaluations, 0, -1)]
+    for n in range(1, n_evaluations + 1):
+        saver(_json_result(func_vals[:n]))
+    # A crash mid-append leaves a truncated record behind.
+    with open(saver.logfile, 'ab') as log:
+        log.write(b'\x80\x03(K')
+
+    checkpoint = _load_checkpoint(str(tmp_path), 0)
+    assert list(checkpoint.func_vals) == func_vals
+    assert [list(x) for x in checkpoint.x_iters] == \
+        [[y, i] for i, y in enumerate(func_vals)]
+    assert checkpoint.fun == 1.0
+
+
+def test_log_checkpoint_starts_afresh(tmp_path):
+    previous = LogCheckpointSaver(str(tmp_path), 'hyperspace00')
+    for n in range(1, 4):
+        previous(_json_result([5.0, 4.0, 3.0][:n]))
+
+    # A new run, not resumed from the previous one, with a single point.
+    saver = LogCheckpointSaver(str(tmp_path), 'hyperspace00')
+    saver(_json_result([2.0]))
+
+    checkpoint = _load_checkpoint(str(tmp_path), 0)
+    assert list(checkpoint.func_vals) == [2.0]
+    assert os.path.getsize(saver.logfile) == 0
+
+
+def test_checkpoint_saver_writes_every_few_calls(tmp_path):
+    saver = CheckpointSaver(str(tmp_path), 'hyperspace00', every=3)
+    savefile = str(tmp_path / 'hyperspace00')
+    for n in range(1, 6):
+        saver(_json_result([5.0, 4.0, 3.0, 2.0, 1.0][:n]))
+        if n < 3:
+            assert not os.path.exists(savefile)
+    assert list(load(savefile).func_vals) == [5.0, 4.0, 3.0]
+
+    saver.close()
+    assert list(load(savefile).func_vals) == [5.0, 4.0, 3.0, 2.0, 1.0]
+    assert os.listdir(str(tmp_path)) == ['hyperspace00']
+
+
+def _recording_write(written):
+    """Write function recording the snapshots it is given."""
+    def write(snapshot, path):
+        written.append(list(snapshot.func_vals))
+        open(path, 'w').close()
+    return write
+
+
+def test_checkpoint_writer_interval(tmp_path):
+    savefile = str(tmp_path / 'hyperspace00')
+    written = []
+    write = _recording_write(written)
+
+    writer = _CheckpointWriter(savefile, write, every=None, interval=3600)
+    for n in range(1, 4):
+        writer.submit(_json_result([3.0, 2.0, 1.0][:n]))
+    assert written == []
+    writer.close()
+    assert written == [[3.0, 2.0, 1.0]]
+
+    written.clear()
+    writer = _CheckpointWriter(savefile, write, every=None, interval=0)
+    for n in range(1, 3):
+        writer.submit(_json_result([3.0, 2.0][:n]))
+    writer.close()
+    assert written == [[3.0], [3.0, 2.0]]
+
+
+def test_background_writer_skips_to_the_newest_snapshot(tmp_path):
+    written = []
+    record = _recording_write(written)
+    started, release = threading.Event(), threading.Event()
+
+    def write(snapshot, path):
+        started.set()
+        release.wait()
+        record(snapshot, path)
+
+    writer = _CheckpointWriter(str(tmp_path / 'hyperspace00'), write,
+                               background=True)
+    func_vals = [4.0, 3.0, 2.0, 1.0]
+    writer.submit(_json_result(func_vals[:1]))
+    # The first snapshot is being written while the others queue up.
+    started.wait()
+    for n in range(2, 5):
+        writer.submit(_json_result(func_vals[:n]))
+    release.set()
+    writer.close()
+
+    assert written == [func_vals[:1], func_vals]
+
+
+def test_background_writer_raises_write_errors():
+    def write(snapshot, path):
+        raise OSError('disk full')
+
+    writer = _CheckpointWriter(os.devnull, write, background=True)
+    writer.submit(_json_result([1.0]))
+    with pytest.raises(OSError):
+        writer.close()
+
+
+def _json_result(func_vals):
+    x_iters = [[float(y), int(i)] for i, y in enumerate(func_vals)]
+    return create_result(x_iters, func_vals)
+
+
+def test_json_lines_manifest_and_top_k(tmp_path):
+    plain = JsonCheckpointSaver(str(tmp_path), 'hyperspace0')
+    plain(_json_result([3.0, 2.0]))
+    plain.close()
+    lines = JsonCheckpointSaver(str(tmp_path), 'hyperspace1', lines=True)
+    lines(_json_result([4.0, 1.0, 5.0]))
+
+    summary = load_json_results(str(tmp_path), summary=True)
+    assert [(entry.rank, entry.fun, entry.n_evaluations)
+            for entry in summary] == [(0, 2.0, 2), (1, 1.0, 3)]
+
+    best, = load_json_results(str(tmp_path), top_k=1)
+    assert best.fun == 1.0
+    assert best.x == [1.0, 1]
+    assert best.func_vals == [4.0, 1.0, 5.0]
+
+
+def test_json_lines_results_have_the_same_types(tmp_path):
+    plain = JsonCheckpointSaver(str(tmp_path), 'hyperspace0')
+    plain(_json_result([3.0, 2.0]))
+    plain.close()
+    lines = JsonCheckpointSaver(str(tmp_path), 'hyperspace1', lines=True)
+    lines(_json_result([4.0, 1.0]))
+
+    results = load_json_results(str(tmp_path))
+    assert [type(result.fun) for result in results] == [float, float]
+    assert [type(result.func_vals) for result in results] == [list, list]
+
+
+def _dump_results(results_path, results):
+    """Save results the way the drivers do, without a manifest."""
+    for rank, (x_iters, func_vals) in enumerate(results):
+        best = int(np.argmin(func_vals))
+        result = OptimizeResult(x=x_iters[best], fun=func_vals[best],
+                                x_iters=x_iters,
+                                func_vals=np.asarray(func_vals))
+        dump(result, os.path.join(results_path, savefile_name(rank)))
+
+
+def test_manifest_summary_and_top_k(tmp_path):
+    _dump_results(str(tmp_path), [
+        ([[0.5, 1], [0.1, 2]], [3.0, 2.0]),
+        ([[0.2, 3], [0.3, 4], [0.4, 5]], [4.0, 1.0, 5.0]),
+        ([[0.6, 6]], [6.0]),
+    ])
+    assert load_manifest(str(tmp_path)) is None
+
+    summary = load_results(str(tmp_path), summary=True)
+    assert [(entry.rank, entry.file, entry.fun, entry.x, entry.n_evaluations)
+            for entry in summary] == [
+        (0, 'hyperspace00', 2.0, [0.1, 2], 2),
+        (1, 'hyperspace01', 1.0, [0.3, 4], 3),
+        (2, 'hyperspace02', 6.0, [0.6, 6], 1),
+    ]
+    assert len(load_manifest(str(tmp_path))) == 3
+
+    best = load_results(str(tmp_path), top_k=2)
+    assert [result.fun for result in best] == [1.0, 2.0]
+    assert best[0].x_iters == [[0.2, 3], [0.3, 4], [0.4, 5]]
+
+    ranked = load_results(str(tmp_path), summary=True, sort=True)
+    assert [entry.rank for entry in ranked] == [1, 0, 2]
+
+
+def test_consolidate_results_round_trip(tmp_path):
+    results_path = str(tmp_path / 'results')
+    store_path = str(tmp_path / 'store')
+    os.makedirs(results_path)
+    results = [
+        ([[0.5, 1, 'relu'], [0.1, 2, 'tanh']], [3.0, 2.0]),
+        ([[0.2, 3, 'tanh'], [0.3, 4, 'elu'], [0.4, 5, 'relu']],
+         [4.0, 1.0, 5.0]),
+    ]
+    _dump_results(results_path, results)
+    consolidate_results(results_path, store_path)
+
+    store = load_store(store_path)
+    assert isinstance(store['func_vals'], np.memmap)
+    assert store['func_vals'].tolist() == [3.0, 2.0, 4.0, 1.0, 5.0]
+    assert store['rank'].tolist() == [0, 0, 1, 1, 1]
+    assert store['iteration'].tolist() == [0, 1, 0, 1, 2]
+    assert [col['kind'] for col in store['meta']['columns']] == \
+        ['real', 'integer', 'categorical']
+
+    real, integer, codes = store['x_columns']
+    categories = store['meta']['columns'][2]['categories']
+    x_iters = [x for x_iters, _ in results for x in x_iters]
+    assert real.tolist() == [x[0] for x in x_iters]
+    assert integer.dtype == np.int64
+    assert integer.tolist() == [x[1] for x in x_iters]
+    assert [categories[code] for code in codes] == [x[2] for x in x_iters]
+
+    loaded = load_results(store_path, columnar=True, sort=True)
+    assert [(result.rank, result.fun, result.x) for result in loaded] == \
+        [(1, 1.0, [0.3, 4, 'elu']), (0, 2.0, [0.1, 2, 'tanh'])]
+
+
+_RESULTS = [
+    ([[0.5, 1], [0.1, 2]], [3.0, 2.0]),
+    ([[0.2, 3], [0.3, 4], [0.4, 5]], [4.0, 1.0, 5.0]),
+    ([[0.6, 6]], [6.0]),
+]
+
+
+def test_parallel_loading_matches_sequential(tmp_path):
+    _dump_results(str(tmp_path), _RESULTS)
+
+    sequential = load_results(str(tmp_path), sort=True)
+    parallel = load_results(str(tmp_path), sort=True, workers=2)
+    assert [(result.fun, result.x) for result in parallel] == \
+        [(result.fun, result.x) for result in sequential]
+    assert [list(result.func_vals) for result in parallel] == \
+        [[4.0, 1.0, 5.0], [3.0, 2.0], [6.0]]
+
+
+def test_lazy_results_answer_from_the_manifest(tmp_path):
+    _dump_results(str(tmp_path), _RESULTS)
+    # Written by the first summary.
+    load_results(str(tmp_path), summary=True)
+
+    lazy = load_results(str(tmp_path), lazy=True)
+    assert all(isinstance(result, LazyResult) for result in lazy)
+    assert [(result.fun, result.x) for result in lazy] == \
+        [(2.0, [0.1, 2]), (1.0, [0.3, 4]), (6.0, [0.6, 6])]
+    assert all(result._result is None for result in lazy)
+
+    assert lazy[1].x_iters == [[0.2, 3], [0.3, 4], [0.4, 5]]
+    assert lazy[1]._result is not None
+    assert lazy[0]._result is None
+
+    best, = load_results(str(tmp_path), top_k=1, lazy=True)
+    assert best.fun == 1.0
+    assert best._result is None
+
+
+def test_lazy_results_without_a_manifest_load_on_use(tmp_path):
+    _dump_results(str(tmp_path), _RESULTS)
+
+    lazy = load_results(str(tmp_path), lazy=True)
+    assert all(result._result is None for result in lazy)
+    assert [result.fun for result in lazy] == [2.0, 1.0, 6.0]
+    assert all(result._result is not None for result in lazy)